@@ -0,0 +1,32 @@
+-- migrate:up
+
+create table public.email_outbox
+(
+    id              uuid         not null DEFAULT uuid_generate_v4() primary key,
+    email_to        varchar(255) not null,
+    subject         varchar      not null,
+    html_content    text         not null,
+    status          varchar(10)  not null DEFAULT 'pending',
+    attempts        integer      not null DEFAULT 0,
+    next_attempt_at timestamp    not null DEFAULT CURRENT_TIMESTAMP,
+    last_error      text,
+    sent_at         timestamp,
+    created_at      timestamp DEFAULT CURRENT_TIMESTAMP,
+    updated_at      timestamp DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT email_outbox_status_check CHECK (status IN ('pending', 'sent', 'failed'))
+);
+
+-- the dispatcher only ever scans rows that are still waiting to be sent
+CREATE INDEX idx_email_outbox_pending
+    ON public.email_outbox (next_attempt_at)
+    WHERE status = 'pending';
+
+CREATE TRIGGER update_email_outbox_updated_at
+    BEFORE UPDATE
+    ON public.email_outbox
+    FOR EACH ROW
+EXECUTE FUNCTION update_timestamp();
+
+-- migrate:down
+
+drop table if exists public.email_outbox;
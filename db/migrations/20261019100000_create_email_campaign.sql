@@ -0,0 +1,34 @@
+-- migrate:up
+
+create table public.email_campaign
+(
+    id                uuid        not null DEFAULT uuid_generate_v4() primary key,
+    subject           varchar     not null,
+    html_template     text        not null,
+    segment_status    varchar(10),
+    segment_role      varchar(10),
+    status            varchar(10) not null DEFAULT 'pending',
+    last_recipient_id uuid,
+    sent_count        integer     not null DEFAULT 0,
+    failed_count      integer     not null DEFAULT 0,
+    started_at        timestamp,
+    completed_at      timestamp,
+    created_at        timestamp DEFAULT CURRENT_TIMESTAMP,
+    updated_at        timestamp DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT email_campaign_status_check CHECK (status IN ('pending', 'running', 'completed', 'cancelled'))
+);
+
+-- runners only ever scan campaigns that still have recipients left
+CREATE INDEX idx_email_campaign_open
+    ON public.email_campaign (created_at)
+    WHERE status IN ('pending', 'running');
+
+CREATE TRIGGER update_email_campaign_updated_at
+    BEFORE UPDATE
+    ON public.email_campaign
+    FOR EACH ROW
+EXECUTE FUNCTION update_timestamp();
+
+-- migrate:down
+
+drop table if exists public.email_campaign;
@@ -0,0 +1,33 @@
+-- migrate:up
+
+-- publish every row change on the row_changes channel, listeners receive it when the
+-- transaction commits and identical changes within one transaction are sent once
+CREATE OR REPLACE FUNCTION notify_row_change()
+    RETURNS TRIGGER AS
+$$
+DECLARE
+    row_id uuid;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row_id = OLD.id;
+    ELSE
+        row_id = NEW.id;
+    END IF;
+    PERFORM pg_notify(
+        'row_changes',
+        json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'id', row_id)::text
+    );
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER notify_user_change
+    AFTER INSERT OR UPDATE OR DELETE
+    ON public.user
+    FOR EACH ROW
+EXECUTE FUNCTION notify_row_change();
+
+-- migrate:down
+
+drop trigger if exists notify_user_change on public.user;
+drop function if exists notify_row_change();
@@ -0,0 +1,13 @@
+-- migrate:up
+
+-- the cursor pagination of the API walks users in (created_at, id) order, a NULL created_at
+-- would drop the row out of that order
+UPDATE public.user SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL;
+ALTER TABLE public.user ALTER COLUMN created_at SET NOT NULL;
+
+CREATE INDEX idx_user_created_at_id ON public.user (created_at, id);
+
+-- migrate:down
+
+drop index if exists idx_user_created_at_id;
+ALTER TABLE public.user ALTER COLUMN created_at DROP NOT NULL;
@@ -23,6 +23,30 @@ CREATE EXTENSION IF NOT EXISTS "uuid-ossp" WITH SCHEMA public;
 COMMENT ON EXTENSION "uuid-ossp" IS 'generate universally unique identifiers (UUIDs)';
 
 
+--
+-- Name: notify_row_change(); Type: FUNCTION; Schema: public; Owner: -
+--
+
+CREATE FUNCTION public.notify_row_change() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+DECLARE
+    row_id uuid;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row_id = OLD.id;
+    ELSE
+        row_id = NEW.id;
+    END IF;
+    PERFORM pg_notify(
+        'row_changes',
+        json_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'id', row_id)::text
+    );
+    RETURN NULL;
+END;
+$$;
+
+
 --
 -- Name: update_timestamp(); Type: FUNCTION; Schema: public; Owner: -
 --
@@ -41,6 +65,48 @@ SET default_tablespace = '';
 
 SET default_table_access_method = heap;
 
+--
+-- Name: email_campaign; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.email_campaign (
+    id uuid DEFAULT public.uuid_generate_v4() NOT NULL,
+    subject character varying NOT NULL,
+    html_template text NOT NULL,
+    segment_status character varying(10),
+    segment_role character varying(10),
+    status character varying(10) DEFAULT 'pending'::character varying NOT NULL,
+    last_recipient_id uuid,
+    sent_count integer DEFAULT 0 NOT NULL,
+    failed_count integer DEFAULT 0 NOT NULL,
+    started_at timestamp without time zone,
+    completed_at timestamp without time zone,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
+    updated_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT email_campaign_status_check CHECK (((status)::text = ANY ((ARRAY['pending'::character varying, 'running'::character varying, 'completed'::character varying, 'cancelled'::character varying])::text[])))
+);
+
+
+--
+-- Name: email_outbox; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.email_outbox (
+    id uuid DEFAULT public.uuid_generate_v4() NOT NULL,
+    email_to character varying(255) NOT NULL,
+    subject character varying NOT NULL,
+    html_content text NOT NULL,
+    status character varying(10) DEFAULT 'pending'::character varying NOT NULL,
+    attempts integer DEFAULT 0 NOT NULL,
+    next_attempt_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    last_error text,
+    sent_at timestamp without time zone,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
+    updated_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT email_outbox_status_check CHECK (((status)::text = ANY ((ARRAY['pending'::character varying, 'sent'::character varying, 'failed'::character varying])::text[])))
+);
+
+
 --
 -- Name: schema_migrations; Type: TABLE; Schema: public; Owner: -
 --
@@ -59,7 +125,7 @@ CREATE TABLE public."user" (
     full_name character varying(255),
     email character varying(255) NOT NULL,
     hashed_password character varying NOT NULL,
-    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
     updated_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
     status character varying(10) DEFAULT 'pending'::character varying NOT NULL,
     role character varying(10) DEFAULT 'user'::character varying NOT NULL,
@@ -68,6 +134,22 @@ CREATE TABLE public."user" (
 );
 
 
+--
+-- Name: email_campaign email_campaign_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.email_campaign
+    ADD CONSTRAINT email_campaign_pkey PRIMARY KEY (id);
+
+
+--
+-- Name: email_outbox email_outbox_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.email_outbox
+    ADD CONSTRAINT email_outbox_pkey PRIMARY KEY (id);
+
+
 --
 -- Name: schema_migrations schema_migrations_pkey; Type: CONSTRAINT; Schema: public; Owner: -
 --
@@ -84,6 +166,27 @@ ALTER TABLE ONLY public."user"
     ADD CONSTRAINT user_pkey PRIMARY KEY (id);
 
 
+--
+-- Name: idx_email_campaign_open; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_email_campaign_open ON public.email_campaign USING btree (created_at) WHERE ((status)::text = ANY ((ARRAY['pending'::character varying, 'running'::character varying])::text[]));
+
+
+--
+-- Name: idx_email_outbox_pending; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_email_outbox_pending ON public.email_outbox USING btree (next_attempt_at) WHERE ((status)::text = 'pending'::text);
+
+
+--
+-- Name: idx_user_created_at_id; Type: INDEX; Schema: public; Owner: -
+--
+
+CREATE INDEX idx_user_created_at_id ON public."user" USING btree (created_at, id);
+
+
 --
 -- Name: idx_user_role; Type: INDEX; Schema: public; Owner: -
 --
@@ -105,6 +208,27 @@ CREATE INDEX idx_user_status ON public."user" USING btree (status);
 CREATE UNIQUE INDEX ix_user_email ON public."user" USING btree (email);
 
 
+--
+-- Name: email_campaign update_email_campaign_updated_at; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER update_email_campaign_updated_at BEFORE UPDATE ON public.email_campaign FOR EACH ROW EXECUTE FUNCTION public.update_timestamp();
+
+
+--
+-- Name: email_outbox update_email_outbox_updated_at; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER update_email_outbox_updated_at BEFORE UPDATE ON public.email_outbox FOR EACH ROW EXECUTE FUNCTION public.update_timestamp();
+
+
+--
+-- Name: user notify_user_change; Type: TRIGGER; Schema: public; Owner: -
+--
+
+CREATE TRIGGER notify_user_change AFTER INSERT OR DELETE OR UPDATE ON public."user" FOR EACH ROW EXECUTE FUNCTION public.notify_row_change();
+
+
 --
 -- Name: user update_users_updated_at; Type: TRIGGER; Schema: public; Owner: -
 --
@@ -123,4 +247,8 @@ CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON public."user" FOR EACH R
 
 INSERT INTO public.schema_migrations (version) VALUES
     ('20240211180307'),
-    ('20240929013917');
+    ('20240929013917'),
+    ('20261019090000'),
+    ('20261019100000'),
+    ('20261019110000'),
+    ('20261019120000');
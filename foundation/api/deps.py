@@ -2,15 +2,16 @@ from typing import Annotated
 
 from fastapi import Depends
 from fastapi import Security
-from fastapi_jwt import JwtAuthorizationCredentials, JwtAccessBearer, JwtRefreshBearer
+from fastapi_jwt import JwtAuthorizationCredentials, JwtRefreshBearer
 
 from foundation.core.config import settings
+from foundation.core.security import TimedJwtAccessBearer
 from foundation.core.users import get_current_user, validate_role_is_admin
 from foundation.core.users.deps import UserServiceDep
 from foundation.core.users.models import User
 
 # Read access token from bearer header
-access_token_security_bearer = JwtAccessBearer(
+access_token_security_bearer = TimedJwtAccessBearer(
     secret_key=settings.JWT_SECRET,
     auto_error=True,  # automatically raise HTTPException: HTTP_401_UNAUTHORIZED
 )
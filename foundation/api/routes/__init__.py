@@ -1,7 +1,14 @@
 from fastapi import APIRouter
 from .auth import router as auth_router
+from .campaigns import router as campaigns_router
+from .health import router as health_router
+from .metrics import router as metrics_router
 from .users import router as users_router
 
 api_router = APIRouter()
 api_router.include_router(auth_router, prefix="/auth", tags=["auth"])
 api_router.include_router(users_router, prefix="/users", tags=["users"])
+api_router.include_router(campaigns_router, prefix="/campaigns", tags=["campaigns"])
+
+# served at the root, not under /api, where Prometheus and the load balancer probe by default
+__all__ = ["api_router", "health_router", "metrics_router"]
@@ -0,0 +1,77 @@
+from typing import Any
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, status
+
+from foundation.api.deps import AdminRequired
+from foundation.core.campaigns.deps import CampaignServiceDep
+from foundation.core.campaigns.schemas import CampaignCreate, CampaignPublic
+from foundation.core.campaigns.services import CampaignNotFoundError
+
+router = APIRouter(dependencies=[AdminRequired])
+
+
+@router.post(
+    "/",
+    response_model=CampaignPublic,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_campaign(
+    *, campaign_service: CampaignServiceDep, campaign_in: CampaignCreate
+) -> Any:
+    """
+    Creates an email campaign to the users matching the segment filters. The emails are sent
+    in the background by the campaign runner.
+
+    :param campaign_service: Dependency injection of EmailCampaignService
+    :param campaign_in: Subject, template and segment of the campaign
+    :return: The created campaign
+
+    Note:
+    - Requires Admin authorization
+    """
+    return await campaign_service.create_campaign(**campaign_in.model_dump())
+
+
+@router.get(
+    "/{campaign_id}",
+    response_model=CampaignPublic,
+)
+async def get_campaign(
+    *, campaign_service: CampaignServiceDep, campaign_id: UUID
+) -> Any:
+    """
+    Fetches a campaign and its progress.
+
+    :param campaign_service: Dependency injection of EmailCampaignService
+    :param campaign_id: Unique identifier of the campaign
+    :return: The campaign
+
+    :raises HTTPException 404: If the campaign is not found
+    """
+    try:
+        return await campaign_service.get_campaign(campaign_id)
+    except CampaignNotFoundError as e:
+        raise HTTPException(status_code=404, detail=e.args)
+
+
+@router.post(
+    "/{campaign_id}/cancel",
+    response_model=CampaignPublic,
+)
+async def cancel_campaign(
+    *, campaign_service: CampaignServiceDep, campaign_id: UUID
+) -> Any:
+    """
+    Cancels a campaign, so it is not sent to any further recipients.
+
+    :param campaign_service: Dependency injection of EmailCampaignService
+    :param campaign_id: Unique identifier of the campaign
+    :return: The cancelled campaign
+
+    :raises HTTPException 404: If the campaign is not found
+    """
+    try:
+        return await campaign_service.cancel_campaign(campaign_id)
+    except CampaignNotFoundError as e:
+        raise HTTPException(status_code=404, detail=e.args)
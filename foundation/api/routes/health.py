@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from foundation.core.health import readiness_probe
+
+router = APIRouter()
+
+# probe responses must never be served from a cache
+NO_STORE = {"Cache-Control": "no-store"}
+
+
+@router.get("/healthz", include_in_schema=False)
+async def get_health() -> PlainTextResponse:
+    """
+    Liveness probe: the worker runs its event loop. Touches neither the database nor the templates.
+
+    :return: "ok"
+    """
+    return PlainTextResponse("ok", headers=NO_STORE)
+
+
+@router.get("/readyz", include_in_schema=False)
+async def get_readiness() -> JSONResponse:
+    """
+    Readiness probe: the worker can serve requests, see `foundation.core.health`.
+
+    :return: The status of the checks, with status 200 if the worker is ready and 503 otherwise.
+    """
+    readiness = await readiness_probe.check()
+    return JSONResponse(
+        readiness.to_dict(),
+        status_code=200 if readiness.ready else 503,
+        headers=NO_STORE,
+    )
@@ -0,0 +1,89 @@
+import ipaddress
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Security
+from fastapi.responses import PlainTextResponse
+from fastapi_jwt import JwtAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from foundation.core.config import settings
+from foundation.core.deps import get_async_session
+from foundation.core.metrics import metrics
+from foundation.core.outbox import EmailOutbox, EmailOutboxService
+from foundation.core.repository import Repository
+from foundation.core.security import TimedJwtAccessBearer
+from foundation.core.users import get_current_user, validate_role_is_admin
+from foundation.core.users.deps import UserServiceDep
+
+router = APIRouter()
+
+# the metrics are also served to admins outside of the allowed networks
+optional_access_token_bearer = TimedJwtAccessBearer(
+    secret_key=settings.JWT_SECRET, auto_error=False
+)
+
+EMAIL_OUTBOX_PENDING = metrics.gauge(
+    "email_outbox_pending", "Emails waiting in the outbox to be sent.", live=True
+)
+EMAIL_OUTBOX_LAG = metrics.gauge(
+    "email_outbox_lag_seconds",
+    "Seconds the oldest due email of the outbox has been waiting, 0 if none is due.",
+    live=True,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def is_allowed_address(host: str | None) -> bool:
+    """
+    :param host: IP address of the peer connecting to the app. Behind a reverse proxy this is the
+        address of the proxy for every client, so the networks must not include the proxy.
+    :return: True if the address is in one of the `METRICS_ALLOWED_NETWORKS`.
+    """
+    if not host:
+        return False
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(network)
+        for network in settings.METRICS_ALLOWED_NETWORKS
+    )
+
+
+async def metrics_access(
+    request: Request,
+    user_service: UserServiceDep,
+    credentials: JwtAuthorizationCredentials | None = Security(
+        optional_access_token_bearer
+    ),
+) -> None:
+    """
+    Allows clients in the `METRICS_ALLOWED_NETWORKS` (e.g. the Prometheus server) and admins.
+    No network is allowed by default: on a host where a proxy forwards the requests from
+    localhost, allowing localhost would serve the metrics to anyone.
+
+    :raises HTTPException 403: For any other client.
+    """
+    if is_allowed_address(request.client.host if request.client else None):
+        return
+    if credentials is None:
+        raise HTTPException(status_code=403, detail="Not allowed to read the metrics")
+    validate_role_is_admin(await get_current_user(user_service, credentials))
+
+
+@router.get("/metrics", dependencies=[Depends(metrics_access)], include_in_schema=False)
+async def get_metrics(
+    session: AsyncSession = Depends(get_async_session),
+) -> PlainTextResponse:
+    """
+    Serves the metrics of all workers in the Prometheus text format.
+
+    :param session: Database session, for the outbox depth and lag
+    :return: The metrics
+    """
+    outbox = EmailOutboxService(Repository(session, EmailOutbox))
+    EMAIL_OUTBOX_PENDING.set(await outbox.count_pending())
+    EMAIL_OUTBOX_LAG.set(await outbox.oldest_due_age() or 0)
+    snapshot = metrics.collect(settings.METRICS_MULTIPROC_DIR)
+    return PlainTextResponse(metrics.render(snapshot), media_type=CONTENT_TYPE)
@@ -1,10 +1,20 @@
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Body, HTTPException, Query, Request, Response, status
+
+from foundation.core.config import settings
+from foundation.core.etag import etag_headers, etag_matches, make_etag, not_modified
 from foundation.core.users.deps import UserServiceDep
 from foundation.core.users.schemas import (
     UsersPublic,
+    UsersCursorPublic,
+    UsersLookup,
+    UsersLookupPublic,
+    UserBulkUpdate,
+    UserBulkResult,
+    UsersBulkDelete,
+    UsersBulkResults,
     UserPublic,
     UserCreate,
     UserUpdate,
@@ -21,9 +31,12 @@ from foundation.api.deps import (
     CurrentUserDep,
     AdminRequired,
 )
+from foundation.api.serialization import ListSerializer, RawJSONResponse
 
 router = APIRouter()
 
+users_serializer = ListSerializer(UserPublic)
+
 
 @router.get(
     "/",
@@ -31,15 +44,32 @@ router = APIRouter()
     response_model=UsersPublic,
 )
 async def get_users(
-    user_service: UserServiceDep, skip: int = 0, limit: int = 100
+    request: Request,
+    user_service: UserServiceDep,
+    skip: int = 0,
+    limit: int = 100,
+    fields: str | None = None,
 ) -> Any:
     """
     Retrieves a list of users with pagination support.
 
+    With `fields`, only the listed fields of UserPublic are selected from the database and sent,
+    e.g. `?fields=id,email` for a list of email addresses.
+
+    Responds with 304 Not Modified, without loading the users, if no user changed since the
+    version in the `If-None-Match` header.
+
+    The users come from the database and are not validated against the response model again,
+    they are dumped straight to JSON by `users_serializer`.
+
+    :param request: The incoming request, for the `If-None-Match` header
     :param user_service: User service dependency for accessing user data
     :param skip: Number of records to skip (default is 0)
     :param limit: Maximum number of records to return (default is 100)
-    :return: A UsersPublic object containing the list of users and count
+    :param fields: Comma separated fields of UserPublic to return (default is all fields)
+    :return: JSON response in the shape of UsersPublic, with the list of users and count
+
+    :raises HTTPException 400: If a field is not a field of UserPublic
 
     Example usage::
 
@@ -52,8 +82,72 @@ async def get_users(
     - Ensure 'skip' and 'limit' are non-negative integers
     """
 
-    count, users = await user_service.get_users(skip=skip, limit=limit)
-    return UsersPublic(data=users, count=count)  # pyright: ignore [reportArgumentType]
+    try:
+        columns = users_serializer.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    etag = make_etag(
+        "users", await user_service.get_users_version(), skip, limit, columns
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    count, users = await user_service.get_users(skip=skip, limit=limit, columns=columns)
+    return RawJSONResponse(
+        users_serializer.dump_json(users, count, fields=columns),
+        headers=etag_headers(etag),
+    )
+
+
+# declared before /{user_id}, which would match "cursor" as well
+@router.get(
+    "/cursor",
+    dependencies=[AdminRequired],
+    response_model=UsersCursorPublic,
+)
+async def get_users_cursor(
+    user_service: UserServiceDep,
+    cursor: str | None = None,
+    limit: int = Query(default=100, ge=1, le=settings.API_MAX_PAGE_SIZE),
+    fields: str | None = None,
+) -> Any:
+    """
+    Retrieves the users after a cursor, in the order they were created.
+
+    Pass the `next_cursor` of a response to get the next page until `has_more` is false. Each
+    page is an index range scan after the last user of the previous page, so walking all users
+    is linear, and users created or deleted meanwhile do not make later pages repeat or skip
+    users. The total number of users is not counted.
+
+    :param user_service: User service dependency for accessing user data
+    :param cursor: `next_cursor` of the previous page, omitted for the first page
+    :param limit: Maximum number of users to return, at most `API_MAX_PAGE_SIZE` (default is 100)
+    :param fields: Comma separated fields of UserPublic to return (default is all fields)
+    :return: JSON response in the shape of UsersCursorPublic
+
+    Example usage::
+
+        page = client.get("/api/users/cursor?limit=500").json()
+        while page["has_more"]:
+            page = client.get(f"/api/users/cursor?limit=500&cursor={page['next_cursor']}").json()
+
+    :raises HTTPException 400: If the cursor is malformed or a field is not a field of UserPublic
+    """
+
+    try:
+        columns = users_serializer.parse_fields(fields)
+        page = await user_service.get_users_page(
+            cursor=cursor, limit=limit, columns=columns
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return RawJSONResponse(
+        users_serializer.dump_cursor_json(
+            page.items, page.next_cursor, page.has_more, fields=columns
+        )
+    )
 
 
 @router.get(
@@ -61,11 +155,20 @@ async def get_users(
     response_model=UserPublic,
 )
 async def get_user(
-    user_service: UserServiceDep, user_id: UUID, current_user: CurrentUserDep
+    request: Request,
+    response: Response,
+    user_service: UserServiceDep,
+    user_id: UUID,
+    current_user: CurrentUserDep,
 ) -> Any:
     """
     Fetch a user by user ID. Requires the current user to be an admin if fetching details other than their own.
 
+    Responds with 304 Not Modified, without serializing the user, if the user did not change
+    since the version in the `If-None-Match` header.
+
+    :param request: The incoming request, for the `If-None-Match` header
+    :param response: The outgoing response, for the `ETag` header
     :param user_service: Dependency to access user-related operations
     :param user_id: Unique identifier of the user to fetch
     :param current_user: Logged-in user making the request
@@ -85,6 +188,11 @@ async def get_user(
             status_code=404,
             detail=e.args,
         )
+
+    etag = make_etag("user", user.version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
     return user
 
 
@@ -141,6 +249,114 @@ async def create_user(*, user_service: UserServiceDep, user_in: UserCreate) -> A
     return user_created
 
 
+@router.post(
+    "/lookup",
+    dependencies=[AdminRequired],
+    response_model=UsersLookupPublic,
+)
+async def lookup_users(*, user_service: UserServiceDep, lookup: UsersLookup) -> Any:
+    """
+    Fetches the users with any of the given IDs or emails with a single query.
+
+    :param user_service: User service dependency for accessing user data
+    :param lookup: IDs and emails of the users to fetch
+    :return: The users found, and the requested IDs and emails that no user has
+
+    Example usage::
+
+        r = client.post("/api/users/lookup", json={"ids": [user_id], "emails": [email]})
+        users, missing = r.json()["data"], r.json()["missing"]
+    """
+    users = await user_service.lookup_users(user_ids=lookup.ids, emails=lookup.emails)
+    found = {str(user.id) for user in users} | {user.email for user in users}
+    keys = [str(user_id) for user_id in lookup.ids] + list(lookup.emails)
+    return UsersLookupPublic(
+        data=users,  # pyright: ignore [reportArgumentType]
+        missing=[key for key in dict.fromkeys(keys) if key not in found],
+    )
+
+
+@router.patch(
+    "/",
+    dependencies=[AdminRequired],
+    response_model=UsersBulkResults,
+)
+async def update_users(
+    *,
+    user_service: UserServiceDep,
+    users_in: list[UserBulkUpdate] = Body(max_length=settings.API_MAX_PAGE_SIZE),
+) -> Any:
+    """
+    Updates many users in one transaction.
+
+    Every update is applied like `PATCH /api/users/{user_id}`, and gets the status code it would
+    have had on its own: 200 with the updated user, 404 if the user does not exist, or 400 if
+    its email belongs to another user.
+
+    :param user_service: User service dependency for accessing user data
+    :param users_in: The updates, each with the ID of its user
+    :return: The result of each update, in the order of the updates
+
+    :raises HTTPException 400: If an ID is repeated, or the updates conflict with concurrent writes
+    """
+    try:
+        results = await user_service.update_users(
+            updates=[user_in.model_dump() for user_in in users_in]
+        )
+    except UserValueError as e:
+        raise HTTPException(status_code=400, detail=e.args)
+
+    bulk_results = []
+    for user_in in users_in:
+        result = results[user_in.id]
+        if isinstance(result, UserNotFoundError):
+            bulk_results.append(
+                UserBulkResult(id=user_in.id, status=404, detail=str(result))
+            )
+        elif isinstance(result, UserValueError):
+            bulk_results.append(
+                UserBulkResult(id=user_in.id, status=400, detail=str(result))
+            )
+        else:
+            bulk_results.append(
+                UserBulkResult(
+                    id=user_in.id,
+                    status=200,
+                    user=UserPublic.model_validate(result),
+                )
+            )
+    return UsersBulkResults(results=bulk_results)
+
+
+@router.delete(
+    "/",
+    dependencies=[AdminRequired],
+    response_model=UsersBulkResults,
+)
+async def delete_users(
+    *, user_service: UserServiceDep, users_in: UsersBulkDelete
+) -> Any:
+    """
+    Deletes many users with a single statement.
+
+    :param user_service: User service dependency for accessing user data
+    :param users_in: IDs of the users to delete
+    :return: The result of each deletion, 200 or 404 if the user does not exist, in the order
+        of the IDs
+    """
+    deleted = await user_service.delete_users(user_ids=users_in.ids)
+    return UsersBulkResults(
+        results=[
+            UserBulkResult(id=user_id, status=200)
+            if user_id in deleted
+            else UserBulkResult(
+                id=user_id, status=404, detail=str(UserNotFoundError(user_id))
+            )
+            for user_id in dict.fromkeys(users_in.ids)
+        ]
+    )
+
+
 @router.patch(
     "/{user_id}",
     response_model=UserPublic,
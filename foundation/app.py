@@ -1,5 +1,8 @@
+import asyncio
 import logging
 import sys
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.exception_handlers import (
@@ -8,42 +11,45 @@ from fastapi.exception_handlers import (
 from loguru import logger
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.sessions import SessionMiddleware
-from starlette.staticfiles import StaticFiles
 from starlette_wtf import CSRFProtectMiddleware
 
 from foundation.api.routes import (
     api_router,
+    health_router,
+    metrics_router,
 )  # Import the router from api
 from foundation.core import config
-from foundation.core.config import BASE_DIR, settings
-from foundation.tools import init_data
+from foundation.core.bootstrap import bootstrap, warm_pool
+from foundation.core.campaigns.runner import campaign_runner
+from foundation.core.config import settings
+from foundation.core.db import engine
+from foundation.core.email import precompile_email_templates
+from foundation.core.events import event_broker
+from foundation.core.loopmonitor import loop_monitor
+from foundation.core.metrics import metrics_writer
+from foundation.core.outbox.dispatcher import email_dispatcher
+from foundation.core.smtp import close_smtp_pool
+from foundation.core.startup import startup_report
+from foundation.core.tracing import tracer
+from foundation.middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    PathScopedMiddleware,
+    ProfilingMiddleware,
+    ServerTimingMiddleware,
+    TracingMiddleware,
+)
 from foundation.web.routes import (
     html_router,
 )  # Import the router from web
-from foundation.web.templates import templates
+from foundation.web.static import STATIC_DIR, PrecompressedStaticFiles
+from foundation.web.templates import templates, precompile_templates
 
 # delete all existing default loggers
 logger.remove()
 logger.add(sys.stderr, colorize=True, backtrace=True, diagnose=True)
 
-app = FastAPI(title=settings.APP_NAME)
-
-# Add middleware for sessions and CSRF protection
-app.add_middleware(SessionMiddleware, secret_key=settings.JWT_SECRET)
-app.add_middleware(CSRFProtectMiddleware, csrf_secret=settings.CSRF_SECRET)
-
-app.mount(
-    "/static",
-    StaticFiles(directory=f"{BASE_DIR}/web/static"),
-    name="static",
-)
-
-# include routes from api and web
-app.include_router(api_router, prefix="/api")
-app.include_router(html_router)
 
-
-@app.on_event("startup")
 async def on_startup():  # pragma: no cover
     """
     Set up tasks to be executed on application startup.
@@ -56,8 +62,104 @@ async def on_startup():  # pragma: no cover
     # silence bcrypt noise
     logging.getLogger("passlib").setLevel(logging.ERROR)
 
-    # setup admin user if not present in db
-    init_data.main()
+    # report the calls blocking the event loop, starting with the ones below
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+
+    # open the database connections before the first requests need them
+    with startup_report.step("db_pool"):
+        await warm_pool()
+
+    # setup admin user if not present in db, one worker at a time
+    with startup_report.step("bootstrap"):
+        await bootstrap()
+
+    # compile templates before the first request or email renders them
+    with startup_report.step("templates"):
+        precompile_email_templates()
+        precompile_templates()
+
+    # share the metrics of this worker with the other workers
+    metrics_writer.start()
+
+    # deliver queued emails in the background
+    if settings.EMAIL_ENABLED and settings.EMAIL_OUTBOX_DISPATCHER_ENABLED:
+        email_dispatcher.start()
+    if settings.EMAIL_ENABLED and settings.EMAIL_CAMPAIGN_RUNNER_ENABLED:
+        campaign_runner.start()
+
+    startup_report.log()
+
+
+async def on_shutdown():  # pragma: no cover
+    """
+    Stop background tasks and close the database connections on application shutdown.
+
+    :return: None
+    """
+    await email_dispatcher.stop()
+    await campaign_runner.stop()
+    await event_broker.stop()
+    await close_smtp_pool()
+    await metrics_writer.stop()
+    await loop_monitor.stop()
+    # export the traces still queued
+    await asyncio.to_thread(tracer.shutdown)
+    # close the connections of the pool
+    await engine.dispose()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:  # pragma: no cover
+    """
+    Runs the startup tasks before the app serves requests, and the shutdown tasks once it stops.
+
+    :param app: The application.
+    """
+    await on_startup()
+    try:
+        yield
+    finally:
+        await on_shutdown()
+
+
+app = FastAPI(title=settings.APP_NAME, lifespan=lifespan)
+
+# Add middleware for sessions and CSRF protection, only used by the HTML routes
+app.add_middleware(
+    PathScopedMiddleware,
+    middleware=SessionMiddleware,
+    exclude=settings.HTML_MIDDLEWARE_EXCLUDED_PATHS,
+    secret_key=settings.JWT_SECRET,
+)
+app.add_middleware(
+    PathScopedMiddleware,
+    middleware=CSRFProtectMiddleware,
+    exclude=settings.HTML_MIDDLEWARE_EXCLUDED_PATHS,
+    csrf_secret=settings.CSRF_SECRET,
+)
+# added after the other middleware to compress all their responses
+app.add_middleware(CompressionMiddleware)
+# the Server-Timing header covers the time spent compressing
+app.add_middleware(ServerTimingMiddleware)
+# the root span of the trace covers the other middleware
+app.add_middleware(TracingMiddleware)
+# time the requests through all other middleware
+app.add_middleware(MetricsMiddleware)
+# added last to profile the requests through all other middleware
+app.add_middleware(ProfilingMiddleware)
+
+app.mount(
+    "/static",
+    PrecompressedStaticFiles(directory=STATIC_DIR),
+    name="static",
+)
+
+# include routes from api and web
+app.include_router(api_router, prefix="/api")
+app.include_router(metrics_router)
+app.include_router(health_router)
+app.include_router(html_router)
 
 
 @app.exception_handler(StarletteHTTPException)
@@ -0,0 +1,118 @@
+import asyncio
+
+from loguru import logger
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from foundation.core.config import settings
+from foundation.core.db import async_sessionmaker, engine
+from foundation.core.security import get_password_hash
+from foundation.core.users.models import RoleEnum, StatusEnum, User
+
+"""
+This module seeds the data the app needs to run, when a worker starts.
+
+All the workers of a deployment start at the same time, and each runs the bootstrap. The seeding
+runs in a transaction holding a Postgres advisory lock, so the workers take turns: the first one
+creates the missing rows, the others wait for it to commit and then find them. The admin password
+is only hashed when the admin user is created, in a thread so that the event loop keeps running.
+
+Usage:
+    await bootstrap()
+    await warm_pool()
+"""
+
+# key of the advisory lock serializing the bootstrap of the workers, any constant unique to the app
+BOOTSTRAP_LOCK_KEY = 0x666F756E646174  # "foundat"
+
+
+async def seed_admin_user(session: AsyncSession) -> bool:
+    """
+    Creates the default admin user from the SUPERUSER settings, if no user has its email.
+
+    :param session: Session of the transaction to create the user in, committed by the caller.
+    :return: True if the user was created, False if it already exists.
+
+    Example usage:
+        async with async_sessionmaker() as session, session.begin():
+            await seed_admin_user(session)
+    """
+    statement = select(User.id).where(User.email == settings.SUPERUSER_EMAIL)
+    if await session.scalar(statement) is not None:
+        logger.info(
+            f"Found admin user name: {settings.SUPERUSER_NAME}, email: {settings.SUPERUSER_EMAIL}"
+        )
+        return False
+
+    logger.info(
+        f"Creating default admin user name: {settings.SUPERUSER_NAME}, email {settings.SUPERUSER_EMAIL}"
+    )
+    # bcrypt takes a few hundred milliseconds
+    hashed_password = await asyncio.to_thread(
+        get_password_hash, settings.SUPERUSER_PASSWORD
+    )
+    user = User(
+        full_name=settings.SUPERUSER_NAME,
+        email=settings.SUPERUSER_EMAIL,
+        status=StatusEnum.ACTIVE,
+        role=RoleEnum.ADMIN,
+        hashed_password=hashed_password,
+    )
+    session.add(user)
+    await session.flush()
+    logger.info(f"successfully created default admin user with id {user.id}")
+    return True
+
+
+async def bootstrap(sessionmaker=async_sessionmaker) -> bool:
+    """
+    Seeds the data the app needs, one worker at a time.
+
+    The advisory lock is taken for the transaction, and released by Postgres when it commits or
+    rolls back, or when the connection of a crashed worker closes.
+
+    :param sessionmaker: Factory of the session to seed the data with.
+    :return: True if this worker created data, False if it was already there.
+
+    Example usage:
+        await bootstrap()
+    """
+    async with sessionmaker() as session, session.begin():
+        await session.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": BOOTSTRAP_LOCK_KEY}
+        )
+        return await seed_admin_user(session)
+
+
+async def warm_pool(
+    pool_engine: AsyncEngine = engine, connections: int | None = None
+) -> int:
+    """
+    Opens connections of the pool before the first requests need them.
+
+    The connections are all checked out at the same time, so that the pool opens a new one for
+    each, and then returned to the pool.
+
+    :param pool_engine: Engine of the pool.
+    :param connections: Number of connections to open, defaults to
+        `settings.DB_POOL_WARMUP_CONNECTIONS`.
+    :return: The number of connections opened.
+
+    Example usage:
+        await warm_pool(connections=5)
+    """
+    if connections is None:
+        connections = settings.DB_POOL_WARMUP_CONNECTIONS
+    opened = await asyncio.gather(
+        *(pool_engine.connect().start() for _ in range(connections)),
+        return_exceptions=True,
+    )
+    errors = [
+        connection for connection in opened if isinstance(connection, BaseException)
+    ]
+    for connection in opened:
+        if not isinstance(connection, BaseException):
+            await connection.close()
+    if errors:
+        raise errors[0]
+    return len(opened)
@@ -0,0 +1,14 @@
+from foundation.core.campaigns.models import EmailCampaign, CampaignStatusEnum
+from foundation.core.campaigns.services import (
+    CampaignNotFoundError,
+    CampaignTemplate,
+    EmailCampaignService,
+)
+
+__all__ = [
+    "EmailCampaign",
+    "CampaignStatusEnum",
+    "CampaignNotFoundError",
+    "CampaignTemplate",
+    "EmailCampaignService",
+]
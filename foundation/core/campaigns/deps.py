@@ -0,0 +1,24 @@
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from foundation.core.campaigns.models import EmailCampaign
+from foundation.core.campaigns.services import EmailCampaignService
+from foundation.core.deps import get_async_session
+from foundation.core.repository import Repository
+
+
+def get_campaign_service(
+    async_session: AsyncSession = Depends(get_async_session),
+) -> EmailCampaignService:  # pragma: no cover
+    """
+    Returns an EmailCampaignService for the request database session.
+
+    :param async_session: Database session used for querying
+    :return: An EmailCampaignService instance.
+    """
+    return EmailCampaignService(Repository(async_session, EmailCampaign))
+
+
+CampaignServiceDep = Annotated[EmailCampaignService, Depends(get_campaign_service)]
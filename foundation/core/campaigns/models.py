@@ -0,0 +1,74 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from foundation.core.models import BaseWithId
+from foundation.core.users.models import StatusEnum, RoleEnum
+
+
+class CampaignStatusEnum(str, Enum):
+    """
+    Enum class representing the progress of an email campaign.
+
+    :Example:
+
+    >>> CampaignStatusEnum.values()
+    ['pending', 'running', 'completed', 'cancelled']
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+    @classmethod
+    def values(cls) -> list[str]:
+        return [v.value for v in cls]
+
+
+class EmailCampaign(BaseWithId):
+    """
+    Represents an email sent to a segment of users, mapped to the 'email_campaign' table.
+
+    Recipients are processed in ascending user id order. `last_recipient_id` is the checkpoint
+    of the last recipient handled, so a campaign interrupted by a crash or restart resumes after it.
+
+    Attributes:
+        id (UUID): Primary key, generated using a random UUID.
+        subject (str): Subject of the email.
+        html_template (str): Jinja template of the HTML body. `recipient.full_name` and `recipient.email` are available per recipient.
+        segment_status (StatusEnum, optional): Only send to users with this status.
+        segment_role (RoleEnum, optional): Only send to users with this role.
+        status (CampaignStatusEnum): Progress of the campaign, default is PENDING.
+        last_recipient_id (UUID, optional): Id of the last user the campaign was sent to.
+        sent_count (int): Number of emails accepted by the SMTP server.
+        failed_count (int): Number of emails that could not be sent.
+        started_at (datetime, optional): Time the first recipient was processed.
+        completed_at (datetime, optional): Time the last recipient was processed.
+
+    Example usage:
+        campaign = EmailCampaign(subject="Maintenance", html_template="<p>Hi {{ recipient.full_name }}</p>")
+    """
+
+    __tablename__ = "email_campaign"
+    __table_args__ = {"schema": "public"}
+
+    id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=func.gen_random_uuid()
+    )
+    subject: Mapped[str] = mapped_column(String())
+    html_template: Mapped[str] = mapped_column(Text())
+    segment_status: Mapped[Optional[StatusEnum]] = mapped_column(String())
+    segment_role: Mapped[Optional[RoleEnum]] = mapped_column(String())
+    status: Mapped[CampaignStatusEnum] = mapped_column(
+        String(), nullable=False, default=CampaignStatusEnum.PENDING
+    )
+    last_recipient_id: Mapped[Optional[UUID]]
+    sent_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    failed_count: Mapped[int] = mapped_column(nullable=False, default=0)
+    started_at: Mapped[Optional[datetime]]
+    completed_at: Mapped[Optional[datetime]]
@@ -0,0 +1,213 @@
+import asyncio
+import time
+from contextlib import suppress
+from typing import Callable
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from foundation.core.campaigns.models import EmailCampaign
+from foundation.core.campaigns.services import CampaignTemplate, EmailCampaignService
+from foundation.core.config import settings
+from foundation.core.db import async_sessionmaker
+from foundation.core.email import send_email_async
+from foundation.core.repository import Repository
+
+
+class TokenBucket:
+    """
+    Rate limiter allowing `rate` acquisitions per second on average, with bursts of up to `burst`.
+
+    :param rate: Tokens added per second.
+    :param burst: Maximum number of tokens in the bucket.
+
+    Example usage:
+
+        bucket = TokenBucket(rate=10)
+        await bucket.acquire()
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """
+        Waits until a token is available and takes it.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class CampaignRunner:
+    """
+    Background worker that sends email campaigns in resumable chunks.
+
+    Each chunk locks one campaign with `FOR UPDATE SKIP LOCKED`, streams up to `chunk_size`
+    recipients after the campaign checkpoint from a server-side cursor and sends them over the
+    pooled SMTP connections, with at most `concurrency` sends in flight and no more than
+    `rate_limit` sends per second. The sent and failed counts and the new checkpoint are
+    committed together at the end of the chunk.
+
+    If the process dies in the middle of a chunk, the chunk is sent again by the next runner,
+    so a recipient may receive a campaign twice but is never skipped.
+
+    :param session_factory: Factory creating a new AsyncSession for each chunk.
+    :param chunk_size: Maximum number of recipients sent per chunk.
+    :param concurrency: Maximum number of emails sent at the same time.
+    :param rate_limit: Maximum number of emails sent per second.
+    :param poll_interval: Seconds to wait before polling again when there is no campaign to send.
+
+    Example usage:
+
+        runner = CampaignRunner()
+        runner.start()
+        ...
+        await runner.stop()
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_sessionmaker,
+        *,
+        chunk_size: int | None = None,
+        concurrency: int | None = None,
+        rate_limit: float | None = None,
+        poll_interval: float | None = None,
+    ):
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size or settings.EMAIL_CAMPAIGN_CHUNK_SIZE
+        self.concurrency = concurrency or settings.EMAIL_CAMPAIGN_CONCURRENCY
+        self.rate_limiter = TokenBucket(
+            rate_limit or settings.EMAIL_CAMPAIGN_RATE_LIMIT_PER_SECOND,
+            burst=self.concurrency,
+        )
+        self.poll_interval = (
+            poll_interval
+            if poll_interval is not None
+            else settings.EMAIL_OUTBOX_POLL_INTERVAL_SECONDS
+        )
+        # the rendered template of each campaign, reused by all of its chunks
+        self._templates: dict[UUID, CampaignTemplate] = {}
+        self._task: asyncio.Task | None = None
+
+    async def run_chunk(self, session: AsyncSession) -> int:
+        """
+        Sends one chunk of the oldest open campaign and records its progress, then commits the session.
+
+        :param session: Session used to lock the campaign and stream its recipients.
+        :return: Number of recipients processed (sent or failed).
+        """
+        campaigns = EmailCampaignService(Repository(session, EmailCampaign))
+        campaign = await campaigns.claim_campaign()
+        if campaign is None:
+            await session.commit()
+            return 0
+
+        template = self._template(campaign)
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks: list[asyncio.Task] = []
+        last_recipient_id = None
+
+        async def send(email: str, full_name: str | None) -> None:
+            try:
+                await send_email_async(
+                    email_to=email,
+                    subject=campaign.subject,
+                    html_content=template.render(email=email, full_name=full_name),
+                )
+            finally:
+                slots.release()
+
+        async for recipient_id, email, full_name in campaigns.stream_recipients(
+            campaign, limit=self.chunk_size
+        ):
+            await slots.acquire()
+            await self.rate_limiter.acquire()
+            tasks.append(asyncio.create_task(send(email, full_name)))
+            last_recipient_id = recipient_id
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        failed = 0
+        for result in results:
+            if isinstance(result, BaseException):
+                failed += 1
+                logger.error(f"email campaign {campaign.id} send failed: {result}")
+
+        finished = len(tasks) < self.chunk_size
+        campaigns.record_progress(
+            campaign,
+            last_recipient_id=last_recipient_id,
+            sent=len(tasks) - failed,
+            failed=failed,
+            finished=finished,
+        )
+        await session.commit()
+        if finished:
+            self._templates.pop(campaign.id, None)
+        logger.info(
+            f"email campaign {campaign.id} sent chunk of {len(tasks)} emails ({failed} failed)"
+        )
+        return len(tasks)
+
+    def _template(self, campaign: EmailCampaign) -> CampaignTemplate:
+        template = self._templates.get(campaign.id)
+        if template is None:
+            template = CampaignTemplate(
+                campaign.html_template, {"app_name": settings.APP_NAME}
+            )
+            self._templates[campaign.id] = template
+        return template
+
+    async def run(self) -> None:  # pragma: no cover
+        """
+        Sends campaign chunks until cancelled. Sleeps for `poll_interval` whenever there is
+        no open campaign.
+        """
+        logger.info("email campaign runner started")
+        while True:
+            try:
+                async with self.session_factory() as session:
+                    processed = await self.run_chunk(session)
+            except Exception as e:
+                # keep the runner alive through transient database errors
+                logger.error(f"email campaign runner error: {e}")
+                processed = 0
+            if processed == 0:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:  # pragma: no cover
+        """
+        Starts the runner as a task on the running event loop.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name="email-campaign-runner")
+
+    async def stop(self) -> None:  # pragma: no cover
+        """
+        Cancels the runner task and waits for it to finish. The chunk in progress is rolled
+        back and sent again by the next runner.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        logger.info("email campaign runner stopped")
+
+
+campaign_runner = CampaignRunner()
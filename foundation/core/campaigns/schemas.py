@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime
+from typing import Annotated
+
+from jinja2 import TemplateError
+from jinja2.exceptions import SecurityError
+from pydantic import BaseModel, ConfigDict, StringConstraints, field_validator
+
+from foundation.core.campaigns.models import CampaignStatusEnum
+from foundation.core.campaigns.services import CampaignTemplate
+from foundation.core.users.models import StatusEnum, RoleEnum
+
+
+class CampaignCreate(BaseModel):
+    """
+    Represents the data needed to send an email to a segment of users.
+
+    Attributes:
+        subject (str): Subject of the email.
+        html_template (str): Jinja template of the HTML body, must be valid Jinja syntax and render
+            in the sandbox of the campaign templates.
+        segment_status (StatusEnum | None): Only send to users with this status.
+        segment_role (RoleEnum | None): Only send to users with this role.
+
+    Example:
+        campaign_in = CampaignCreate(
+            subject="Maintenance", html_template="<p>Hi {{ recipient.full_name }}</p>", segment_status=StatusEnum.ACTIVE
+        )
+    """
+
+    subject: Annotated[str, StringConstraints(min_length=1)]
+    html_template: Annotated[str, StringConstraints(min_length=1)]
+    segment_status: StatusEnum | None = None
+    segment_role: RoleEnum | None = None
+
+    @field_validator("html_template")
+    @classmethod
+    def validate_html_template(cls, value):
+        try:
+            CampaignTemplate(value)
+        except SecurityError as e:
+            raise ValueError(f"Unsafe template: {e}")
+        except TemplateError as e:
+            raise ValueError(f"Invalid template: {e.message}")
+        except Exception as e:
+            # errors raised rendering the template, e.g. a division by zero
+            raise ValueError(f"Invalid template: {e}")
+        return value
+
+
+class CampaignPublic(BaseModel):
+    """
+    Represents the public view of an email campaign and its progress.
+
+    Attributes:
+        id (uuid.UUID): Unique identifier of the campaign.
+        subject (str): Subject of the email.
+        segment_status (StatusEnum | None): Status filter of the segment.
+        segment_role (RoleEnum | None): Role filter of the segment.
+        status (CampaignStatusEnum): Progress of the campaign.
+        sent_count (int): Number of emails sent so far.
+        failed_count (int): Number of emails that could not be sent.
+        started_at (datetime | None): Time sending started.
+        completed_at (datetime | None): Time sending completed or was cancelled.
+        created_at (datetime | None): Time the campaign was created.
+    """
+
+    id: uuid.UUID
+    subject: str
+    segment_status: StatusEnum | None
+    segment_role: RoleEnum | None
+    status: CampaignStatusEnum
+    sent_count: int
+    failed_count: int
+    started_at: datetime | None
+    completed_at: datetime | None
+    created_at: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
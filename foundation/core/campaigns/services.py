@@ -0,0 +1,263 @@
+import html
+import re
+import secrets
+from typing import Any, AsyncIterator
+from uuid import UUID
+
+from jinja2.exceptions import SecurityError
+from jinja2.sandbox import SandboxedEnvironment
+from loguru import logger
+from sqlalchemy import Row, func, select
+
+from foundation.core.campaigns.models import CampaignStatusEnum, EmailCampaign
+from foundation.core.repository import Repository
+from foundation.core.users.models import RoleEnum, StatusEnum, User
+
+
+class CampaignNotFoundError(Exception):
+    """
+    Exception raised when an email campaign cannot be found by its ID.
+
+    :param id_val: The unique identifier of the campaign.
+    """
+
+    def __init__(self, id_val: UUID | str):
+        super().__init__(f"The campaign {id_val} does not exist")
+
+
+class CampaignSandbox(SandboxedEnvironment):
+    """
+    Sandbox of the campaign templates, which are written by admins in the app.
+
+    The Jinja sandbox renders an access to an unsafe attribute, e.g. `{{ ''.__class__ }}`, as an
+    empty string; this one rejects the template instead, so the admin gets an error.
+    """
+
+    def unsafe_undefined(self, obj: Any, attribute: str) -> Any:
+        raise SecurityError(
+            f"access to attribute {attribute!r} of {type(obj).__name__!r} object is unsafe."
+        )
+
+
+campaign_templates = CampaignSandbox()
+
+
+class CampaignTemplate:
+    """
+    An email campaign body that is rendered once and personalized per recipient.
+
+    The Jinja template is rendered a single time with unique markers in place of the recipient
+    fields, and the result is split on those markers. Personalizing an email is then a string
+    join of the pre-rendered parts with the HTML escaped recipient values, instead of a full
+    template render per recipient.
+
+    Recipient fields can only be output as-is, e.g. `{{ recipient.full_name }}`; filters and
+    conditions applied to them see the marker and not the recipient value.
+
+    :param html_template: Jinja template of the HTML body.
+    :param context: Values available to the template besides `recipient`.
+    :raises jinja2.TemplateSyntaxError: If the template is not valid Jinja.
+    :raises jinja2.sandbox.SecurityError: If the template accesses an unsafe attribute.
+    :raises Exception: Any other error raised rendering the template, e.g. a `jinja2.UndefinedError`
+        or a `ZeroDivisionError`.
+
+    Example usage:
+
+        template = CampaignTemplate("<p>Hi {{ recipient.full_name }}</p>")
+        html_content = template.render(full_name="Jane Doe", email="jane@example.com")
+    """
+
+    FIELDS = ("full_name", "email")
+
+    def __init__(self, html_template: str, context: dict[str, Any] | None = None):
+        token = secrets.token_hex(8)
+        markers = {field: f"\x00{token}:{field}\x00" for field in self.FIELDS}
+        rendered = campaign_templates.from_string(html_template).render(
+            {**(context or {}), "recipient": markers}
+        )
+        pattern = "|".join(re.escape(marker) for marker in markers.values())
+        # re.split with a capturing group alternates literal parts and field markers
+        parts = re.split(f"({pattern})", rendered)
+        field_by_marker = {marker: field for field, marker in markers.items()}
+        self._parts: list[tuple[bool, str]] = [
+            (True, field_by_marker[part]) if part in field_by_marker else (False, part)
+            for part in parts
+            if part
+        ]
+
+    def render(self, **recipient: str | None) -> str:
+        """
+        Returns the HTML body for one recipient.
+
+        :param recipient: Values for the recipient fields. Missing values render as an empty string.
+        :return: The personalized HTML content.
+        """
+        return "".join(
+            html.escape(recipient.get(value) or "") if is_field else value
+            for is_field, value in self._parts
+        )
+
+
+class EmailCampaignService:
+    """
+    Handles creating email campaigns and tracking their progress.
+
+    Recipients are read in ascending user id order, and the id of the last processed recipient
+    is stored with the campaign, so progress survives a restart of the `CampaignRunner`.
+
+    Example usage:
+
+        campaigns = EmailCampaignService(Repository(session, EmailCampaign))
+        campaign = await campaigns.create_campaign(
+            subject="Maintenance", html_template="<p>...</p>", segment_status=StatusEnum.ACTIVE
+        )
+    """
+
+    repository: Repository[EmailCampaign]
+
+    def __init__(self, repository: Repository[EmailCampaign]):
+        self.repository = repository
+
+    async def create_campaign(
+        self,
+        *,
+        subject: str,
+        html_template: str,
+        segment_status: StatusEnum | None = None,
+        segment_role: RoleEnum | None = None,
+    ) -> EmailCampaign:
+        """
+        Creates a pending campaign. It is picked up by the next `CampaignRunner` chunk.
+
+        :param subject: Subject of the email.
+        :param html_template: Jinja template of the HTML body.
+        :param segment_status: Only send to users with this status.
+        :param segment_role: Only send to users with this role.
+        :return: The created EmailCampaign.
+        """
+        campaign = await self.repository.create(
+            {
+                "subject": subject,
+                "html_template": html_template,
+                "segment_status": segment_status,
+                "segment_role": segment_role,
+                "status": CampaignStatusEnum.PENDING,
+                "sent_count": 0,
+                "failed_count": 0,
+            }
+        )
+        logger.info(f"created email campaign {campaign.id}: {subject}")
+        return campaign
+
+    async def get_campaign(self, campaign_id: UUID) -> EmailCampaign:
+        """
+        Fetches a campaign by its ID.
+
+        :param campaign_id: The unique identifier of the campaign.
+        :return: The EmailCampaign.
+        :raises CampaignNotFoundError: If the campaign does not exist.
+        """
+        campaign = await self.repository.find_by_id(campaign_id)
+        if campaign is None:
+            raise CampaignNotFoundError(campaign_id)
+        return campaign
+
+    async def cancel_campaign(self, campaign_id: UUID) -> EmailCampaign:
+        """
+        Stops a campaign from sending to any further recipients. A chunk that is being sent
+        when the campaign is cancelled is finished first.
+
+        :param campaign_id: The unique identifier of the campaign.
+        :return: The cancelled EmailCampaign.
+        :raises CampaignNotFoundError: If the campaign does not exist.
+        """
+        campaign = await self.get_campaign(campaign_id)
+        if campaign.status in (CampaignStatusEnum.PENDING, CampaignStatusEnum.RUNNING):
+            campaign.status = CampaignStatusEnum.CANCELLED
+            campaign.completed_at = func.now()  # pyright: ignore [reportAttributeAccessIssue]
+            await self.repository.session.commit()
+            await self.repository.session.refresh(campaign)
+        return campaign
+
+    async def claim_campaign(self) -> EmailCampaign | None:
+        """
+        Locks and returns the oldest campaign that still has recipients left.
+
+        The row is selected with `FOR UPDATE SKIP LOCKED` and the lock is held until the session
+        is committed or rolled back, so a campaign is only ever sent by one runner at a time. If
+        the runner dies, the lock is released with its connection and another runner resumes
+        the campaign from its checkpoint.
+
+        :return: The claimed EmailCampaign, or None if there is nothing to send.
+        """
+        query = (
+            select(EmailCampaign)
+            .where(
+                EmailCampaign.status.in_(
+                    [CampaignStatusEnum.PENDING, CampaignStatusEnum.RUNNING]
+                )
+            )
+            .order_by(EmailCampaign.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        campaign = await self.repository.find_one(query)
+        if campaign is not None and campaign.status == CampaignStatusEnum.PENDING:
+            campaign.status = CampaignStatusEnum.RUNNING
+            campaign.started_at = func.now()  # pyright: ignore [reportAttributeAccessIssue]
+        return campaign
+
+    async def stream_recipients(
+        self, campaign: EmailCampaign, *, limit: int, yield_per: int = 100
+    ) -> AsyncIterator[Row[tuple[UUID, str, str | None]]]:
+        """
+        Streams the next recipients of a campaign after its checkpoint from a server-side cursor.
+
+        Only the columns needed to send the email are selected, in batches of `yield_per` rows.
+
+        :param campaign: The campaign to read recipients for.
+        :param limit: Maximum number of recipients to return.
+        :param yield_per: Number of rows fetched from the cursor at a time.
+        :return: Async iterator of (id, email, full_name) rows in ascending id order.
+        """
+        query = select(User.id, User.email, User.full_name)
+        if campaign.segment_status is not None:
+            query = query.where(User.status == campaign.segment_status)
+        if campaign.segment_role is not None:
+            query = query.where(User.role == campaign.segment_role)
+        if campaign.last_recipient_id is not None:
+            query = query.where(User.id > campaign.last_recipient_id)
+        query = query.order_by(User.id).limit(limit)
+
+        result = await self.repository.stream_query(query, yield_per=yield_per)
+        async for row in result:
+            yield row
+
+    def record_progress(
+        self,
+        campaign: EmailCampaign,
+        *,
+        last_recipient_id: UUID | None,
+        sent: int,
+        failed: int,
+        finished: bool,
+    ) -> None:
+        """
+        Records the result of a chunk and moves the checkpoint. Changes are written by the next commit.
+
+        :param campaign: The campaign the chunk was sent for.
+        :param last_recipient_id: Id of the last recipient in the chunk, None if the chunk was empty.
+        :param sent: Number of emails sent in the chunk.
+        :param failed: Number of emails that could not be sent in the chunk.
+        :param finished: True if there are no recipients left after this chunk.
+        """
+        if last_recipient_id is not None:
+            campaign.last_recipient_id = last_recipient_id
+        campaign.sent_count += sent
+        campaign.failed_count += failed
+        if finished:
+            campaign.status = CampaignStatusEnum.COMPLETED
+            campaign.completed_at = func.now()  # pyright: ignore [reportAttributeAccessIssue]
+            logger.info(
+                f"email campaign {campaign.id} completed: {campaign.sent_count} sent, {campaign.failed_count} failed"
+            )
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from typing import Literal, Optional
 
@@ -34,12 +35,54 @@ class Settings(BaseSettings):
         JWT_SECRET (str): Secret key for JWT.
         CSRF_SECRET (str): Secret key for CSRF.
 
+        TEMPLATES_BYTECODE_CACHE_DIR (str | None): Directory for the Jinja bytecode cache shared by worker processes. Defaults to the system temp dir in production, disabled otherwise.
+        FRAGMENT_CACHE_MAX_BYTES (int): Maximum size of the rendered HTML fragment cache per process. Default is 8 MiB.
+        FRAGMENT_CACHE_TTL_SECONDS (float): Cached fragments expire after this long, bounding staleness from writes in other processes. Default is 10.
+        HTML_MIDDLEWARE_EXCLUDED_PATHS (list[str]): Path prefixes of the requests that skip the session and CSRF middleware of the HTML routes. Default is the API, static files and API docs.
+        WEB_INLINE_INITIAL_DATA (bool): Render the first users page and the dashboard stats into the page instead of lazy-loading them with a second request. Default is True.
+        COMPRESSION_MINIMUM_SIZE (int): Responses smaller than this many bytes are sent uncompressed. Default is 500.
+        COMPRESSION_GZIP_LEVEL (int): gzip compression level of responses, 1 to 9. Default is 6.
+        COMPRESSION_BROTLI_QUALITY (int): brotli compression quality of responses, 0 to 11. Default is 4.
+        COMPRESSION_CONTENT_TYPES (list[str]): Media types of the responses that are compressed.
+        EVENTS_QUEUE_SIZE (int): Row changes queued per live event stream before the oldest are dropped. Default is 100.
+        EVENTS_KEEPALIVE_SECONDS (float): Idle live event streams send a comment this often to detect closed connections. Default is 15.
+        API_MAX_PAGE_SIZE (int): Maximum `limit` of the cursor paginated API lists. Default is 1000.
+        SINGLEFLIGHT_ENABLED (bool): Concurrent identical reads of the services share a single database call. Default is True.
+        METRICS_ALLOWED_NETWORKS (list[str]): Client networks served `/metrics` without an admin token, matched against the address of the peer connecting to the app (the proxy, behind a proxy). Default is none.
+        METRICS_MULTIPROC_DIR (str | None): Directory the worker processes share their metrics through. Default is None, for a single worker.
+        METRICS_FLUSH_INTERVAL (float): Seconds between the writes of the metrics of a worker to METRICS_MULTIPROC_DIR. Default is 5.
+        SERVER_TIMING_ENABLED (bool): Send the `Server-Timing` header on every response, not only to admins. Default is False.
+        PROFILING_ENABLED (bool): Admins can profile a request with the `X-Profile` header or the `profile` query parameter. Default is True.
+        PROFILING_INTERVAL (float): Seconds between the samples of a profiled request. Default is 0.001.
+        PROFILING_DIR (str): Directory the request profiles are kept in. Default is `foundation-profiles` in the temp directory.
+        PROFILING_MAX_PROFILES (int): Number of request profiles kept, the oldest are removed. Default is 50.
+        LOOP_MONITOR_ENABLED (bool): Measure the event loop lag and report the calls blocking the loop. Default is True.
+        LOOP_MONITOR_INTERVAL (float): Seconds between the event loop lag probes. Default is 0.025.
+        LOOP_MONITOR_BLOCK_THRESHOLD (float): Seconds a call may block the event loop before it is reported. Default is 0.1.
+        LOOP_MONITOR_STRICT (bool): Fail the tests that block the event loop. Default is False.
+        TRACING_ENABLED (bool): Trace the requests. Default is True.
+        TRACING_SAMPLE_RATE (float): Share of the requests traced, unless the caller decided with the traceparent header. Default is 0.1.
+        TRACING_PARENT_BASED (bool): Trace the requests whose traceparent header is sampled, and only those. Default is True.
+        TRACING_EXPORTERS (list[str]): Exporters of the traces, out of "memory", "jsonl" and "otlp". Default is ["memory"].
+        TRACING_MAX_TRACES (int): Traces kept in memory by each worker, for the admin pages. Default is 100.
+        TRACING_MAX_SPANS (int): Spans recorded per trace, the others are dropped. Default is 500.
+        TRACING_EXPORT_QUEUE_SIZE (int): Traces waiting to be exported before new ones are dropped. Default is 1000.
+        TRACING_JSONL_PATH (str): File the "jsonl" exporter appends the spans to. Default is foundation-traces.jsonl in the temporary directory.
+        TRACING_OTLP_ENDPOINT (str): OTLP/HTTP traces endpoint of the "otlp" exporter. Default is http://localhost:4318/v1/traces.
+        TRACING_OTLP_HEADERS (dict[str, str]): Headers sent to the OTLP endpoint, e.g. for authentication. Default is {}.
+        TRACING_SERVICE_NAME (str | None): Service name of the exported spans. Default is the APP_NAME.
+        TRACING_EXCLUDED_PATHS (list[str]): Path prefixes of the requests not traced, e.g. the probes. Default is static files, metrics and probes.
+
         DATABASE_URL (str | None): Database URL; either this has to be set or each individual PostgreSQL value.
         POSTGRES_USER (str | None): PostgreSQL user.
         POSTGRES_PASSWORD (str | None): PostgreSQL password.
         POSTGRES_DB (str | None): PostgreSQL database name.
         POSTGRES_HOST (str | None): PostgreSQL host.
         POSTGRES_PORT (int | None): PostgreSQL port.
+        DB_POOL_WARMUP_CONNECTIONS (int): Database connections each worker opens when it starts. Default is 5.
+        READINESS_CACHE_SECONDS (float): Seconds the result of the readiness checks is reused. Default is 1.
+        READINESS_DB_TIMEOUT_SECONDS (float): Seconds the readiness database ping may take. Default is 0.5.
+        READINESS_POOL_SATURATION (float): Share of the database pool in use above which the worker is not ready. Default is 0.9.
 
         SUPERUSER_NAME (str): Superuser name.
         SUPERUSER_EMAIL (str): Superuser email.
@@ -55,6 +98,19 @@ class Settings(BaseSettings):
         EMAIL_FROM_EMAIL (str | None): From email address.
         EMAIL_FROM_NAME (str | None): From name.
         EMAIL_RESET_TOKEN_EXPIRE_HOURS (int): Reset token expiration time in hours. Default is 48.
+        EMAIL_SMTP_POOL_SIZE (int): Maximum number of persistent SMTP connections per process. Default is 4.
+        EMAIL_SMTP_TIMEOUT_SECONDS (float): Socket timeout for SMTP commands. Default is 10.
+        EMAIL_SMTP_KEEPALIVE_SECONDS (float): Idle SMTP connections are checked with NOOP after this long. Default is 30.
+        EMAIL_SMTP_MAX_IDLE_SECONDS (float): Idle SMTP connections are closed after this long. Default is 300.
+        EMAIL_OUTBOX_DISPATCHER_ENABLED (bool): Run the email outbox dispatcher inside the app process. Default is True.
+        EMAIL_OUTBOX_BATCH_SIZE (int): Maximum number of outbox emails claimed per dispatch. Default is 50.
+        EMAIL_OUTBOX_POLL_INTERVAL_SECONDS (float): Seconds between outbox polls when idle. Default is 5.
+        EMAIL_OUTBOX_MAX_ATTEMPTS (int): Send attempts before an outbox email is marked failed. Default is 5.
+        EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS (int): Base delay for exponential retry backoff. Default is 30.
+        EMAIL_CAMPAIGN_RUNNER_ENABLED (bool): Run the email campaign runner inside the app process. Default is True.
+        EMAIL_CAMPAIGN_CHUNK_SIZE (int): Recipients sent per campaign chunk, between progress checkpoints. Default is 200.
+        EMAIL_CAMPAIGN_CONCURRENCY (int): Maximum number of campaign emails sent at the same time. Default is 4.
+        EMAIL_CAMPAIGN_RATE_LIMIT_PER_SECOND (float): Maximum number of campaign emails sent per second. Default is 10.
 
     Methods:
         postgres_url(self, *, is_async: bool = True) -> str:
@@ -83,6 +139,63 @@ class Settings(BaseSettings):
     JWT_SECRET: str
     CSRF_SECRET: str
 
+    TEMPLATES_BYTECODE_CACHE_DIR: str | None = None
+    FRAGMENT_CACHE_MAX_BYTES: int = 8 * 1024 * 1024
+    FRAGMENT_CACHE_TTL_SECONDS: float = 10.0
+    HTML_MIDDLEWARE_EXCLUDED_PATHS: list[str] = [
+        "/api",
+        "/static",
+        "/docs",
+        "/redoc",
+        "/openapi.json",
+        "/metrics",
+        "/healthz",
+        "/readyz",
+    ]
+    WEB_INLINE_INITIAL_DATA: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 500
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_CONTENT_TYPES: list[str] = [
+        "text/html",
+        "text/css",
+        "text/plain",
+        "text/javascript",
+        "application/javascript",
+        "application/json",
+        "image/svg+xml",
+    ]
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    API_MAX_PAGE_SIZE: int = 1000
+    SINGLEFLIGHT_ENABLED: bool = True
+    METRICS_ALLOWED_NETWORKS: list[str] = []
+    METRICS_MULTIPROC_DIR: str | None = None
+    METRICS_FLUSH_INTERVAL: float = 5.0
+    SERVER_TIMING_ENABLED: bool = False
+    PROFILING_ENABLED: bool = True
+    PROFILING_INTERVAL: float = 0.001
+    PROFILING_DIR: str = os.path.join(tempfile.gettempdir(), "foundation-profiles")
+    PROFILING_MAX_PROFILES: int = 50
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL: float = 0.025
+    LOOP_MONITOR_BLOCK_THRESHOLD: float = 0.1
+    LOOP_MONITOR_STRICT: bool = False
+    TRACING_ENABLED: bool = True
+    TRACING_SAMPLE_RATE: float = 0.1
+    TRACING_PARENT_BASED: bool = True
+    TRACING_EXPORTERS: list[str] = ["memory"]
+    TRACING_MAX_TRACES: int = 100
+    TRACING_MAX_SPANS: int = 500
+    TRACING_EXPORT_QUEUE_SIZE: int = 1000
+    TRACING_JSONL_PATH: str = os.path.join(
+        tempfile.gettempdir(), "foundation-traces.jsonl"
+    )
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_OTLP_HEADERS: dict[str, str] = {}
+    TRACING_SERVICE_NAME: str | None = None
+    TRACING_EXCLUDED_PATHS: list[str] = ["/static", "/metrics", "/healthz", "/readyz"]
+
     # either DATABASE_URL has to be set
     DATABASE_URL: str | None = None
     # or each POSTGRES VALUE
@@ -91,6 +204,10 @@ class Settings(BaseSettings):
     POSTGRES_DB: str | None = None
     POSTGRES_HOST: str | None = None
     POSTGRES_PORT: int | None = None
+    DB_POOL_WARMUP_CONNECTIONS: int = 5
+    READINESS_CACHE_SECONDS: float = 1.0
+    READINESS_DB_TIMEOUT_SECONDS: float = 0.5
+    READINESS_POOL_SATURATION: float = 0.9
 
     SUPERUSER_NAME: str
     SUPERUSER_EMAIL: str
@@ -106,6 +223,21 @@ class Settings(BaseSettings):
     EMAIL_FROM_EMAIL: str | None = None
     EMAIL_FROM_NAME: str | None = None
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
+    EMAIL_SMTP_POOL_SIZE: int = 4
+    EMAIL_SMTP_TIMEOUT_SECONDS: float = 10.0
+    EMAIL_SMTP_KEEPALIVE_SECONDS: float = 30.0
+    EMAIL_SMTP_MAX_IDLE_SECONDS: float = 300.0
+
+    EMAIL_OUTBOX_DISPATCHER_ENABLED: bool = True
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_INTERVAL_SECONDS: float = 5.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS: int = 30
+
+    EMAIL_CAMPAIGN_RUNNER_ENABLED: bool = True
+    EMAIL_CAMPAIGN_CHUNK_SIZE: int = 200
+    EMAIL_CAMPAIGN_CONCURRENCY: int = 4
+    EMAIL_CAMPAIGN_RATE_LIMIT_PER_SECOND: float = 10.0
 
     def postgres_url(self, *, is_async: bool = True) -> str:
         asyncpg = "+asyncpg" if is_async else ""
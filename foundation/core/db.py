@@ -1,6 +1,12 @@
+import time
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from foundation.core.config import settings
+from foundation.core.metrics import metrics, request_stats
+from foundation.core.timing import record_timing
+from foundation.core.tracing import record_span
 
 """
 This module sets up the configuration for the asynchronous SQLAlchemy engine and session factory.
@@ -30,3 +36,64 @@ engine = create_async_engine(settings.postgres_dsn, echo=True)
 
 # create a reusable factory for new AsyncSession instances
 async_sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+
+DB_QUERY_DURATION = metrics.histogram(
+    "db_query_duration_seconds",
+    "Time to execute a database query, by statement type.",
+    ["statement"],
+)
+# labels of the statement types, any other statement is counted as OTHER
+STATEMENT_TYPES = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"})
+# characters of a statement kept in its trace span
+SPAN_STATEMENT_LIMIT = 2000
+
+metrics.gauge(
+    "db_pool_size",
+    "Connections the database pool keeps open.",
+    function=lambda: engine.pool.size(),  # pyright: ignore [reportAttributeAccessIssue]
+)
+metrics.gauge(
+    "db_pool_checked_out",
+    "Database connections in use.",
+    function=lambda: engine.pool.checkedout(),  # pyright: ignore [reportAttributeAccessIssue]
+)
+metrics.gauge(
+    "db_pool_overflow",
+    "Database connections open beyond the pool size, negative while the pool is not full.",
+    function=lambda: engine.pool.overflow(),  # pyright: ignore [reportAttributeAccessIssue]
+)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    statement_type = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+    if statement_type not in STATEMENT_TYPES:
+        statement_type = "OTHER"
+    DB_QUERY_DURATION.observe(elapsed, statement=statement_type)
+    record_timing("db", elapsed)
+    record_span(
+        f"db {statement_type}",
+        elapsed,
+        kind="client",
+        **{
+            "db.system": "postgresql",
+            "db.statement": (statement or "")[:SPAN_STATEMENT_LIMIT],
+        },
+    )
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+@event.listens_for(engine.sync_engine, "handle_error")
+def _handle_error(context):
+    starts = context.connection.info.get("query_start") if context.connection else None
+    if starts:
+        starts.pop()
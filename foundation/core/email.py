@@ -1,13 +1,19 @@
+import time
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import emails  # type: ignore
-from emails.backend.response import SMTPResponse
-from jinja2 import Template
+from jinja2 import Environment, FileSystemLoader
 from loguru import logger
 
 from foundation.core.config import BASE_DIR
 from foundation.core.config import settings
+from foundation.core.smtp import get_smtp_pool
+from foundation.core.templating import create_bytecode_cache, templates_auto_reload
+
+if TYPE_CHECKING:
+    # emails (and requests with it) takes over 100ms to import, it is imported on the first send
+    import emails  # type: ignore
+    from emails.backend.response import SMTPResponse
 
 
 @dataclass
@@ -34,6 +40,45 @@ class EmailData:
     subject: str
 
 
+EMAIL_TEMPLATES_DIR = BASE_DIR / "foundation" / "core" / "email_templates" / "build"
+
+
+def create_email_template_env() -> Environment:
+    """
+    Creates the Jinja environment used to render email templates.
+
+    Compiled templates are cached by the environment. Outside of production the cache checks
+    the template file mtime and recompiles changed templates; in production templates are
+    compiled once per process and their bytecode is shared between worker processes.
+
+    :return: A configured jinja2 Environment.
+    """
+    return Environment(
+        loader=FileSystemLoader(EMAIL_TEMPLATES_DIR),
+        auto_reload=templates_auto_reload(),
+        bytecode_cache=create_bytecode_cache(),
+    )
+
+
+email_templates = create_email_template_env()
+
+
+def precompile_email_templates() -> int:
+    """
+    Compiles every email template into the template cache, so the first email sent by a
+    new process does not pay for parsing and compiling its template.
+
+    :return: The number of templates compiled.
+    """
+    start = time.perf_counter()
+    names = email_templates.list_templates(extensions=["html"])
+    for name in names:
+        email_templates.get_template(name)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(f"precompiled {len(names)} email templates in {elapsed_ms:.1f}ms")
+    return len(names)
+
+
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
     """
     Renders an email template with the given context.
@@ -46,14 +91,68 @@ def render_email_template(*, template_name: str, context: dict[str, Any]) -> str
         html_content = render_email_template(template_name="welcome.html", context={"username": "John Doe"})
 
     Error cases:
-        Raises FileNotFoundError if the template file does not exist.
-        Raises KeyError if any placeholders in the template are missing from the context.
+        Raises jinja2.TemplateNotFound if the template file does not exist.
     """
-    template_str = (
-        BASE_DIR / "foundation" / "core" / "email_templates" / "build" / template_name
-    ).read_text()
-    html_content = Template(template_str).render(context)
-    return html_content
+    return email_templates.get_template(template_name).render(context)
+
+
+def build_email_message(*, subject: str, html_content: str) -> "emails.Message":
+    """
+    Builds an email message from the configured sender.
+
+    :param subject: Subject of the email.
+    :param html_content: HTML content of the email.
+    :return: An emails.Message ready to be sent or serialized.
+    """
+    import emails  # type: ignore
+
+    return emails.Message(
+        subject=subject,
+        html=html_content,
+        text="hello",
+        mail_from=(settings.EMAIL_FROM_NAME, settings.EMAIL_FROM_EMAIL),
+    )
+
+
+async def send_email_async(
+    *,
+    email_to: str,
+    subject: str,
+    html_content: str,
+) -> bool:  # pragma: no cover
+    """
+    Sends an email over a pooled, persistent SMTP connection without blocking the event loop.
+
+    :param email_to: Email address of the recipient.
+    :param subject: Subject of the email.
+    :param html_content: HTML content of the email.
+    :return: True if the email was sent, False if sending email is disabled.
+    :raises smtplib.SMTPException: If the SMTP server rejects the email.
+    :raises OSError: If the SMTP server can not be reached.
+
+    Example usage:
+
+        sent = await send_email_async(
+            email_to='recipient@example.com',
+            subject='Test Email',
+            html_content='<h1>Hello</h1>'
+        )
+    """
+    if not settings.EMAIL_ENABLED:
+        logger.info(f"send email is disabled: {subject} to {email_to}")
+        return False
+    message = build_email_message(subject=subject, html_content=html_content)
+    message.set_mail_to(email_to)
+    assert settings.EMAIL_FROM_EMAIL is not None, "EMAIL_FROM_EMAIL is not set"
+    content = message.as_string()
+    assert content is not None, f"unable to build the email {subject} to {email_to}"
+    await get_smtp_pool().send(
+        from_addr=settings.EMAIL_FROM_EMAIL,
+        to_addrs=[email_to],
+        message=content,
+    )
+    logger.info(f"send email {email_to} subject: {subject}")
+    return True
 
 
 def send_email(  # pragma: no cover
@@ -61,7 +160,7 @@ def send_email(  # pragma: no cover
     email_to: str,
     subject: str,
     html_content: str,
-) -> SMTPResponse | None:
+) -> "SMTPResponse | None":
     """
     Sends an email with specified subject and HTML content.
 
@@ -82,12 +181,7 @@ def send_email(  # pragma: no cover
         else:
             print("Email sending is disabled.")
     """
-    message = emails.Message(
-        subject=subject,
-        html=html_content,
-        text="hello",
-        mail_from=(settings.EMAIL_FROM_NAME, settings.EMAIL_FROM_EMAIL),
-    )
+    message = build_email_message(subject=subject, html_content=html_content)
     smtp_options = {"host": settings.EMAIL_SMTP_HOST, "port": settings.EMAIL_SMTP_PORT}
     if settings.EMAIL_SMTP_TLS:
         smtp_options["tls"] = True
@@ -160,22 +254,19 @@ def generate_reset_password_email(email_to: str, email: str, token: str) -> Emai
     return EmailData(html_content=html_content, subject=subject)
 
 
-def generate_new_account_email(
-    email_to: str, username: str, password: str
-) -> EmailData:
+def generate_new_account_email(email_to: str, username: str) -> EmailData:
     """
     :param email_to: Recipient's email address.
     :param username: Username for the new account.
-    :param password: Password for the new account.
     :return: EmailData object containing the email content and subject.
 
-    Generates an email for a new account with user's credentials.
+    Generates the welcome email of a new account. The password is never part of the email, the
+    email is stored in the outbox until it is sent.
 
     Example usage:
         email = generate_new_account_email(
             email_to="user@example.com",
             username="new_user",
-            password="secure_password"
         )
         send_email(email)
     """
@@ -186,7 +277,6 @@ def generate_new_account_email(
         context={
             "app_name": settings.APP_NAME,
             "username": username,
-            "password": password,
             "email": email_to,
             "link": settings.server_host,
         },
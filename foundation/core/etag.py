@@ -0,0 +1,72 @@
+import hashlib
+from typing import Any
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+"""
+This module provides conditional GET support with ETags.
+
+Routes compute an ETag from a cheap version of the data they return (e.g. `updated_at` of a row,
+or the count and latest `updated_at` of a table) before loading, rendering or serializing it. If
+the client already has that version (`If-None-Match`), the route returns 304 Not Modified with
+no body.
+
+Usage:
+    etag = make_etag("users", await user_service.get_users_version(), skip, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+"""
+
+# browsers may keep the response, but must revalidate it with the ETag before every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Builds a weak ETag from the given parts.
+
+    :param parts: Values identifying the version of the response, converted with str().
+    :return: The ETag, e.g. W/"5d41402abc4b2a76b9719d911017c592".
+    """
+    digest = hashlib.md5(
+        "\x1f".join(str(part) for part in parts).encode(), usedforsecurity=False
+    )
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Checks if the client already has the version identified by `etag`, using the weak
+    comparison of the `If-None-Match` header (RFC 9110).
+
+    :param request: The incoming request.
+    :param etag: ETag of the current version.
+    :return: True if the response can be 304 Not Modified.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(",")
+    )
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    """
+    :param etag: ETag of the response.
+    :return: The ETag and Cache-Control headers to send with the response.
+    """
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    """
+    :param etag: ETag of the current version.
+    :return: An empty 304 Not Modified response.
+    """
+    return Response(status_code=304, headers=etag_headers(etag))
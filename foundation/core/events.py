@@ -0,0 +1,194 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from typing import AsyncIterator
+from uuid import UUID
+
+import asyncpg
+from loguru import logger
+
+from foundation.core.config import settings
+from foundation.core.versioning import data_versions
+
+"""
+This module fans out database row changes to the live views of the web app.
+
+A trigger on the user table (see `db/migrations/*_create_row_change_notify.sql`) sends every
+committed insert, update and delete as a Postgres NOTIFY on the `row_changes` channel, so changes
+made by any worker or tool are seen. Each worker process holds a single LISTEN connection, opened
+when the first subscriber connects and closed when the last one leaves, and copies every change
+to the queues of its subscribers. Idle subscribers do not query the database at all.
+
+A received change also bumps the data version of its table, so the fragment caches of this worker
+drop data written by other workers right away instead of after their TTL.
+
+Usage:
+    async with event_broker.subscribe() as changes:
+        change = await changes.get()
+"""
+
+ROW_CHANGES_CHANNEL = "row_changes"
+# tables with the notify_row_change trigger
+NOTIFY_TABLES = ("user",)
+# operation of the change published after the listener reconnected, changes may have been missed
+RESYNC = "RESYNC"
+
+
+@dataclass(frozen=True)
+class RowChange:
+    """
+    A committed change of a table row.
+
+    :param table: Name of the table.
+    :param op: "INSERT", "UPDATE", "DELETE", or "RESYNC" if any row of the table may have changed.
+    :param id: Id of the changed row, None for "RESYNC".
+    """
+
+    table: str
+    op: str
+    id: UUID | None = None
+
+    @classmethod
+    def from_payload(cls, payload: str) -> "RowChange":
+        """
+        Parses the JSON payload sent by the `notify_row_change` trigger.
+
+        :param payload: The notification payload, e.g. `{"table": "user", "op": "UPDATE", "id": "..."}`.
+        :return: The RowChange.
+        """
+        data = json.loads(payload)
+        return cls(table=data["table"], op=data["op"], id=UUID(data["id"]))
+
+
+class EventBroker:
+    """
+    Multiplexes the row change notifications of one LISTEN connection to any number of subscribers.
+
+    Each subscriber gets a bounded queue. A subscriber that falls behind loses its oldest changes
+    rather than slowing down the others; subscribers re-read the current state on every change,
+    so only the latest changes matter.
+
+    :param dsn: Postgres connection string of the listener, defaults to the app database.
+    :param queue_size: Maximum number of changes queued per subscriber.
+    :param reconnect_interval: Seconds to wait before reconnecting a lost listener.
+    :param listen: Listen for database notifications. Without, only `publish` sends changes.
+
+    Example usage:
+
+        broker = EventBroker()
+        async with broker.subscribe() as changes:
+            change = await changes.get()
+    """
+
+    def __init__(
+        self,
+        dsn: str | None = None,
+        *,
+        queue_size: int | None = None,
+        reconnect_interval: float = 5.0,
+        listen: bool = True,
+    ):
+        self.dsn = dsn
+        self.queue_size = queue_size or settings.EVENTS_QUEUE_SIZE
+        self.reconnect_interval = reconnect_interval
+        self.listen = listen
+        self.subscribers: set[asyncio.Queue[RowChange]] = set()
+        self._task: asyncio.Task | None = None
+        # serializes starting and stopping the listener
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue[RowChange]]:
+        """
+        Subscribes to row changes for the duration of the context.
+
+        :return: Queue receiving every change committed while subscribed.
+        """
+        queue: asyncio.Queue[RowChange] = asyncio.Queue(maxsize=self.queue_size)
+        self.subscribers.add(queue)
+        if self.listen:
+            # a subscriber arriving while the last one leaves waits for the listener to stop,
+            # then starts a new one
+            async with self._lock:
+                if self._task is None or self._task.done():
+                    self._task = asyncio.create_task(
+                        self._listen(), name="event-listener"
+                    )
+        try:
+            yield queue
+        finally:
+            self.subscribers.discard(queue)
+            async with self._lock:
+                if not self.subscribers:
+                    await self._stop_listener()
+
+    def publish(self, change: RowChange) -> None:
+        """
+        Sends a change to every subscriber of this process and bumps the data version of its table.
+
+        :param change: The row change.
+        """
+        data_versions.bump(change.table)
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(change)
+
+    def _on_notification(
+        self, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        try:
+            change = RowChange.from_payload(payload)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"invalid {channel} notification {payload!r}: {e}")
+            return
+        self.publish(change)
+
+    async def _listen(self) -> None:  # pragma: no cover
+        reconnecting = False
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(
+                    self.dsn or settings.postgres_dsn_sync
+                )
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(
+                    ROW_CHANGES_CHANNEL, self._on_notification
+                )
+                logger.info(f"listening on {ROW_CHANGES_CHANNEL}")
+                if reconnecting:
+                    # changes committed while the listener was away were not received
+                    for table in NOTIFY_TABLES:
+                        self.publish(RowChange(table=table, op=RESYNC))
+                await lost.wait()
+                logger.warning(f"lost the {ROW_CHANGES_CHANNEL} listener connection")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"{ROW_CHANGES_CHANNEL} listener error: {e}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            reconnecting = True
+            await asyncio.sleep(self.reconnect_interval)
+
+    async def stop(self) -> None:
+        """
+        Closes the listener connection.
+        """
+        async with self._lock:
+            await self._stop_listener()
+
+    async def _stop_listener(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+
+event_broker = EventBroker()
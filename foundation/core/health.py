@@ -0,0 +1,170 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from foundation.core.config import settings
+from foundation.core.db import async_sessionmaker, engine
+from foundation.core.singleflight import SingleFlight
+
+"""
+This module checks whether a worker can serve requests, for the readiness probe of the load
+balancer.
+
+A worker is ready when:
+- the database answers a ping within `READINESS_DB_TIMEOUT_SECONDS`, through the pool of the app
+  (so a worker whose pool can not hand out a connection is not ready either),
+- less than `READINESS_POOL_SATURATION` of its database pool is in use.
+
+Only what is local to the worker is checked: taking a worker out of the load balancer does not
+help with a shared problem, e.g. emails piling up in the outbox while the SMTP server is down,
+which would take out every worker at once. Those are monitored with the metrics instead, e.g.
+`email_outbox_lag_seconds`.
+
+The load balancer probes every worker every few seconds, so the result is reused for
+`READINESS_CACHE_SECONDS`, and concurrent probes share a single check.
+
+Usage:
+    readiness = await readiness_probe.check()
+    readiness.ready  # True or False
+"""
+
+
+@dataclass
+class CheckResult:
+    """
+    Result of one readiness check.
+
+    :param name: Name of the check, e.g. "database".
+    :param ok: True if the check passed.
+    :param detail: What was measured, e.g. "3/15 connections in use".
+    """
+
+    name: str
+    ok: bool
+    detail: str
+
+
+@dataclass
+class Readiness:
+    """
+    Results of the readiness checks of a worker.
+
+    :param checks: The result of each check.
+    :param checked_at: `time.monotonic()` when the checks ran.
+    """
+
+    checks: list[CheckResult] = field(default_factory=list)
+    checked_at: float = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return all(check.ok for check in self.checks)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        :return: The status of the worker and of each check, for the readiness endpoint.
+        """
+        return {
+            "status": "ready" if self.ready else "unavailable",
+            "checks": {
+                check.name: {"ok": check.ok, "detail": check.detail}
+                for check in self.checks
+            },
+        }
+
+
+def pool_usage(pool_engine: AsyncEngine) -> tuple[int, int]:
+    """
+    :param pool_engine: Engine of the pool.
+    :return: Connections in use, and the most connections the pool hands out (0 if unbounded).
+    """
+    pool = pool_engine.pool
+    in_use = pool.checkedout()  # pyright: ignore [reportAttributeAccessIssue]
+    max_overflow = getattr(pool, "_max_overflow", -1)
+    if max_overflow < 0:
+        return in_use, 0
+    return in_use, pool.size() + max_overflow  # pyright: ignore [reportAttributeAccessIssue]
+
+
+class ReadinessProbe:
+    """
+    Checks the database and the database pool of the worker.
+
+    :param pool_engine: Engine of the pool to check.
+    :param sessionmaker: Factory of the sessions pinging the database, on `pool_engine`.
+    :param cache_seconds: Seconds a result is reused, defaults to `settings.READINESS_CACHE_SECONDS`.
+
+    Example usage:
+
+        probe = ReadinessProbe()
+        readiness = await probe.check()
+        if not readiness.ready:
+            ...
+    """
+
+    def __init__(
+        self,
+        pool_engine: AsyncEngine = engine,
+        sessionmaker=async_sessionmaker,
+        cache_seconds: float | None = None,
+    ):
+        self.pool_engine = pool_engine
+        self.sessionmaker = sessionmaker
+        self.cache_seconds = cache_seconds
+        self._last: Readiness | None = None
+        self._flights = SingleFlight()
+
+    async def check(self) -> Readiness:
+        """
+        Runs the checks, or returns the result of the last run if it is recent enough.
+
+        :return: The results of the checks.
+        """
+        cache_seconds = self.cache_seconds
+        if cache_seconds is None:
+            cache_seconds = settings.READINESS_CACHE_SECONDS
+        last = self._last
+        if last is not None and time.monotonic() - last.checked_at < cache_seconds:
+            return last
+        readiness, _ = await self._flights.do("readiness", self._run, name="readiness")
+        return readiness
+
+    async def _run(self) -> Readiness:
+        # the pool is measured before the ping takes a connection from it
+        checks = [self._check_pool(), await self._check_database()]
+        readiness = Readiness(checks=checks, checked_at=time.monotonic())
+        if not readiness.ready and (self._last is None or self._last.ready):
+            failed = ", ".join(
+                f"{check.name}: {check.detail}" for check in checks if not check.ok
+            )
+            logger.warning(f"worker not ready, {failed}")
+        self._last = readiness
+        return readiness
+
+    def _check_pool(self) -> CheckResult:
+        in_use, capacity = pool_usage(self.pool_engine)
+        if capacity == 0:
+            return CheckResult("pool", True, f"{in_use} connections in use")
+        ok = in_use < capacity * settings.READINESS_POOL_SATURATION
+        return CheckResult("pool", ok, f"{in_use}/{capacity} connections in use")
+
+    async def _check_database(self) -> CheckResult:
+        timeout = settings.READINESS_DB_TIMEOUT_SECONDS
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout), self.sessionmaker() as session:
+                await session.execute(text("SELECT 1"))
+        except TimeoutError:
+            return CheckResult("database", False, f"no answer within {timeout}s")
+        except Exception as e:
+            return CheckResult("database", False, f"{type(e).__name__}: {e}")
+        ping = time.perf_counter() - start
+        return CheckResult("database", True, f"answered in {ping * 1000:.1f}ms")
+
+
+readiness_probe = ReadinessProbe()
@@ -0,0 +1,218 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from contextlib import suppress
+from dataclasses import dataclass
+
+from loguru import logger
+
+from foundation.core.config import BASE_DIR, settings
+from foundation.core.metrics import metrics, request_scope
+from foundation.core.profiling import frame_label
+
+"""
+This module watches the event loop for lag and for callbacks that block it.
+
+A probe task sleeps for `LOOP_MONITOR_INTERVAL` seconds at a time and records how late it wakes
+up as the `event_loop_lag_seconds` metric. Every wake-up is also a heartbeat for a watchdog
+thread: when the loop has not run the probe for `LOOP_MONITOR_BLOCK_THRESHOLD` seconds, a
+callback is blocking it (bcrypt, a sync SMTP or database call, a file read), and the watchdog
+captures the stack of the event loop thread while it is still blocked. Once the loop runs again,
+the blocking call is logged with its duration, the route of the request it ran for and the
+function of this app it ran in, and counted in `event_loop_blocked_total`.
+
+With `LOOP_MONITOR_STRICT` on (in tests), the blocking calls are kept and `check` raises, so a
+test that blocks the loop fails.
+
+Usage:
+    loop_monitor.start()
+    ...
+    await loop_monitor.stop()
+"""
+
+LOOP_LAG = metrics.histogram(
+    "event_loop_lag_seconds",
+    "Delay of the event loop in running a scheduled callback.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+LOOP_BLOCKED = metrics.counter(
+    "event_loop_blocked_total",
+    "Callbacks that blocked the event loop for longer than the threshold.",
+    ["route", "function"],
+)
+LOOP_BLOCKED_DURATION = metrics.histogram(
+    "event_loop_blocked_duration_seconds",
+    "Time the event loop was blocked by a callback.",
+)
+# frames of the blocking stack kept in a report
+STACK_LIMIT = 30
+
+
+class BlockingCallError(Exception):
+    """
+    Raised by `LoopMonitor.check` in strict mode if a callback blocked the event loop.
+    """
+
+
+@dataclass
+class BlockingCall:
+    """
+    A callback that blocked the event loop.
+
+    :param duration: Seconds the loop was blocked.
+    :param route: Path template of the route of the request the callback ran for, or "-".
+    :param function: Innermost function of this app on the stack, or the innermost function.
+    :param stack: The formatted stack of the event loop thread while it was blocked.
+    """
+
+    duration: float
+    route: str
+    function: str
+    stack: str
+
+    def __str__(self) -> str:
+        return (
+            f"event loop blocked for {self.duration * 1000:.0f}ms"
+            f" in {self.function} (route {self.route})\n{self.stack}"
+        )
+
+
+def app_function(frame) -> str:
+    """
+    :param frame: Innermost frame of a stack.
+    :return: Label of the innermost frame of this app on the stack, or of `frame`.
+    """
+    innermost = frame
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(str(BASE_DIR)) and "site-packages" not in filename:
+            return frame_label(frame)
+        frame = frame.f_back
+    return frame_label(innermost)
+
+
+class LoopMonitor:
+    """
+    Measures the scheduling lag of the event loop and reports the callbacks blocking it.
+
+    :param interval: Seconds between lag probes, defaults to `settings.LOOP_MONITOR_INTERVAL`.
+    :param threshold: Seconds the loop may be blocked before it is reported, defaults to
+        `settings.LOOP_MONITOR_BLOCK_THRESHOLD`.
+    :param strict: Keep the blocking calls for `check`, defaults to `settings.LOOP_MONITOR_STRICT`.
+
+    Example usage:
+
+        monitor = LoopMonitor(threshold=0.05, strict=True)
+        monitor.start()
+        await handle_request()
+        await monitor.stop()
+        monitor.check()  # raises BlockingCallError if the request blocked the loop
+    """
+
+    def __init__(
+        self,
+        interval: float | None = None,
+        threshold: float | None = None,
+        strict: bool | None = None,
+    ):
+        self.interval = interval or settings.LOOP_MONITOR_INTERVAL
+        self.threshold = threshold or settings.LOOP_MONITOR_BLOCK_THRESHOLD
+        self.strict = settings.LOOP_MONITOR_STRICT if strict is None else strict
+        self.blocking_calls: list[BlockingCall] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id = 0
+        self._heartbeat = 0.0
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._probe(), name="loop-monitor")
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """
+        Stops monitoring the loop.
+        """
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    def check(self) -> None:
+        """
+        Raises if a callback blocked the loop since the last check, in strict mode.
+
+        :raises BlockingCallError: With the reports of the blocking calls.
+        """
+        blocking_calls, self.blocking_calls = self.blocking_calls, []
+        if blocking_calls:
+            raise BlockingCallError("\n\n".join(str(call) for call in blocking_calls))
+
+    async def _probe(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self._heartbeat = time.monotonic()
+            LOOP_LAG.observe(max(0.0, loop.time() - expected))
+
+    def _watch(self) -> None:
+        # stack captured while the loop is blocked, reported once it runs again
+        blocked: tuple[float, str, str, str] | None = None
+        while not self._stopped.wait(self.threshold / 4):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            if blocked is None and stalled > self.threshold:
+                try:
+                    blocked = (heartbeat, *self._capture())
+                except Exception as e:  # pragma: no cover
+                    logger.debug(f"unable to capture the blocking stack: {e}")
+            elif blocked is not None and heartbeat != blocked[0]:
+                # the loop ran the probe again, the blocking call returned
+                duration = heartbeat - blocked[0] - self.interval
+                self._report(BlockingCall(duration, *blocked[1:]))
+                blocked = None
+        if blocked is not None:
+            # stopped by the loop before the probe ran again, so the blocking call returned
+            duration = time.monotonic() - blocked[0] - self.interval
+            self._report(BlockingCall(duration, *blocked[1:]))
+
+    def _capture(self) -> tuple[str, str, str]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        route = "-"
+        task = asyncio.current_task(self._loop)
+        if task is not None:
+            scope = task.get_context().get(request_scope)
+            if scope is not None:
+                route = getattr(scope.get("route"), "path", None) or "unmatched"
+        function = app_function(frame) if frame is not None else "-"
+        stack = "".join(traceback.format_stack(frame, limit=STACK_LIMIT))
+        return route, function, stack
+
+    def _report(self, call: BlockingCall) -> None:
+        LOOP_BLOCKED.inc(route=call.route, function=call.function)
+        LOOP_BLOCKED_DURATION.observe(call.duration)
+        logger.warning(str(call))
+        if self.strict:
+            self.blocking_calls.append(call)
+
+
+loop_monitor = LoopMonitor()
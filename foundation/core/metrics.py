@@ -0,0 +1,453 @@
+import asyncio
+import bisect
+import contextvars
+import json
+import math
+import os
+import time
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence
+
+from loguru import logger
+from starlette.types import Scope
+
+from foundation.core.config import settings
+
+"""
+This module collects application metrics and renders them in the Prometheus text format.
+
+Metrics are kept in process memory by a `MetricsRegistry`; recording a value is a dict lookup and
+an addition, so the instruments can sit on hot paths (every request, every query). The module
+defines the registry and the instrument types only, the instruments themselves are declared next
+to the code they measure:
+
+    EMAIL_SEND_DURATION = metrics.histogram(
+        "email_send_duration_seconds", "Time to send an email over SMTP.", ["result"]
+    )
+    with EMAIL_SEND_DURATION.time(result="sent"):
+        ...
+
+With several worker processes, a scrape reaches one worker only. When `METRICS_MULTIPROC_DIR` is
+set, every worker writes a snapshot of its metrics to a file in that directory every
+`METRICS_FLUSH_INTERVAL` seconds, and the worker answering the scrape merges the snapshots of all
+workers: counters and histograms are summed over every file ever written (the files of stopped
+workers are kept, so totals never go down), gauges over the files of the running workers only.
+Empty the directory before the workers start, like the multiprocess mode of the official client.
+
+"Live" gauges, e.g. the depth of the email outbox, describe shared state rather than the worker;
+they are set while answering the scrape and never written to the directory.
+"""
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# gauges of files not written for this many flush intervals belong to a worker that is gone
+STALE_FLUSH_INTERVALS = 3
+
+
+@dataclass
+class RequestStats:
+    """
+    Database work done while handling one request.
+
+    :param queries: Number of queries executed.
+    :param db_seconds: Time spent executing them.
+    """
+
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+# stats of the request being handled by the current task, set by the MetricsMiddleware
+request_stats: contextvars.ContextVar[RequestStats | None] = contextvars.ContextVar(
+    "request_stats", default=None
+)
+# ASGI scope of the request being handled by the current task, set by the MetricsMiddleware
+request_scope: contextvars.ContextVar[Scope | None] = contextvars.ContextVar(
+    "request_scope", default=None
+)
+
+
+class Metric:
+    """
+    Base class of the instruments, holding the values by label values.
+
+    :param name: Name of the metric, e.g. "http_request_duration_seconds".
+    :param documentation: Help text of the metric.
+    :param labelnames: Names of the labels of the metric.
+    """
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: dict[tuple[str, ...], Any] = {}
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects the labels {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[dict]:
+        return [{"labels": list(key), "value": v} for key, v in self.values.items()]
+
+
+class Counter(Metric):
+    """
+    A value that only goes up, e.g. the number of requests.
+
+    Example usage:
+        REQUESTS = metrics.counter("requests_total", "Requests handled.", ["method"])
+        REQUESTS.inc(method="GET")
+    """
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """
+    A value that goes up and down, e.g. the connections checked out of a pool.
+
+    :param function: Called when the metrics are collected to get the value of a gauge without
+        labels, instead of setting it.
+    :param live: The gauge describes shared state and is not merged across workers.
+
+    Example usage:
+        POOL_SIZE = metrics.gauge("db_pool_size", "Connections.", function=engine.pool.size)
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        function: Callable[[], float] | None = None,
+        live: bool = False,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+        self.live = live
+
+    def set(self, value: float, **labels: Any) -> None:
+        self.values[self._key(labels)] = value
+
+    def samples(self) -> list[dict]:
+        if self.function is not None:
+            try:
+                self.values[()] = self.function()
+            except Exception as e:  # pragma: no cover
+                logger.warning(f"unable to collect {self.name}: {e}")
+        return super().samples()
+
+
+class Histogram(Metric):
+    """
+    Counts observed values, e.g. durations, in cumulative buckets.
+
+    :param buckets: Upper bounds of the buckets, in increasing order.
+
+    Example usage:
+        DURATION = metrics.histogram("job_duration_seconds", "Duration of a job.", ["job"])
+        DURATION.observe(0.2, job="cleanup")
+        with DURATION.time(job="cleanup"):
+            ...
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        data = self.values.get(key)
+        if data is None:
+            # counts of the buckets (not cumulative, the last one is +Inf), sum
+            data = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        data[0][bisect.bisect_left(self.buckets, value)] += 1
+        data[1] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """
+        Observes the time spent in the context.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> list[dict]:
+        return [
+            {"labels": list(key), "counts": list(counts), "sum": total}
+            for key, (counts, total) in self.values.items()
+        ]
+
+
+class MetricsRegistry:
+    """
+    Holds the metrics of the process, and merges and renders them.
+
+    Example usage:
+
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests handled.")
+        requests.inc()
+        registry.render(registry.snapshot())  # "# HELP requests_total ..."
+    """
+
+    def __init__(self):
+        self.metrics: dict[str, Metric] = {}
+
+    def register[M: Metric](self, metric: M) -> M:
+        if metric.name in self.metrics:
+            raise ValueError(f"metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        **options: Any,
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, **options))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        **options: Any,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, **options))
+
+    def snapshot(self, *, live: bool = True) -> dict[str, dict]:
+        """
+        Collects the current values of all metrics.
+
+        :param live: Include the live gauges.
+        :return: JSON serializable snapshot of the metrics by name.
+        """
+        return {
+            metric.name: {
+                "type": metric.type,
+                "help": metric.documentation,
+                "labelnames": list(metric.labelnames),
+                "buckets": list(getattr(metric, "buckets", [])),
+                "samples": metric.samples(),
+            }
+            for metric in self.metrics.values()
+            if live or not getattr(metric, "live", False)
+        }
+
+    def write(self, directory: str | Path) -> Path:
+        """
+        Writes the snapshot of this process to `directory`, replacing its previous snapshot.
+
+        :param directory: The multiprocess directory.
+        :return: Path of the written file.
+        """
+        path = Path(directory, f"metrics-{os.getpid()}.json")
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot(live=False)))
+        os.replace(tmp, path)
+        return path
+
+    def collect(self, directory: str | Path | None = None) -> dict[str, dict]:
+        """
+        Collects the metrics of this process, merged with the snapshots of the other workers.
+
+        :param directory: The multiprocess directory, None for this process only.
+        :return: The merged snapshot.
+        """
+        if directory is None:
+            return self.snapshot()
+        own = self.write(directory)
+        live = {
+            name: data
+            for name, data in self.snapshot().items()
+            if getattr(self.metrics[name], "live", False)
+        }
+        stale_before = time.time() - STALE_FLUSH_INTERVALS * max(
+            settings.METRICS_FLUSH_INTERVAL, 1.0
+        )
+        snapshots = []
+        for path in sorted(Path(directory).glob("metrics-*.json")):
+            try:
+                stale = path != own and path.stat().st_mtime < stale_before
+                snapshots.append((json.loads(path.read_text()), stale))
+            except (OSError, ValueError) as e:
+                logger.warning(f"unable to read metrics file {path}: {e}")
+        return {**merge_snapshots(snapshots), **live}
+
+    def render(self, snapshot: dict[str, dict]) -> str:
+        """
+        Renders a snapshot in the Prometheus text format (version 0.0.4).
+        """
+        lines = []
+        for name, data in snapshot.items():
+            lines.append(f"# HELP {name} {_escape_help(data['help'])}")
+            lines.append(f"# TYPE {name} {data['type']}")
+            labelnames = data["labelnames"]
+            for sample in data["samples"]:
+                labels = list(zip(labelnames, sample["labels"]))
+                if data["type"] != "histogram":
+                    lines.append(_sample(name, labels, sample["value"]))
+                    continue
+                cumulative = 0
+                bounds = [*data["buckets"], math.inf]
+                for bound, count in zip(bounds, sample["counts"]):
+                    cumulative += count
+                    le = ("le", _format_value(bound))
+                    lines.append(_sample(f"{name}_bucket", [*labels, le], cumulative))
+                lines.append(_sample(f"{name}_sum", labels, sample["sum"]))
+                lines.append(_sample(f"{name}_count", labels, cumulative))
+        return "\n".join(lines) + "\n"
+
+
+def merge_snapshots(
+    snapshots: Sequence[tuple[dict[str, dict], bool]],
+) -> dict[str, dict]:
+    """
+    Merges the snapshots of several workers by summing the values with equal labels.
+
+    :param snapshots: Tuples of a snapshot and whether its worker is gone, in which case its
+        gauges are left out.
+    :return: The merged snapshot.
+    """
+    merged: dict[str, dict] = {}
+    for snapshot, stale in snapshots:
+        for name, data in snapshot.items():
+            if stale and data["type"] == "gauge":
+                continue
+            target = merged.setdefault(name, {**data, "samples": {}})
+            for sample in data["samples"]:
+                key = tuple(sample["labels"])
+                existing = target["samples"].get(key)
+                if existing is None:
+                    target["samples"][key] = {**sample}
+                    if "counts" in sample:
+                        target["samples"][key]["counts"] = list(sample["counts"])
+                elif data["type"] == "histogram":
+                    if len(existing["counts"]) != len(sample["counts"]):
+                        continue  # the buckets changed between deploys
+                    existing["counts"] = [
+                        a + b for a, b in zip(existing["counts"], sample["counts"])
+                    ]
+                    existing["sum"] += sample["sum"]
+                else:
+                    existing["value"] += sample["value"]
+    for data in merged.values():
+        data["samples"] = list(data["samples"].values())
+    return merged
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return f"{value:.1f}"
+    return repr(value)
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sample(name: str, labels: Sequence[tuple[str, str]], value: float) -> str:
+    if not labels:
+        return f"{name} {_format_value(value)}"
+    label_str = ",".join(f'{k}="{_escape_label(str(v))}"' for k, v in labels)
+    return f"{name}{{{label_str}}} {_format_value(value)}"
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsWriter:
+    """
+    Writes the snapshot of this worker to the multiprocess directory in the background.
+
+    :param registry: The registry to write.
+    :param directory: The multiprocess directory, defaults to `settings.METRICS_MULTIPROC_DIR`.
+    :param interval: Seconds between writes, defaults to `settings.METRICS_FLUSH_INTERVAL`.
+
+    Example usage:
+
+        metrics_writer.start()
+        ...
+        await metrics_writer.stop()
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        directory: str | None = None,
+        interval: float | None = None,
+    ):
+        self.registry = registry
+        self.directory = directory
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        directory = self.directory or settings.METRICS_MULTIPROC_DIR
+        if directory is None or self._task is not None:
+            return
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        self._task = asyncio.create_task(self._run(directory), name="metrics-writer")
+
+    async def _run(self, directory: str) -> None:  # pragma: no cover
+        interval = self.interval or settings.METRICS_FLUSH_INTERVAL
+        while True:
+            try:
+                self.registry.write(directory)
+            except OSError as e:
+                logger.warning(f"unable to write metrics to {directory}: {e}")
+            await asyncio.sleep(interval)
+
+    async def stop(self) -> None:
+        """
+        Stops writing, after a last write with the final counts of this worker.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        directory = self.directory or settings.METRICS_MULTIPROC_DIR
+        with suppress(OSError):
+            self.registry.write(directory)  # type: ignore[arg-type]
+
+
+metrics_writer = MetricsWriter(metrics)
@@ -0,0 +1,4 @@
+from foundation.core.outbox.models import EmailOutbox, OutboxStatusEnum
+from foundation.core.outbox.services import EmailOutboxService
+
+__all__ = ["EmailOutbox", "OutboxStatusEnum", "EmailOutboxService"]
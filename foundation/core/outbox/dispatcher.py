@@ -0,0 +1,122 @@
+import asyncio
+from contextlib import suppress
+from typing import Callable
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from foundation.core.config import settings
+from foundation.core.db import async_sessionmaker
+from foundation.core.email import send_email_async
+from foundation.core.outbox.models import EmailOutbox
+from foundation.core.outbox.services import EmailOutboxService
+from foundation.core.repository import Repository
+
+
+class EmailDispatcher:
+    """
+    Background worker that delivers emails queued in the outbox.
+
+    Each dispatch claims a batch of due emails with `FOR UPDATE SKIP LOCKED`, sends them
+    concurrently over the pooled SMTP connections and records the results in the same
+    transaction. Any number of dispatchers (one per app worker, or standalone via
+    `foundation/tools/email_dispatcher.py`) can run against the same database.
+
+    :param session_factory: Factory creating a new AsyncSession for each dispatch.
+    :param batch_size: Maximum number of emails sent per dispatch.
+    :param poll_interval: Seconds to wait before polling again when the outbox is drained.
+
+    Example usage:
+
+        dispatcher = EmailDispatcher()
+        dispatcher.start()
+        ...
+        await dispatcher.stop()
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = async_sessionmaker,
+        *,
+        batch_size: int | None = None,
+        poll_interval: float | None = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+        self.poll_interval = (
+            poll_interval
+            if poll_interval is not None
+            else settings.EMAIL_OUTBOX_POLL_INTERVAL_SECONDS
+        )
+        self._task: asyncio.Task | None = None
+
+    async def dispatch_batch(self, session: AsyncSession) -> int:
+        """
+        Claims, sends and records the result of one batch of outbox emails, then commits the session.
+
+        :param session: Session used to claim and update the outbox rows.
+        :return: Number of emails processed (sent or failed).
+        """
+        outbox = EmailOutboxService(Repository(session, EmailOutbox))
+        entries = await outbox.claim_batch(limit=self.batch_size)
+        if not entries:
+            await session.commit()
+            return 0
+
+        results = await asyncio.gather(
+            *(self._send(entry) for entry in entries), return_exceptions=True
+        )
+        for entry, result in zip(entries, results):
+            if isinstance(result, BaseException):
+                outbox.mark_failed(entry, str(result))
+            else:
+                outbox.mark_sent(entry)
+        await session.commit()
+        logger.info(f"email dispatcher processed {len(entries)} emails")
+        return len(entries)
+
+    async def _send(self, entry: EmailOutbox) -> None:
+        await send_email_async(
+            email_to=entry.email_to,
+            subject=entry.subject,
+            html_content=entry.html_content,
+        )
+
+    async def run(self) -> None:  # pragma: no cover
+        """
+        Dispatches batches until cancelled. Sleeps for `poll_interval` whenever a batch
+        comes back smaller than `batch_size`.
+        """
+        logger.info("email dispatcher started")
+        while True:
+            try:
+                async with self.session_factory() as session:
+                    processed = await self.dispatch_batch(session)
+            except Exception as e:
+                # keep the dispatcher alive through transient database errors
+                logger.error(f"email dispatcher error: {e}")
+                processed = 0
+            if processed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:  # pragma: no cover
+        """
+        Starts the dispatcher as a task on the running event loop.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(), name="email-dispatcher")
+
+    async def stop(self) -> None:  # pragma: no cover
+        """
+        Cancels the dispatcher task and waits for it to finish.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        logger.info("email dispatcher stopped")
+
+
+email_dispatcher = EmailDispatcher()
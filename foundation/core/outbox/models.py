@@ -0,0 +1,68 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from foundation.core.models import BaseWithId
+
+
+class OutboxStatusEnum(str, Enum):
+    """
+    Enum class representing the delivery status of an outbox email.
+
+    :Example:
+
+    >>> OutboxStatusEnum.values()
+    ['pending', 'sent', 'failed']
+    """
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    @classmethod
+    def values(cls) -> list[str]:
+        return [v.value for v in cls]
+
+
+class EmailOutbox(BaseWithId):
+    """
+    Represents an email waiting to be delivered, mapped to the 'email_outbox' table.
+
+    Rows are written in the same transaction as the change that triggered the email
+    and are delivered later by the `EmailDispatcher`.
+
+    Attributes:
+        id (UUID): Primary key, generated using a random UUID.
+        email_to (str): Recipient email address.
+        subject (str): Subject of the email.
+        html_content (str): Rendered HTML body of the email, cleared once it is sent or failed.
+        status (OutboxStatusEnum): Delivery status, default is PENDING.
+        attempts (int): Number of send attempts made so far.
+        next_attempt_at (datetime): The email is not sent before this time.
+        last_error (str, optional): Error reported by the last failed attempt.
+        sent_at (datetime, optional): Time the email was accepted by the SMTP server.
+
+    Example usage:
+        entry = EmailOutbox(email_to="user@example.com", subject="Hi", html_content="<p>Hi</p>")
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = {"schema": "public"}
+
+    id: Mapped[UUID] = mapped_column(
+        primary_key=True, server_default=func.gen_random_uuid()
+    )
+    email_to: Mapped[str] = mapped_column(String())
+    subject: Mapped[str] = mapped_column(String())
+    html_content: Mapped[str] = mapped_column(Text())
+    status: Mapped[OutboxStatusEnum] = mapped_column(
+        String(), nullable=False, default=OutboxStatusEnum.PENDING
+    )
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    last_error: Mapped[Optional[str]] = mapped_column(Text())
+    sent_at: Mapped[Optional[datetime]]
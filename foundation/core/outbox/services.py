@@ -0,0 +1,141 @@
+from datetime import timedelta
+from typing import Sequence
+
+from loguru import logger
+from sqlalchemy import select, func
+
+from foundation.core.config import settings
+from foundation.core.email import EmailData
+from foundation.core.outbox.models import EmailOutbox, OutboxStatusEnum
+from foundation.core.repository import Repository
+
+
+class EmailOutboxService:
+    """
+    Handles queueing emails in the outbox table and recording delivery results.
+
+    Emails are queued in the session of the caller, so they are committed (or rolled back)
+    together with the change that caused them. Delivery is done by the `EmailDispatcher`.
+
+    Example usage:
+
+        outbox = EmailOutboxService(Repository(session, EmailOutbox))
+        await outbox.enqueue(email_to="user@example.com", email_data=email_data, commit=True)
+    """
+
+    repository: Repository[EmailOutbox]
+
+    def __init__(self, repository: Repository[EmailOutbox]):
+        self.repository = repository
+
+    async def enqueue(
+        self, *, email_to: str, email_data: EmailData, commit: bool = False
+    ) -> EmailOutbox | None:
+        """
+        Adds an email to the outbox.
+
+        :param email_to: Email address of the recipient.
+        :param email_data: Rendered subject and HTML content of the email.
+        :param commit: Commit the session. When False the email is written by the caller's next commit.
+        :return: The queued EmailOutbox entry, or None if sending email is disabled.
+        """
+        if not settings.EMAIL_ENABLED:
+            logger.info(f"send email is disabled, not queueing email to {email_to}")
+            return None
+        return await self.repository.create(
+            {
+                "email_to": email_to,
+                "subject": email_data.subject,
+                "html_content": email_data.html_content,
+                "status": OutboxStatusEnum.PENDING,
+                "attempts": 0,
+            },
+            commit=commit,
+        )
+
+    async def count_pending(self) -> int:
+        """
+        Counts the emails waiting to be sent, including the ones waiting for a retry.
+
+        :return: Number of pending emails.
+        """
+        query = (
+            select(func.count())
+            .select_from(EmailOutbox)
+            .where(EmailOutbox.status == OutboxStatusEnum.PENDING)
+        )
+        return await self.repository.count(query)
+
+    async def oldest_due_age(self) -> float | None:
+        """
+        Measures how long the oldest pending email has been due, i.e. the delivery lag.
+
+        :return: Seconds since the oldest due email should have been sent, or None if none is due.
+        """
+        query = select(
+            func.extract("epoch", func.now() - func.min(EmailOutbox.next_attempt_at))
+        ).where(
+            EmailOutbox.status == OutboxStatusEnum.PENDING,
+            EmailOutbox.next_attempt_at <= func.now(),
+        )
+        age = (await self.repository.execute_query(query)).scalar()
+        return None if age is None else float(age)
+
+    async def claim_batch(self, *, limit: int) -> Sequence[EmailOutbox]:
+        """
+        Locks and returns pending emails that are due to be sent.
+
+        Rows are selected with `FOR UPDATE SKIP LOCKED`, so concurrent dispatchers never claim the
+        same email. The locks are held until the session is committed or rolled back.
+
+        :param limit: Maximum number of emails to claim.
+        :return: Sequence of claimed EmailOutbox entries, oldest due first.
+        """
+        query = (
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.status == OutboxStatusEnum.PENDING,
+                EmailOutbox.next_attempt_at <= func.now(),
+            )
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.repository.execute_query(query)
+        return result.scalars().all()
+
+    def mark_sent(self, entry: EmailOutbox) -> None:
+        """
+        Records a successful delivery. Changes are written by the next commit.
+
+        The body of the email is cleared, it may hold a password reset token.
+
+        :param entry: The EmailOutbox entry that was sent.
+        """
+        entry.status = OutboxStatusEnum.SENT
+        entry.html_content = ""
+        entry.attempts += 1
+        entry.last_error = None
+        entry.sent_at = func.now()  # pyright: ignore [reportAttributeAccessIssue]
+
+    def mark_failed(self, entry: EmailOutbox, error: str) -> None:
+        """
+        Records a failed delivery attempt. The email is retried with exponential backoff
+        until EMAIL_OUTBOX_MAX_ATTEMPTS is reached, then it is marked as failed and its body is
+        cleared, like the body of a sent email.
+
+        :param entry: The EmailOutbox entry that could not be sent.
+        :param error: Description of the error.
+        """
+        entry.attempts += 1
+        entry.last_error = error
+        if entry.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            entry.status = OutboxStatusEnum.FAILED
+            entry.html_content = ""
+            logger.error(f"giving up on email {entry.id} to {entry.email_to}: {error}")
+            return
+        backoff = settings.EMAIL_OUTBOX_RETRY_BACKOFF_SECONDS * 2 ** (
+            entry.attempts - 1
+        )
+        entry.next_attempt_at = func.now() + timedelta(seconds=backoff)  # pyright: ignore [reportAttributeAccessIssue]
+        logger.info(f"email {entry.id} to {entry.email_to} failed, retry in {backoff}s")
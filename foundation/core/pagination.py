@@ -1,7 +1,13 @@
+import asyncio
+import base64
+import binascii
+import json
 from dataclasses import dataclass
-from typing import Type, Any, Tuple, Sequence
+from datetime import datetime
+from typing import Any, Tuple, Sequence
+from uuid import UUID
 
-from sqlalchemy import select, func, Select
+from sqlalchemy import select, func, Select, tuple_
 from starlette.datastructures import URL
 from fastapi import Request
 
@@ -45,7 +51,7 @@ class Page:
     def __init__(
         self,
         url: URL,
-        items: Sequence[Type[Any]],
+        items: Sequence[Any],
         page: int,
         page_size: int,
         total: int,
@@ -112,6 +118,14 @@ class Paginator:
     :type ascending: bool, optional
     :param page_size: Number of items per page, defaults to 10
     :type page_size: int, optional
+    :param url: URL the page links are built from, defaults to the request URL
+    :type url: URL or None, optional
+    :param count_repository: Repository on a second session; when given, the total and the
+        items of the first page are queried concurrently instead of one after the other
+    :type count_repository: Repository or None, optional
+    :param columns: Names of the columns to select; when given, the items are rows with only
+        these attributes instead of entities
+    :type columns: Sequence[str] or None, optional
 
     Example usage:
 
@@ -136,38 +150,193 @@ class Paginator:
         order_by: str | None = None,
         ascending: bool = True,
         page_size: int = 10,
+        url: URL | None = None,
+        count_repository: Repository | None = None,
+        columns: Sequence[str] | None = None,
     ):
         self.request = request
         self.repository = repository
+        self.columns = columns
+        if columns:
+            query = query.with_only_columns(*repository.columns(columns))
         self.query = query
         self.page_size = page_size
         self.order_by = order_by
         self.ascending = ascending
+        self.url = url or request.url
+        self.count_repository = count_repository
         self._total = None
 
     @property
     async def total(self) -> int:
         if self._total is None:
             count_query = select(func.count()).select_from(self.query)  # pyright: ignore [reportArgumentType]
-            self._total = await self.repository.count(count_query)
+            repository = self.count_repository or self.repository
+            self._total = await repository.count(count_query)
         return self._total
 
-    async def page(self, page: int = 1) -> Page:
+    async def _items(self, page: int) -> Sequence[Any]:
         if page < 1 or self.page_size < 1:
-            items = []
+            return []
+        offset = (page - 1) * self.page_size
+        result = await self.repository.execute_query(
+            self.query.offset(offset).limit(self.page_size)
+        )
+        if self.columns:
+            return result.all()
+        return result.scalars().all()
+
+    async def page(self, page: int = 1) -> Page:
+        if self.count_repository is not None and self._total is None:
+            # a session runs one query at a time, the total is counted on the second session
+            items, total = await asyncio.gather(self._items(page), self.total)
         else:
-            offset = (page - 1) * self.page_size
-            result = await self.repository.execute_query(
-                self.query.offset(offset).limit(self.page_size)
-            )
-            items = result.scalars().all()
+            items, total = await self._items(page), await self.total
 
         return Page(
-            url=self.request.url,
+            url=self.url,
             items=items,
             page=page,
             page_size=self.page_size,
-            total=await self.total,
+            total=total,
             order_by=self.order_by,
             ascending=self.ascending,
         )
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encodes the sort key of a row as an opaque cursor.
+
+    :param values: Values of the sort key, datetimes and UUIDs are encoded as strings.
+    :return: URL safe cursor.
+
+    Example usage:
+        cursor = encode_cursor(user.created_at, user.id)
+    """
+    data = json.dumps(
+        [
+            value.isoformat() if isinstance(value, datetime) else str(value)
+            for value in values
+        ],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple[Any, ...]:
+    """
+    Decodes a cursor created by `encode_cursor`.
+
+    :param cursor: The cursor.
+    :param types: Types of the values of the sort key, e.g. `datetime, UUID`.
+    :return: The values of the sort key.
+    :raises ValueError: If the cursor is malformed.
+
+    Example usage:
+        created_at, user_id = decode_cursor(cursor, datetime, UUID)
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"invalid cursor {cursor!r}") from e
+    if not isinstance(values, list) or len(values) != len(types):
+        raise ValueError(f"invalid cursor {cursor!r}")
+    parsed = []
+    try:
+        for value, type_ in zip(values, types):
+            if type_ is datetime:
+                parsed.append(datetime.fromisoformat(value))
+            elif type_ is UUID:
+                parsed.append(UUID(value))
+            else:
+                parsed.append(type_(value))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"invalid cursor {cursor!r}") from e
+    return tuple(parsed)
+
+
+@dataclass
+class CursorPage:
+    """
+    A page of items fetched after a cursor.
+
+    :param items: Items of the page.
+    :param next_cursor: Cursor of the next page, None if this is the last page.
+    :param has_more: True if there are items after this page.
+    """
+
+    items: Sequence[Any]
+    next_cursor: str | None
+    has_more: bool
+
+
+class CursorPaginator:
+    """
+    Keyset paginator walking a query in `(order_by, primary key)` order.
+
+    Each page selects the rows after the sort key of the last row of the previous page, so every
+    page is a single index range scan however deep into the table it is, and rows inserted or
+    deleted between two pages neither shift the following pages nor make them repeat or skip
+    rows. Instead of counting all rows, one extra row is fetched to tell whether there are more.
+
+    :param repository: The repository to execute queries
+    :param query: The SQL Alchemy Select query to paginate, its ordering is replaced
+    :param order_by: Name of the column to order by, ties are broken by the primary key
+    :param limit: Number of items per page
+    :param columns: Names of the columns to select; when given, the items are rows with these
+        attributes (plus the sort key) instead of entities
+
+    Example usage:
+
+        paginator = CursorPaginator(repository, select(User), order_by="created_at", limit=100)
+        page = await paginator.page()
+        next_page = await paginator.page(page.next_cursor)
+    """
+
+    def __init__(
+        self,
+        repository: Repository,
+        query: Select[Tuple[Any]],
+        order_by: str,
+        limit: int = 100,
+        columns: Sequence[str] | None = None,
+    ):
+        self.repository = repository
+        self.limit = limit
+        self.order_by = order_by
+        (self.order_column,) = repository.columns([order_by])
+        self.primary_key = repository.primary_key
+        if columns:
+            keys = [order_by, self.primary_key.key]
+            names = [*columns, *(key for key in keys if key not in columns)]
+            query = query.with_only_columns(*repository.columns(names))
+        self.columns = columns
+        self.query = query.order_by(None).order_by(self.order_column, self.primary_key)
+
+    def _key(self, item: Any) -> tuple[Any, Any]:
+        return getattr(item, self.order_by), getattr(item, self.primary_key.key)
+
+    async def page(self, cursor: str | None = None) -> CursorPage:
+        """
+        Fetches the page after a cursor.
+
+        :param cursor: `next_cursor` of the previous page, None for the first page.
+        :return: The page.
+        :raises ValueError: If the cursor is malformed.
+        """
+        query = self.query
+        if cursor is not None:
+            key = decode_cursor(
+                cursor,
+                self.order_column.type.python_type,
+                self.primary_key.type.python_type,
+            )
+            query = query.where(tuple_(self.order_column, self.primary_key) > key)
+        result = await self.repository.execute_query(query.limit(self.limit + 1))
+        items = result.all() if self.columns else result.scalars().all()
+        has_more = len(items) > self.limit
+        items = items[: self.limit]
+        next_cursor = encode_cursor(*self._key(items[-1])) if has_more else None
+        return CursorPage(items=items, next_cursor=next_cursor, has_more=has_more)
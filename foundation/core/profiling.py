@@ -0,0 +1,419 @@
+import asyncio
+import json
+import os
+import re
+import sys
+import threading
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from loguru import logger
+
+from foundation.core.config import BASE_DIR, settings
+
+try:
+    import greenlet
+except ImportError:  # pragma: no cover
+    greenlet = None
+
+"""
+This module profiles single requests with a sampling profiler that follows the async stack.
+
+While a request is profiled, a background thread samples the stack of its task every
+`PROFILING_INTERVAL` seconds, so a profile shows wall-clock time:
+
+- while the task runs, the sample is the stack of the event loop thread from the request
+  coroutine down, including the synchronous SQLAlchemy code running in a greenlet on behalf of
+  the `Repository`;
+- while the task waits (for the database, SMTP, another task), the sample is the chain of awaiting
+  coroutines, e.g. route -> UserService -> Repository -> AsyncSession, ending in an `[await]` frame.
+
+Time spent by other tasks of the event loop does not show up. Profiles are kept in a `ProfileStore`,
+a ring buffer of JSON files on disk, see `foundation.middleware.profiling`.
+
+Usage:
+    profiler = SamplingProfiler(asyncio.current_task())
+    profiler.start()
+    ...
+    samples = profiler.stop()
+"""
+
+# leaf of the samples taken while the task was waiting
+AWAIT_FRAME = "[await]"
+# name of the profile files, the start time in milliseconds sorts them oldest first
+PROFILE_FILE = re.compile(r"^(\d+)-([0-9a-f]{32})\.json$")
+SITE_PACKAGES = f"{os.sep}site-packages{os.sep}"
+
+
+def frame_label(frame: FrameType) -> str:
+    """
+    :param frame: A stack frame.
+    :return: Name of the function of the frame and where it is defined, e.g.
+        "UserService.get_user_by_id (foundation/core/users/services.py:120)".
+    """
+    code = frame.f_code
+    filename = code.co_filename
+    if SITE_PACKAGES in filename:
+        filename = filename.split(SITE_PACKAGES, 1)[1]
+    elif filename.startswith(str(BASE_DIR)):
+        filename = os.path.relpath(filename, BASE_DIR)
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of an asyncio task from a background thread.
+
+    Must be started from the thread running the event loop of the task.
+
+    :param task: The task to profile, e.g. the task handling a request.
+    :param interval: Seconds between samples, defaults to `settings.PROFILING_INTERVAL`.
+
+    Example usage:
+
+        profiler = SamplingProfiler(asyncio.current_task())
+        profiler.start()
+        await handle_request()
+        samples = profiler.stop()  # Counter of stacks, root first
+    """
+
+    def __init__(self, task: asyncio.Task, interval: float | None = None):
+        self.task = task
+        self.interval = interval or settings.PROFILING_INTERVAL
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self._loop = task.get_loop()
+        self._root = task.get_coro().cr_frame  # type: ignore[union-attr]
+        self._thread_id = 0
+        # the event loop greenlet, suspended while SQLAlchemy runs sync code in a child greenlet
+        self._greenlet = None
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread_id = threading.get_ident()
+        self._greenlet = greenlet.getcurrent() if greenlet is not None else None
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> Counter[tuple[str, ...]]:
+        """
+        Stops sampling.
+
+        :return: Number of samples by stack, each stack a tuple of frame labels from the root.
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                stack = self._sample()
+            except Exception as e:  # pragma: no cover
+                # the loop thread changes the stacks while they are read
+                logger.debug(f"profiler sample failed: {e}")
+                continue
+            if stack:
+                self.samples[stack] += 1
+
+    def _sample(self) -> tuple[str, ...] | None:
+        if self.task.done():
+            return None
+        if asyncio.current_task(self._loop) is self.task:
+            frames, leaf = self._running_frames(), ()
+        else:
+            frames, leaf = self._awaiting_frames(), (AWAIT_FRAME,)
+        if not frames:
+            return None
+        return tuple(frame_label(frame) for frame in frames) + leaf
+
+    def _running_frames(self) -> list[FrameType]:
+        frames: list[FrameType] = []
+        frame = sys._current_frames().get(self._thread_id)
+        while frame is not None:
+            frames.append(frame)
+            if frame is self._root:
+                break
+            frame = frame.f_back
+            if frame is None and self._greenlet is not None:
+                # continue in the event loop greenlet, past the greenlet the sample was taken in
+                suspended = self._greenlet.gr_frame
+                if suspended is not None and suspended not in frames:
+                    frame = suspended
+        frames.reverse()
+        return frames
+
+    def _awaiting_frames(self) -> list[FrameType]:
+        frames: list[FrameType] = []
+        awaitable: Any = self.task.get_coro()
+        while awaitable is not None:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(
+                awaitable, "gi_frame", None
+            )
+            if frame is None:
+                break
+            frames.append(frame)
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(
+                awaitable, "gi_yieldfrom", None
+            )
+        return frames
+
+
+@dataclass
+class FunctionStats:
+    """
+    Samples of one function in a profile.
+
+    :param name: Label of the function, see `frame_label`.
+    :param own: Samples with the function at the top of the stack.
+    :param total: Samples with the function anywhere on the stack.
+    """
+
+    name: str
+    own: int
+    total: int
+
+
+@dataclass
+class CallNode:
+    """
+    A function in the call tree of a profile.
+
+    :param name: Label of the function, see `frame_label`.
+    :param samples: Samples with the function at this position of the stack.
+    :param children: Functions called from here, most samples first.
+    """
+
+    name: str
+    samples: int = 0
+    children: list["CallNode"] = field(default_factory=list)
+
+
+@dataclass
+class Profile:
+    """
+    The samples of one profiled request.
+
+    :param id: Id of the profile, 32 hex digits.
+    :param method: HTTP method of the request.
+    :param path: Path of the request.
+    :param started_at: Unix time the request started.
+    :param duration: Seconds the request took.
+    :param interval: Seconds between samples.
+    :param status: Status code of the response, None if the request failed.
+    :param samples: Number of samples by stack, each stack a tuple of frame labels from the root.
+
+    Example usage:
+
+        profile = Profile.from_dict(json.loads(text))
+        for function in profile.top_functions(limit=10):
+            print(function.name, function.own, function.total)
+    """
+
+    id: str
+    method: str
+    path: str
+    started_at: float
+    duration: float
+    interval: float
+    status: int | None = None
+    samples: dict[tuple[str, ...], int] = field(default_factory=dict)
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.samples.values())
+
+    def top_functions(self, limit: int = 30) -> list[FunctionStats]:
+        """
+        :param limit: Maximum number of functions.
+        :return: The functions with the most samples at the top of the stack.
+        """
+        own: Counter[str] = Counter()
+        total: Counter[str] = Counter()
+        for stack, count in self.samples.items():
+            own[stack[-1]] += count
+            # a recursive function counts once per sample
+            for name in set(stack):
+                total[name] += count
+        return [
+            FunctionStats(name=name, own=count, total=total[name])
+            for name, count in own.most_common(limit)
+        ]
+
+    def call_tree(self) -> CallNode:
+        """
+        :return: Root of the tree of the sampled stacks, named after the request.
+        """
+        root = CallNode(name=f"{self.method} {self.path}")
+        for stack, count in self.samples.items():
+            root.samples += count
+            node = root
+            for name in stack:
+                child = next((c for c in node.children if c.name == name), None)
+                if child is None:
+                    child = CallNode(name=name)
+                    node.children.append(child)
+                child.samples += count
+                node = child
+        _sort_children(root)
+        return root
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at,
+            "duration": self.duration,
+            "interval": self.interval,
+            "status": self.status,
+            "samples": [[list(stack), count] for stack, count in self.samples.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Profile":
+        return cls(
+            **{**data, "samples": {tuple(stack): n for stack, n in data["samples"]}}
+        )
+
+
+@dataclass
+class FlameBox:
+    """
+    A function in a flame graph, positioned as a share of all samples.
+
+    :param name: Label of the function, see `frame_label`.
+    :param depth: Depth in the call tree, 0 for the request.
+    :param start: Share of the samples left of the box.
+    :param width: Share of the samples with the function at this position of the stack.
+    """
+
+    name: str
+    depth: int
+    start: float
+    width: float
+
+
+def flame_graph(root: CallNode, min_share: float = 0.005) -> list[FlameBox]:
+    """
+    Lays out a call tree as a flame graph, callers above their callees.
+
+    :param root: The call tree, see `Profile.call_tree`.
+    :param min_share: Leave out the functions with a smaller share of the samples.
+    :return: The boxes, parents before their children.
+
+    Example usage:
+        boxes = flame_graph(profile.call_tree())
+    """
+    if not root.samples:
+        return []
+    boxes = []
+    pending = [(root, 0, 0.0)]
+    while pending:
+        node, depth, start = pending.pop()
+        width = node.samples / root.samples
+        if width < min_share:
+            continue
+        boxes.append(FlameBox(name=node.name, depth=depth, start=start, width=width))
+        offset = start
+        for child in node.children:
+            pending.append((child, depth + 1, offset))
+            offset += child.samples / root.samples
+    return boxes
+
+
+def _sort_children(node: CallNode) -> None:
+    node.children.sort(key=lambda child: child.samples, reverse=True)
+    for child in node.children:
+        _sort_children(child)
+
+
+def new_profile_id() -> str:
+    return uuid.uuid4().hex
+
+
+class ProfileStore:
+    """
+    Keeps the latest profiles as JSON files in a directory, dropping the oldest beyond a maximum.
+
+    :param directory: Directory of the profiles, defaults to `settings.PROFILING_DIR`.
+    :param max_profiles: Number of profiles kept, defaults to `settings.PROFILING_MAX_PROFILES`.
+
+    Example usage:
+
+        store = ProfileStore()
+        store.save(profile)
+        store.get(profile.id)
+        store.recent()  # newest first
+    """
+
+    def __init__(self, directory: str | Path | None = None, max_profiles: int = 0):
+        self._directory = directory
+        self.max_profiles = max_profiles or settings.PROFILING_MAX_PROFILES
+
+    @property
+    def directory(self) -> Path:
+        return Path(self._directory or settings.PROFILING_DIR)
+
+    def save(self, profile: Profile) -> Path:
+        """
+        Writes a profile, and removes the oldest profiles beyond `max_profiles`.
+
+        :param profile: The profile.
+        :return: Path of the profile file.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{int(profile.started_at * 1000)}-{profile.id}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(profile.to_dict()))
+        os.replace(tmp, path)
+        for old in self._paths()[: -self.max_profiles]:
+            old.unlink(missing_ok=True)
+        return path
+
+    def recent(self) -> list[Profile]:
+        """
+        :return: The kept profiles, newest first.
+        """
+        profiles = []
+        for path in reversed(self._paths()):
+            profile = self._read(path)
+            if profile is not None:
+                profiles.append(profile)
+        return profiles
+
+    def get(self, profile_id: str) -> Profile | None:
+        """
+        :param profile_id: Id of the profile.
+        :return: The profile, or None if it is not kept (anymore).
+        """
+        for path in self._paths():
+            if path.name.endswith(f"-{profile_id}.json"):
+                return self._read(path)
+        return None
+
+    def _paths(self) -> list[Path]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(
+            (p for p in self.directory.iterdir() if PROFILE_FILE.match(p.name)),
+            key=lambda p: int(PROFILE_FILE.match(p.name).group(1)),  # type: ignore[union-attr]
+        )
+
+    def _read(self, path: Path) -> Profile | None:
+        try:
+            return Profile.from_dict(json.loads(path.read_text()))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # removed by another worker or partially written
+            logger.warning(f"unable to read profile {path}: {e}")
+            return None
+
+
+profile_store = ProfileStore()
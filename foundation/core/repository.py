@@ -1,12 +1,28 @@
-from typing import Type, Optional, Any, Sequence
+from typing import Type, Optional, Any, Sequence, Collection
 from uuid import UUID
 
-from sqlalchemy import select, func, Select, Executable, inspect, Result, Column
+from sqlalchemy import (
+    select,
+    update,
+    delete,
+    func,
+    Select,
+    Executable,
+    inspect,
+    Result,
+    Column,
+    Row,
+)
 from sqlalchemy.exc import NoResultFound
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Mapped
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncResult
+from sqlalchemy.orm import Mapped, InstrumentedAttribute
 
 from foundation.core.models import BaseWithId
+from foundation.core.tracing import traced
+
+
+def _span_attributes(repository: "Repository", *args, **kwargs) -> dict[str, Any]:
+    return {"db.table": repository.Model.__tablename__}
 
 
 class Repository[T: BaseWithId]:
@@ -30,19 +46,52 @@ class Repository[T: BaseWithId]:
         self.primary_key: Column[Any] = inspect(self.Model).mapper.primary_key[0]
         self.valid_columns = [column.key for column in inspect(self.Model).columns]
 
-    async def find_all(self, skip: int = 0, limit: int = 100) -> Sequence[T]:
+    def columns(self, names: Sequence[str]) -> list[InstrumentedAttribute]:
+        """
+        Resolves column names to the mapped columns of the model, for projecting queries.
+
+        :param names: Names of the columns.
+        :return: The mapped columns, in the order of `names`.
+        :raises ValueError: If a name is not a column of the model.
+
+        Example usage:
+            query = select(*repository.columns(["id", "email"]))
+        """
+        unknown = [name for name in names if name not in self.valid_columns]
+        if unknown:
+            raise ValueError(f"unknown columns: {', '.join(unknown)}")
+        return [getattr(self.Model, name) for name in names]
+
+    @traced(attributes=_span_attributes)
+    async def find_all(
+        self, skip: int = 0, limit: int = 100, columns: Sequence[str] | None = None
+    ) -> Sequence[T] | Sequence[Row[Any]]:
         """
         Fetches records from the database with pagination.
 
         :param skip: Number of records to skip.
         :param limit: Maximum number of records to fetch.
+        :param columns: Names of the columns to select. When given, only these columns are
+            loaded and the records are returned as rows with these attributes, not as entities
+            tracked by the session.
         :return: List containing the fetched records.
+        :raises ValueError: If a column is not a column of the model.
+
+        Example usage:
+            rows = await repository.find_all(limit=1000, columns=["id", "email"])
+            emails = [row.email for row in rows]
         """
+        if columns:
+            result = await self.session.execute(
+                select(*self.columns(columns)).offset(skip).limit(limit)
+            )
+            return result.all()
         result = await self.session.execute(
             select(self.Model).offset(skip).limit(limit)
         )
         return result.scalars().all()
 
+    @traced(attributes=_span_attributes)
     async def find_by_id(self, entity_id: UUID) -> Optional[T]:
         """
         Fetches an entity by its unique identifier asynchronously.
@@ -64,11 +113,13 @@ class Repository[T: BaseWithId]:
         except NoResultFound:
             return None
 
-    async def create(self, entity_data: dict) -> T:
+    @traced(attributes=_span_attributes)
+    async def create(self, entity_data: dict, *, commit: bool = True) -> T:
         """
         Creates a new entity in the database from the provided data dictionary.
 
         :param entity_data: A dictionary containing data to be inserted into the database. Only keys present in `self.valid_columns` will be used.
+        :param commit: When False the entity is only added to the session, so it is written by the next commit on the same session.
         :return: The created entity object of type `T`.
 
         Example:
@@ -84,10 +135,13 @@ class Repository[T: BaseWithId]:
         model_data = {k: v for k, v in entity_data.items() if k in self.valid_columns}
         entity = self.Model(**model_data)
         self.session.add(entity)
+        if not commit:
+            return entity
         await self.session.commit()
         await self.session.refresh(entity)
         return entity
 
+    @traced(attributes=_span_attributes)
     async def update(self, entity_id: UUID, entity_data: dict) -> Optional[T]:
         """
         Updates an entity with given entity_id using the provided entity_data.
@@ -116,6 +170,65 @@ class Repository[T: BaseWithId]:
         except NoResultFound:
             return None
 
+    @traced(attributes=_span_attributes)
+    async def update_many(
+        self, entities_data: Sequence[dict], *, commit: bool = True
+    ) -> None:
+        """
+        Updates many entities by primary key with a single executemany UPDATE.
+
+        Rows of entities that do not exist are not updated, and entities already loaded in the
+        session are not refreshed.
+
+        :param entities_data: Dictionaries with the primary key and the columns to update of each
+            entity. Only keys present in `self.valid_columns` are used.
+        :param commit: When False the update is only executed, so it is committed by the next
+            commit on the same session.
+
+        Example:
+            await repository.update_many([{"id": id_1, "name": "A"}, {"id": id_2, "name": "B"}])
+
+        Errors/Exceptions:
+            Raises potential `IntegrityError` if the new values violate a constraint.
+        """
+        rows = [
+            {k: v for k, v in data.items() if k in self.valid_columns}
+            for data in entities_data
+        ]
+        if rows:
+            await self.session.execute(update(self.Model), rows)
+        if commit:
+            await self.session.commit()
+
+    @traced(attributes=_span_attributes)
+    async def delete_many(
+        self, entity_ids: Collection[UUID], *, commit: bool = True
+    ) -> set[UUID]:
+        """
+        Deletes many entities with a single DELETE statement.
+
+        :param entity_ids: UUIDs of the entities to delete
+        :param commit: When False the delete is only executed, so it is committed by the next
+            commit on the same session.
+        :return: UUIDs of the entities that existed and were deleted
+
+        Example:
+            deleted = await repository.delete_many([id_1, id_2])
+            missing = {id_1, id_2} - deleted
+        """
+        if not entity_ids:
+            return set()
+        result = await self.session.execute(
+            delete(self.Model)
+            .where(self.primary_key.in_(entity_ids))
+            .returning(self.primary_key)
+        )
+        deleted = set(result.scalars().all())
+        if commit:
+            await self.session.commit()
+        return deleted
+
+    @traced(attributes=_span_attributes)
     async def delete(self, entity_id: UUID) -> bool:
         """
         Deletes an entity from the database.
@@ -139,6 +252,7 @@ class Repository[T: BaseWithId]:
         except NoResultFound:
             return False
 
+    @traced(attributes=_span_attributes)
     async def count(self, query: Executable | None = None) -> int:
         """
         Counts entities in the database table represented by `self.Model`.
@@ -166,6 +280,7 @@ class Repository[T: BaseWithId]:
         scalar = result.scalar()
         return scalar if scalar is not None else 0
 
+    @traced(attributes=_span_attributes)
     async def execute_query(self, query: Executable) -> Result[Any]:
         """
         Executes the given query asynchronously using the session.
@@ -176,6 +291,31 @@ class Repository[T: BaseWithId]:
         result = await self.session.execute(query)
         return result
 
+    @traced(attributes=_span_attributes)
+    async def stream_query(
+        self, query: Executable, *, yield_per: int = 100
+    ) -> AsyncResult[Any]:
+        """
+        Executes the given query with a server-side cursor, fetching rows in batches of `yield_per`.
+
+        Only one batch is held in memory at a time, so this can iterate over large tables. The
+        cursor lives in the current transaction, so the session must not be committed while the
+        result is being iterated.
+
+        :param query: An executable query instance.
+        :param yield_per: Number of rows fetched from the cursor at a time.
+        :return: An async result to iterate over.
+
+        Example usage:
+            result = await repository.stream_query(select(User.id, User.email))
+            async for row in result:
+                ...
+        """
+        return await self.session.stream(
+            query.execution_options(yield_per=yield_per)  # pyright: ignore [reportAttributeAccessIssue]
+        )
+
+    @traced(attributes=_span_attributes)
     async def find_one(self, query: Select[tuple[T]]) -> Optional[T]:
         """
         Executes a query and retrieves a single record.
@@ -1,17 +1,27 @@
+import asyncio
 from datetime import timedelta
 from typing import TypedDict
 
 from authlib.jose.errors import BadSignatureError
-from fastapi_jwt import JwtAccessBearer, JwtRefreshBearer
+from fastapi_jwt import JwtAccessBearer, JwtAccessCookie, JwtRefreshBearer
 from fastapi_jwt.jwt import JwtAccess
 from fastapi_jwt.jwt_backends.abstract_backend import BackendException
 from jwt import InvalidTokenError
 from passlib.context import CryptContext
 
 from foundation.core.config import settings
+from foundation.core.metrics import metrics
+from foundation.core.timing import timing_span
+from foundation.core.tracing import trace_span
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+PASSWORD_HASH_DURATION = metrics.histogram(
+    "password_hash_duration_seconds",
+    "Time to hash or verify a password.",
+    ["operation"],
+)
+
 ALGORITHM = "HS256"
 
 
@@ -31,7 +41,8 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
             print("Password is incorrect.")
 
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    with PASSWORD_HASH_DURATION.time(operation="verify"), timing_span("hash"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
@@ -44,12 +55,72 @@ def get_password_hash(password: str) -> str:
     Example usage:
         hashed_password = get_password_hash("my_password")
     """
-    return pwd_context.hash(password)
+    with PASSWORD_HASH_DURATION.time(operation="hash"), timing_span("hash"):
+        return pwd_context.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifies a password like `verify_password`, in a worker thread: bcrypt takes a few hundred
+    milliseconds, which would block the event loop.
+
+    :param plain_password: The plain text password to verify.
+    :param hashed_password: The hashed password to compare against.
+    :return: True if the passwords match, otherwise False.
+
+    Usage example:
+
+        if await verify_password_async("user-input-password", stored_hashed_password):
+            print("Password is correct.")
+    """
+    return await asyncio.to_thread(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hashes a password like `get_password_hash`, in a worker thread so that the event loop keeps
+    running.
+
+    :param password: Plain text password to be hashed
+    :return: Hashed password
+
+    Example usage:
+        hashed_password = await get_password_hash_async("my_password")
+    """
+    return await asyncio.to_thread(get_password_hash, password)
+
+
+class TimedJwtAccessBearer(JwtAccessBearer):
+    """
+    Reads the access token from the bearer header, recording the validation as the `jwt` span of
+    the `Server-Timing` header.
+
+    Example usage:
+        access_token_security = TimedJwtAccessBearer(secret_key=settings.JWT_SECRET)
+    """
+
+    async def _get_credentials(self, bearer, cookie):
+        with timing_span("jwt"), trace_span("auth.jwt"):
+            return await super()._get_credentials(bearer, cookie)
+
+
+class TimedJwtAccessCookie(JwtAccessCookie):
+    """
+    Reads the access token from the access token cookie, recording the validation as the `jwt`
+    span of the `Server-Timing` header.
+
+    Example usage:
+        access_token_security = TimedJwtAccessCookie(secret_key=settings.JWT_SECRET)
+    """
+
+    async def _get_credentials(self, bearer, cookie):
+        with timing_span("jwt"), trace_span("auth.jwt"):
+            return await super()._get_credentials(bearer, cookie)
 
 
 ## security
 # Read access token from bearer header and cookie (bearer priority)
-access_token_security = JwtAccessBearer(
+access_token_security = TimedJwtAccessBearer(
     secret_key=settings.JWT_SECRET,
     auto_error=True,  # automatically raise HTTPException: HTTP_401_UNAUTHORIZED
 )
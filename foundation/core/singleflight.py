@@ -0,0 +1,174 @@
+import asyncio
+import functools
+from collections import Counter
+from typing import Any, Awaitable, Callable, Hashable
+
+from loguru import logger
+
+from foundation.core.config import settings
+from foundation.core.metrics import metrics
+
+"""
+This module coalesces identical concurrent reads into a single call (single-flight).
+
+When a burst of identical requests arrives (many dashboards loading at once, a retry storm on a
+user detail), every request would run the same query. With single-flight, the first caller for a
+key runs the call and every caller that arrives while it is in flight awaits that call and gets its
+result (or its exception) instead of running its own. Nothing is cached: once the call finishes,
+the next caller runs a new one.
+
+The call runs in the task of the first caller, on its database session. If that caller is
+cancelled (e.g. the client disconnected), the call is cancelled with it and one of the waiting
+callers runs the call again on its own session. A waiting caller that is cancelled just stops
+waiting.
+
+Coalescing is opt-in per method with the `coalesce` decorator.
+
+Usage:
+    class UserService:
+        @coalesce()
+        async def get_user_counts(self) -> dict[str, int]:
+            ...
+"""
+
+SINGLEFLIGHT_CALLS = metrics.counter(
+    "singleflight_calls_total", "Coalescable calls that ran a query.", ["name"]
+)
+SINGLEFLIGHT_COALESCED = metrics.counter(
+    "singleflight_coalesced_total",
+    "Calls that shared the result of a query run by a concurrent call.",
+    ["name"],
+)
+
+
+class _LeaderCancelled(Exception):
+    """
+    Result of a call whose caller was cancelled before it finished.
+    """
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time, concurrent callers of the same key share its result.
+
+    Example usage:
+
+        flights = SingleFlight()
+        counts, shared = await flights.do(("counts",), fetch_counts, name="counts")
+    """
+
+    def __init__(self):
+        self._flights: dict[Hashable, asyncio.Future] = {}
+        # calls run, and callers that shared the result of a call run by another caller, by name
+        self.calls: Counter[str] = Counter()
+        self.coalesced: Counter[str] = Counter()
+
+    async def do[T](
+        self, key: Hashable, fn: Callable[[], Awaitable[T]], *, name: str = ""
+    ) -> tuple[T, bool]:
+        """
+        Runs `fn`, or waits for the call of `fn` already in flight for `key`.
+
+        :param key: Key of the call, callers with equal keys share a call.
+        :param fn: Coroutine function making the call.
+        :param name: Name the call is counted under in `calls` and `coalesced`.
+        :return: The result of the call, and True if it was run by another caller.
+        :raises: The exception raised by the call.
+        """
+        while (future := self._flights.get(key)) is not None:
+            try:
+                result = await asyncio.shield(future)
+            except _LeaderCancelled:
+                # the caller running the call went away, run it again
+                continue
+            self.coalesced[name] += 1
+            SINGLEFLIGHT_COALESCED.inc(name=name)
+            return result, True
+
+        future = asyncio.get_running_loop().create_future()
+        # the exception is retrieved here if no caller waits for it
+        future.add_done_callback(lambda f: f.exception())
+        self._flights[key] = future
+        self.calls[name] += 1
+        SINGLEFLIGHT_CALLS.inc(name=name)
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._flights[key]
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        :return: The number of calls run and of callers that shared a call, by name.
+        """
+        return {
+            name: {"calls": self.calls[name], "coalesced": self.coalesced[name]}
+            for name in sorted(self.calls.keys() | self.coalesced.keys())
+        }
+
+
+singleflight = SingleFlight()
+
+
+def coalesce[T](
+    name: str | None = None,
+    *,
+    adopt: Callable[[Any, T], Awaitable[T]] | None = None,
+    can_share: Callable[[Any], bool] | None = None,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Decorates an async method, so concurrent calls with equal arguments share a single call.
+
+    Calls are keyed on the name and the arguments of the method, but not on the instance, so
+    concurrent calls on different instances (e.g. the services of different requests) are shared.
+    Coalescing is skipped while `settings.SINGLEFLIGHT_ENABLED` is off and for unhashable
+    arguments.
+
+    :param name: Name of the calls in the stats, defaults to the qualified name of the method.
+    :param adopt: Coroutine function called with the instance and a result shared by another
+        caller, returning the result to use instead, e.g. ORM objects merged into the session of
+        the instance.
+    :param can_share: Called with the instance; when it returns False the call neither joins nor
+        is shared, e.g. because the session of the instance has pending changes.
+    :return: The decorator.
+
+    Example usage:
+
+        @coalesce(adopt=merge_users)
+        async def get_user_by_id(self, *, user_id: UUID) -> User:
+            ...
+    """
+
+    def decorator(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        flight_name = name or method.__qualname__
+
+        @functools.wraps(method)
+        async def wrapper(self, *args: Any, **kwargs: Any) -> T:
+            if not settings.SINGLEFLIGHT_ENABLED or (
+                can_share is not None and not can_share(self)
+            ):
+                return await method(self, *args, **kwargs)
+            key = (flight_name, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                logger.debug(f"not coalescing {flight_name}, unhashable arguments")
+                return await method(self, *args, **kwargs)
+            result, shared = await singleflight.do(
+                key, lambda: method(self, *args, **kwargs), name=flight_name
+            )
+            if shared and adopt is not None:
+                result = await adopt(self, result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,244 @@
+import asyncio
+import smtplib
+import time
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+from foundation.core.config import settings
+from foundation.core.metrics import metrics
+
+"""
+This module provides a pool of persistent SMTP connections used to deliver emails.
+
+Opening an SMTP connection costs a TCP connect, a TLS handshake and an AUTH round trip. The pool
+keeps up to `size` authenticated connections open and reuses them for every message, so a burst
+of emails only pays that cost once per connection and never exceeds the relay's connection limit.
+
+The stdlib `smtplib` client is blocking, so every SMTP command runs in a worker thread and each
+connection is only ever used by one thread at a time.
+
+Usage:
+    pool = get_smtp_pool()
+    await pool.send(from_addr="info@example.com", to_addrs=["user@example.com"], message=message_str)
+    await pool.close()
+"""
+
+EMAIL_SEND_DURATION = metrics.histogram(
+    "email_send_duration_seconds",
+    "Time to send an email over a pooled SMTP connection, including waiting for a connection.",
+    ["result"],
+)
+
+
+@dataclass
+class SMTPConnection:
+    """
+    An open SMTP client and the time it was last used.
+    """
+
+    client: smtplib.SMTP
+    last_used: float = field(default_factory=time.monotonic)
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_used
+
+
+class SMTPConnectionPool:
+    """
+    Bounded pool of reusable SMTP connections.
+
+    :param host: SMTP server host.
+    :param port: SMTP server port.
+    :param use_tls: Upgrade the connection with STARTTLS.
+    :param use_ssl: Connect with implicit TLS (SMTPS).
+    :param user: Optional user for AUTH.
+    :param password: Optional password for AUTH.
+    :param size: Maximum number of open connections.
+    :param timeout: Socket timeout in seconds for each SMTP command.
+    :param keepalive_interval: Idle connections are checked with NOOP before reuse after this many seconds.
+    :param max_idle: Idle connections are closed instead of reused after this many seconds.
+
+    Example usage:
+
+        pool = SMTPConnectionPool(host="localhost", port=8025, size=4)
+        await pool.send(from_addr="me@example.com", to_addrs=["you@example.com"], message="...")
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int,
+        use_tls: bool = False,
+        use_ssl: bool = False,
+        user: str | None = None,
+        password: str | None = None,
+        size: int = 4,
+        timeout: float = 10.0,
+        keepalive_interval: float = 30.0,
+        max_idle: float = 300.0,
+    ):
+        self.host = host
+        self.port = port
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.user = user
+        self.password = password
+        self.size = size
+        self.timeout = timeout
+        self.keepalive_interval = keepalive_interval
+        self.max_idle = max_idle
+
+        self._idle: list[SMTPConnection] = []
+        self._slots = asyncio.Semaphore(size)
+        self._opened = 0
+        self._closed = False
+
+    @property
+    def open_connections(self) -> int:
+        return self._opened
+
+    async def send(self, *, from_addr: str, to_addrs: list[str], message: str) -> None:
+        """
+        Sends a message over a pooled connection.
+
+        A connection that turns out to be dropped by the server is replaced and the message is
+        retried once on a fresh connection.
+
+        :param from_addr: Envelope sender.
+        :param to_addrs: Envelope recipients.
+        :param message: The complete RFC 5322 message.
+        :raises smtplib.SMTPException: If the server rejects the message.
+        :raises OSError: If the server can not be reached.
+        """
+        start = time.perf_counter()
+        result = "error"
+        try:
+            await self._send(from_addr=from_addr, to_addrs=to_addrs, message=message)
+            result = "sent"
+        finally:
+            EMAIL_SEND_DURATION.observe(time.perf_counter() - start, result=result)
+
+    async def _send(self, *, from_addr: str, to_addrs: list[str], message: str) -> None:
+        async with self._slots:
+            for attempt in range(2):
+                connection = await self._acquire()
+                try:
+                    await asyncio.to_thread(
+                        connection.client.sendmail, from_addr, to_addrs, message
+                    )
+                except smtplib.SMTPServerDisconnected:
+                    await self._discard(connection)
+                    if attempt:
+                        raise
+                    logger.info("smtp connection dropped by server, reconnecting")
+                    continue
+                except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+                    # the server rejected this message but the connection is still usable
+                    await self._release(connection)
+                    raise
+                except BaseException:
+                    await self._discard(connection)
+                    raise
+                await self._release(connection)
+                return
+
+    async def _acquire(self) -> SMTPConnection:
+        while self._idle:
+            connection = self._idle.pop()
+            if connection.idle_seconds > self.max_idle:
+                await self._discard(connection)
+            elif connection.idle_seconds > self.keepalive_interval:
+                if await asyncio.to_thread(self._is_alive, connection.client):
+                    return connection
+                await self._discard(connection)
+            else:
+                return connection
+        client = await asyncio.to_thread(self._connect)
+        self._opened += 1
+        return SMTPConnection(client=client)
+
+    async def _release(self, connection: SMTPConnection) -> None:
+        if self._closed:
+            await self._discard(connection)
+            return
+        connection.last_used = time.monotonic()
+        self._idle.append(connection)
+
+    async def _discard(self, connection: SMTPConnection) -> None:
+        self._opened -= 1
+        await asyncio.to_thread(self._quit, connection.client)
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_tls:
+            client = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            client.starttls()
+        elif self.use_ssl:
+            client = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            client = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.user:
+            client.login(self.user, self.password or "")
+        return client
+
+    @staticmethod
+    def _is_alive(client: smtplib.SMTP) -> bool:
+        try:
+            code, _ = client.noop()
+            return code == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _quit(client: smtplib.SMTP) -> None:
+        try:
+            client.quit()
+        except (smtplib.SMTPException, OSError):
+            client.close()
+
+    async def close(self) -> None:
+        """
+        Closes all idle connections. Connections in use are closed when they are released.
+        """
+        self._closed = True
+        while self._idle:
+            await self._discard(self._idle.pop())
+
+
+_smtp_pool: SMTPConnectionPool | None = None
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """
+    Returns the process wide SMTP connection pool, configured from settings on first use.
+
+    :return: The shared SMTPConnectionPool.
+    """
+    global _smtp_pool
+    if _smtp_pool is None:
+        assert settings.EMAIL_SMTP_HOST is not None, "EMAIL_SMTP_HOST is not set"
+        _smtp_pool = SMTPConnectionPool(
+            host=settings.EMAIL_SMTP_HOST,
+            port=settings.EMAIL_SMTP_PORT,
+            use_tls=settings.EMAIL_SMTP_TLS,
+            use_ssl=settings.EMAIL_SMTP_SSL,
+            user=settings.EMAIL_SMTP_USER,
+            password=settings.EMAIL_SMTP_PASSWORD,
+            size=settings.EMAIL_SMTP_POOL_SIZE,
+            timeout=settings.EMAIL_SMTP_TIMEOUT_SECONDS,
+            keepalive_interval=settings.EMAIL_SMTP_KEEPALIVE_SECONDS,
+            max_idle=settings.EMAIL_SMTP_MAX_IDLE_SECONDS,
+        )
+    return _smtp_pool
+
+
+async def close_smtp_pool() -> None:
+    """
+    Closes the process wide SMTP connection pool, if it was created.
+    """
+    global _smtp_pool
+    if _smtp_pool is not None:
+        await _smtp_pool.close()
+        _smtp_pool = None
@@ -0,0 +1,150 @@
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from loguru import logger
+
+"""
+This module reports where the cold start of a worker goes: importing the app, and the steps of
+the startup hook.
+
+The import time is measured in a fresh interpreter with `python -X importtime`, since the modules
+are already imported in the process asking. The startup steps are timed in the process by a
+`StartupReport`, which logs a one line summary when the app is up.
+
+Usage:
+    with startup_report.step("templates"):
+        precompile_templates()
+    startup_report.log()
+
+    profile = profile_import("foundation.app")
+    profile.total  # seconds
+"""
+
+# a line of `python -X importtime`: "import time: <self us> | <cumulative us> | <indented name>"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+@dataclass
+class ImportProfile:
+    """
+    Import times of a module and of everything it imports.
+
+    :param module: Name of the profiled module.
+    :param total: Seconds to import the module, including its imports.
+    :param modules: Seconds spent in the body of each imported module, excluding its imports.
+    :param cumulative: Seconds to import each module, including its imports.
+    """
+
+    module: str
+    total: float
+    modules: dict[str, float] = field(default_factory=dict)
+    cumulative: dict[str, float] = field(default_factory=dict)
+
+    def by_package(self) -> list[tuple[str, float]]:
+        """
+        :return: Seconds spent importing the modules of each top level package, slowest first.
+        """
+        packages: Counter[str] = Counter()
+        for name, seconds in self.modules.items():
+            packages[name.split(".", 1)[0]] += seconds  # type: ignore[assignment]
+        return packages.most_common()  # type: ignore[return-value]
+
+    def slowest(self, limit: int = 20) -> list[tuple[str, float]]:
+        """
+        :param limit: Maximum number of modules.
+        :return: The modules taking the longest to import, including their imports.
+        """
+        return Counter(self.cumulative).most_common(limit)  # type: ignore[return-value]
+
+
+def parse_import_times(module: str, output: str) -> ImportProfile:
+    """
+    Parses the output of `python -X importtime`.
+
+    :param module: Name of the profiled module.
+    :param output: The standard error of the interpreter.
+    :return: The import profile.
+    """
+    profile = ImportProfile(module=module, total=0.0)
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        own, cumulative, _, name = match.groups()
+        profile.modules[name] = int(own) / 1e6
+        profile.cumulative[name] = int(cumulative) / 1e6
+    profile.total = profile.cumulative.get(module, 0.0)
+    return profile
+
+
+def profile_import(module: str = "foundation.app") -> ImportProfile:
+    """
+    Imports a module in a fresh interpreter and measures the import time of every module.
+
+    :param module: Name of the module to import.
+    :return: The import profile.
+    :raises subprocess.CalledProcessError: If the module can not be imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        check=True,
+    )
+    return parse_import_times(module, result.stderr)
+
+
+class StartupReport:
+    """
+    Times the steps of the startup of a worker.
+
+    Example usage:
+
+        report = StartupReport()
+        with report.step("templates"):
+            precompile_templates()
+        report.log()  # "started in 310ms: templates 250ms, ..."
+    """
+
+    def __init__(self):
+        self.steps: list[tuple[str, float]] = []
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """
+        Times the startup step run in the context.
+
+        :param name: Name of the step.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.perf_counter() - start))
+
+    def summary(self) -> str:
+        """
+        :return: The total time of the steps and the time of each step.
+        """
+        total = sum(seconds for _, seconds in self.steps)
+        steps = ", ".join(
+            f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.steps
+        )
+        return f"started in {total * 1000:.0f}ms: {steps}"
+
+    def log(self) -> None:
+        """
+        Logs the summary of the steps.
+        """
+        logger.info(self.summary())
+
+
+startup_report = StartupReport()
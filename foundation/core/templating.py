@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from jinja2 import BytecodeCache, FileSystemBytecodeCache
+
+from foundation.core.config import settings
+
+"""
+This module holds the Jinja settings shared by the email and web template environments.
+
+Templates are compiled to Python bytecode on first use. A `FileSystemBytecodeCache` stores that
+bytecode on disk, so every worker process after the first one loads compiled templates instead
+of parsing them again. Cache entries are keyed by template name and checked against the source
+checksum, so the email and web environments can share one directory.
+"""
+
+
+def templates_auto_reload() -> bool:
+    """
+    Returns whether templates are checked for changes on disk before every render.
+
+    Only production skips the check, templates are then compiled once per process.
+
+    :return: False in production, True otherwise.
+    """
+    return settings.ENVIRONMENT != "production"
+
+
+def create_bytecode_cache() -> BytecodeCache | None:
+    """
+    Creates the bytecode cache for a template environment.
+
+    The cache is stored in TEMPLATES_BYTECODE_CACHE_DIR if it is set. In production it
+    defaults to a directory in the system temp dir, shared by all workers of the same user.
+
+    :return: A FileSystemBytecodeCache, or None if no bytecode cache should be used.
+
+    Example usage:
+        env = Environment(loader=loader, bytecode_cache=create_bytecode_cache())
+    """
+    if settings.TEMPLATES_BYTECODE_CACHE_DIR:
+        cache_dir = Path(settings.TEMPLATES_BYTECODE_CACHE_DIR)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        return FileSystemBytecodeCache(str(cache_dir))
+    if settings.ENVIRONMENT == "production":
+        return FileSystemBytecodeCache()
+    return None
@@ -0,0 +1,145 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+"""
+This module measures where the time of a request goes, for the `Server-Timing` response header.
+
+The `ServerTimingMiddleware` puts a `ServerTiming` in the context of every request. Code on the
+paths worth watching records spans into it by name: the JWT check and the loading of the current
+user, each database statement, page and component rendering, and password hashing. Spans with the
+same name are summed, so a page running 12 queries shows a single `db` entry with their total
+time. A span nested in a span of the same name (e.g. a component rendered while rendering a page)
+is not counted twice.
+
+Outside of a request (tools, background tasks) there is no `ServerTiming` and recording a span
+costs a context variable lookup.
+
+Usage:
+    with timing_span("render"):
+        html = catalog.render("user.UserList", page=page)
+"""
+
+# descriptions of the spans shown by the browser devtools, other spans are described by name
+SPAN_DESCRIPTIONS = {
+    "jwt": "JWT validation",
+    "auth": "Current user",
+    "db": "Database",
+    "render": "Templates",
+    "hash": "Password hashing",
+}
+
+
+class ServerTiming:
+    """
+    Durations of the named spans of one request.
+
+    Example usage:
+
+        timing = ServerTiming()
+        with timing.span("db"):
+            ...
+        timing.header_value(total=0.012)  # 'db;desc="Database (1)";dur=3.1, total;dur=12.0'
+    """
+
+    def __init__(self):
+        # total seconds and number of spans, by name
+        self.spans: dict[str, list] = {}
+        # the header is sent to admins even when settings.SERVER_TIMING_ENABLED is off
+        self.exposed = False
+        self._open: dict[str, int] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Adds a span measured by the caller.
+
+        :param name: Name of the span, e.g. "db".
+        :param seconds: Duration of the span.
+        """
+        if self._open.get(name):
+            return
+        span = self.spans.get(name)
+        if span is None:
+            self.spans[name] = [seconds, 1]
+        else:
+            span[0] += seconds
+            span[1] += 1
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """
+        Records the time spent in the context as a span.
+
+        :param name: Name of the span, e.g. "render".
+        """
+        if self._open.get(name):
+            yield
+            return
+        start = time.perf_counter()
+        self._open[name] = 1
+        try:
+            yield
+        finally:
+            self._open[name] = 0
+            self.record(name, time.perf_counter() - start)
+
+    def header_value(self, total: float | None = None) -> str:
+        """
+        :param total: Duration of the whole request so far, sent as the `total` metric.
+        :return: Value of the `Server-Timing` header, durations in milliseconds.
+        """
+        metrics = []
+        for name, (seconds, count) in self.spans.items():
+            # the number of spans goes in the description, the only text devtools show
+            desc = f"{SPAN_DESCRIPTIONS.get(name, name)} ({count})"
+            metrics.append(f'{name};desc="{desc}";dur={seconds * 1000:.1f}')
+        if total is not None:
+            metrics.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+# timing of the request being handled by the current task, set by the ServerTimingMiddleware
+server_timing: contextvars.ContextVar[ServerTiming | None] = contextvars.ContextVar(
+    "server_timing", default=None
+)
+
+
+@contextmanager
+def timing_span(name: str) -> Iterator[None]:
+    """
+    Records the time spent in the context as a span of the current request, if any.
+
+    :param name: Name of the span, e.g. "render".
+
+    Example usage:
+        with timing_span("hash"):
+            hashed = pwd_context.hash(password)
+    """
+    timing = server_timing.get()
+    if timing is None:
+        yield
+        return
+    with timing.span(name):
+        yield
+
+
+def record_timing(name: str, seconds: float) -> None:
+    """
+    Adds a span measured by the caller to the current request, if any.
+
+    :param name: Name of the span, e.g. "db".
+    :param seconds: Duration of the span.
+    """
+    timing = server_timing.get()
+    if timing is not None:
+        timing.record(name, seconds)
+
+
+def expose_server_timing() -> None:
+    """
+    Sends the `Server-Timing` header of the current request, e.g. because an admin made it.
+    """
+    timing = server_timing.get()
+    if timing is not None:
+        timing.exposed = True
@@ -0,0 +1,44 @@
+from foundation.core.tracing.exporters import (
+    JsonLinesExporter,
+    MemoryExporter,
+    OtlpHttpExporter,
+    SpanExporter,
+    memory_exporter,
+)
+from foundation.core.tracing.spans import (
+    Sampler,
+    Span,
+    SpanContext,
+    Trace,
+    current_span,
+    current_traceparent,
+    format_traceparent,
+    parse_traceparent,
+    record_span,
+    trace_span,
+    traced,
+    waterfall,
+)
+from foundation.core.tracing.tracer import Tracer, tracer
+
+__all__ = [
+    "JsonLinesExporter",
+    "MemoryExporter",
+    "OtlpHttpExporter",
+    "Sampler",
+    "Span",
+    "SpanContext",
+    "SpanExporter",
+    "Trace",
+    "Tracer",
+    "current_span",
+    "current_traceparent",
+    "format_traceparent",
+    "memory_exporter",
+    "parse_traceparent",
+    "record_span",
+    "trace_span",
+    "traced",
+    "tracer",
+    "waterfall",
+]
@@ -0,0 +1,273 @@
+import json
+import os
+import threading
+import urllib.request
+from collections import deque
+from typing import Any, Sequence
+
+from foundation.core.config import settings
+from foundation.core.tracing.spans import Span, Trace
+
+"""
+This module sends the recorded traces somewhere they can be looked at.
+
+- `MemoryExporter` keeps the last traces of the worker, for the `/admin/traces` pages.
+- `JsonLinesExporter` appends the spans to a file, one JSON object per line.
+- `OtlpHttpExporter` posts the spans to an OpenTelemetry collector (or anything speaking
+  OTLP/HTTP with JSON encoding, e.g. `make trace-collector`).
+
+The exporters run in the export thread of the tracer, never on the event loop, and are picked by
+name with `settings.TRACING_EXPORTERS`.
+
+Usage:
+    exporter = JsonLinesExporter("/tmp/traces.jsonl")
+    exporter.export([trace])
+"""
+
+# kinds of the spans in OTLP, see opentelemetry/proto/trace/v1/trace.proto
+OTLP_SPAN_KINDS = {"internal": 1, "server": 2, "client": 3}
+OTLP_STATUS_CODES = {"unset": 0, "ok": 1, "error": 2}
+
+
+class SpanExporter:
+    """
+    Base class of the exporters.
+
+    Example usage:
+
+        class PrintExporter(SpanExporter):
+            name = "print"
+
+            def export(self, traces: Sequence[Trace]) -> None:
+                for trace in traces:
+                    print(trace.trace_id, len(trace.spans))
+    """
+
+    name = "exporter"
+
+    def export(self, traces: Sequence[Trace]) -> None:
+        """
+        Exports finished traces, called from the export thread.
+
+        :param traces: The traces, each with the spans recorded in this process.
+        """
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        """
+        Releases the resources of the exporter, once no trace is exported anymore.
+        """
+
+
+class MemoryExporter(SpanExporter):
+    """
+    Keeps the last traces in memory.
+
+    :param max_traces: Number of traces kept, defaults to `settings.TRACING_MAX_TRACES`.
+
+    Example usage:
+        memory_exporter.recent()  # newest first
+        memory_exporter.get(trace_id)
+    """
+
+    name = "memory"
+
+    def __init__(self, max_traces: int | None = None):
+        self.traces: deque[Trace] = deque(
+            maxlen=max_traces or settings.TRACING_MAX_TRACES
+        )
+        self._lock = threading.Lock()
+
+    def export(self, traces: Sequence[Trace]) -> None:
+        with self._lock:
+            self.traces.extend(traces)
+
+    def recent(self) -> list[Trace]:
+        """
+        :return: The kept traces, newest first.
+        """
+        with self._lock:
+            return list(reversed(self.traces))
+
+    def get(self, trace_id: str) -> Trace | None:
+        """
+        :param trace_id: Id of a trace.
+        :return: The trace, or None if it is not kept (anymore).
+        """
+        with self._lock:
+            return next((t for t in self.traces if t.trace_id == trace_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.traces.clear()
+
+
+class JsonLinesExporter(SpanExporter):
+    """
+    Appends the spans to a file, one JSON object per span and per line.
+
+    Each batch is appended with a single write, so the workers of the app can share the file.
+
+    :param path: Path of the file, defaults to `settings.TRACING_JSONL_PATH`.
+
+    Example usage:
+        JsonLinesExporter("/tmp/traces.jsonl").export([trace])
+    """
+
+    name = "jsonl"
+
+    def __init__(self, path: str | None = None):
+        self.path = path or settings.TRACING_JSONL_PATH
+
+    def export(self, traces: Sequence[Trace]) -> None:
+        lines = [
+            json.dumps(span.to_dict(), default=str) + "\n"
+            for trace in traces
+            for span in trace.spans
+        ]
+        if not lines:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(lines))
+
+
+def otlp_value(value: Any) -> dict[str, Any]:
+    """
+    :param value: Value of a span attribute.
+    :return: The value as an OTLP `AnyValue`.
+    """
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # 64 bit integers are strings in the JSON encoding of OTLP
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {"key": key, "value": otlp_value(value)} for key, value in attributes.items()
+    ]
+
+
+def otlp_span(span: Span) -> dict[str, Any]:
+    """
+    :param span: A finished span.
+    :return: The span in the JSON encoding of OTLP.
+    """
+    otlp: dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": OTLP_SPAN_KINDS.get(span.kind, 1),
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": otlp_attributes(span.attributes),
+        "status": {"code": OTLP_STATUS_CODES.get(span.status, 0)},
+    }
+    if span.parent_id:
+        otlp["parentSpanId"] = span.parent_id
+    if span.status_message:
+        otlp["status"]["message"] = span.status_message
+    return otlp
+
+
+def otlp_payload(traces: Sequence[Trace], service_name: str) -> dict[str, Any]:
+    """
+    :param traces: Finished traces.
+    :param service_name: Name of the service the traces were recorded in.
+    :return: An OTLP `ExportTraceServiceRequest`, in the JSON encoding.
+    """
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": otlp_attributes({"service.name": service_name})
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "foundation"},
+                        "spans": [
+                            otlp_span(span) for trace in traces for span in trace.spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class OtlpHttpExporter(SpanExporter):
+    """
+    Posts the spans to an OTLP/HTTP endpoint, with the JSON encoding.
+
+    :param endpoint: URL of the traces endpoint, defaults to `settings.TRACING_OTLP_ENDPOINT`.
+    :param headers: Extra headers, e.g. for authentication, defaults to
+        `settings.TRACING_OTLP_HEADERS`.
+    :param service_name: Name of the service, defaults to `settings.TRACING_SERVICE_NAME` or the
+        name of the app.
+    :param timeout: Seconds to wait for the endpoint.
+
+    Example usage:
+        OtlpHttpExporter("http://localhost:4318/v1/traces").export([trace])
+    """
+
+    name = "otlp"
+
+    def __init__(
+        self,
+        endpoint: str | None = None,
+        headers: dict[str, str] | None = None,
+        service_name: str | None = None,
+        timeout: float = 5.0,
+    ):
+        self.endpoint = endpoint or settings.TRACING_OTLP_ENDPOINT
+        self.headers = settings.TRACING_OTLP_HEADERS if headers is None else headers
+        self.service_name = (
+            service_name or settings.TRACING_SERVICE_NAME or settings.APP_NAME
+        )
+        self.timeout = timeout
+
+    def export(self, traces: Sequence[Trace]) -> None:
+        """
+        :raises OSError: If the endpoint can not be reached or rejects the spans.
+        """
+        if not any(trace.spans for trace in traces):
+            return
+        body = json.dumps(otlp_payload(traces, self.service_name), default=str)
+        request = urllib.request.Request(
+            self.endpoint,
+            data=body.encode(),
+            headers={"Content-Type": "application/json", **self.headers},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+# the traces shown on the admin pages
+memory_exporter = MemoryExporter()
+
+
+def create_exporters(names: Sequence[str]) -> list[SpanExporter]:
+    """
+    :param names: Names of the exporters, e.g. ["memory", "otlp"].
+    :return: The exporters.
+    :raises ValueError: If a name is unknown.
+    """
+    exporters: list[SpanExporter] = []
+    for name in names:
+        if name == MemoryExporter.name:
+            exporters.append(memory_exporter)
+        elif name == JsonLinesExporter.name:
+            exporters.append(JsonLinesExporter())
+        elif name == OtlpHttpExporter.name:
+            exporters.append(OtlpHttpExporter())
+        else:
+            raise ValueError(f"unknown trace exporter: {name}")
+    return exporters
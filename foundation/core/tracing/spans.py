@@ -0,0 +1,422 @@
+import contextvars
+import functools
+import random
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterator
+
+from foundation.core.config import settings
+
+"""
+This module records the spans of a trace: the timed, nested operations a request goes through
+(request → dependency → service → repository → SQL).
+
+The `TracingMiddleware` starts the root span of every request, in a trace continued from the W3C
+`traceparent` header of the request if it has one. Code on the paths worth watching opens child
+spans with `trace_span` or the `traced` decorator; the current span is kept in a context variable,
+so spans nest the way the code calls. The trace is exported when the root span ends, see
+`foundation.core.tracing.tracer`.
+
+Whether a trace is recorded is decided once, when it starts (see `Sampler`). In a trace that is not
+recorded, or outside of a request, opening a span costs a context variable lookup.
+
+Usage:
+    with trace_span("render", template=name):
+        html = catalog.render(name, **kwargs)
+
+    @traced()
+    async def get_user_by_id(self, *, user_id: UUID) -> User:
+        ...
+"""
+
+# version, trace id, parent span id and flags, see https://www.w3.org/TR/trace-context/
+TRACEPARENT = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+INVALID_TRACE_ID = "0" * 32
+INVALID_SPAN_ID = "0" * 16
+FLAG_SAMPLED = 0x01
+
+
+def new_trace_id() -> str:
+    return f"{random.getrandbits(128) or 1:032x}"
+
+
+def new_span_id() -> str:
+    return f"{random.getrandbits(64) or 1:016x}"
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """
+    The identity of a span, as propagated between services.
+
+    :param trace_id: 32 hex digits id of the trace.
+    :param span_id: 16 hex digits id of the span.
+    :param sampled: True if the trace is recorded.
+    """
+
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+def parse_traceparent(value: str | None) -> SpanContext | None:
+    """
+    :param value: Value of a `traceparent` header.
+    :return: The span context of the caller, or None if the value is missing or invalid.
+    """
+    if not value:
+        return None
+    match = TRACEPARENT.match(value.strip().lower())
+    if match is None:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    # version 00 has no fields after the flags, later versions may add some
+    if version == "ff" or (version == "00" and len(value.strip()) != 55):
+        return None
+    if trace_id == INVALID_TRACE_ID or span_id == INVALID_SPAN_ID:
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & FLAG_SAMPLED))
+
+
+def format_traceparent(context: SpanContext) -> str:
+    """
+    :param context: Span context to propagate.
+    :return: Value of the `traceparent` header for the calls made in the span.
+    """
+    flags = FLAG_SAMPLED if context.sampled else 0
+    return f"00-{context.trace_id}-{context.span_id}-{flags:02x}"
+
+
+class Sampler:
+    """
+    Decides whether a new trace is recorded.
+
+    A trace continued from a caller is recorded if the caller records it (when `parent_based`),
+    other traces are recorded at `rate`. The decision only depends on the trace id, so all the
+    services sampling a trace at the same rate take the same decision.
+
+    :param rate: Share of the traces recorded, defaults to `settings.TRACING_SAMPLE_RATE`.
+    :param parent_based: Follow the decision of the caller, defaults to
+        `settings.TRACING_PARENT_BASED`.
+
+    Example usage:
+        sampler = Sampler(rate=0.1)
+        sampler.should_sample(trace_id, parent=parse_traceparent(header))
+    """
+
+    def __init__(self, rate: float | None = None, parent_based: bool | None = None):
+        self.rate = rate
+        self.parent_based = parent_based
+
+    def should_sample(self, trace_id: str, parent: SpanContext | None = None) -> bool:
+        parent_based = (
+            settings.TRACING_PARENT_BASED
+            if self.parent_based is None
+            else self.parent_based
+        )
+        if parent is not None and parent_based:
+            return parent.sampled
+        rate = settings.TRACING_SAMPLE_RATE if self.rate is None else self.rate
+        # the low 64 bits of the trace id, like the TraceIdRatioBased sampler of OpenTelemetry
+        return int(trace_id[16:], 16) < rate * (1 << 64)
+
+
+@dataclass
+class Span:
+    """
+    A timed operation of a trace.
+
+    :param trace_id: Id of the trace of the span.
+    :param span_id: Id of the span.
+    :param parent_id: Id of the parent span, which may be in the calling service, or None.
+    :param name: Name of the operation, e.g. "UserService.get_user_by_id".
+    :param kind: "server" for the root span of a request, "client" for calls to other services
+        (e.g. SQL statements), "internal" otherwise.
+    :param start_ns: Start time, in nanoseconds since the epoch.
+    :param end_ns: End time, in nanoseconds since the epoch, 0 while the span is open.
+    :param attributes: Details of the operation, e.g. {"db.table": "users"}.
+    :param status: "unset", or "error" if the operation raised.
+    :param status_message: The error raised by the operation.
+    """
+
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    kind: str = "internal"
+    start_ns: int = 0
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: str = "unset"
+    status_message: str = ""
+    # the trace the span is recorded in
+    trace: "Trace | None" = field(default=None, repr=False, compare=False)
+
+    @property
+    def duration(self) -> float:
+        """
+        :return: Seconds between the start and the end of the span.
+        """
+        return max(0, self.end_ns - self.start_ns) / 1e9
+
+    @property
+    def context(self) -> SpanContext:
+        return SpanContext(
+            self.trace_id, self.span_id, self.trace.sampled if self.trace else False
+        )
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = "error"
+        self.status_message = f"{type(error).__name__}: {error}"
+
+    def end(self, end_ns: int | None = None) -> None:
+        self.end_ns = end_ns or time.time_ns()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "attributes": self.attributes,
+            "status": self.status,
+            "status_message": self.status_message,
+        }
+
+
+class Trace:
+    """
+    The spans of a trace recorded in this process, i.e. of one request.
+
+    :param trace_id: Id of the trace.
+    :param sampled: True if the spans are recorded.
+    :param max_spans: Most spans recorded, the other spans are counted in `dropped_spans`.
+        Defaults to `settings.TRACING_MAX_SPANS`.
+
+    Example usage:
+        trace = Trace(new_trace_id(), sampled=True)
+        root = trace.start_span("GET /users", kind="server")
+        ...
+        root.end()
+    """
+
+    def __init__(self, trace_id: str, sampled: bool, max_spans: int | None = None):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.max_spans = max_spans or settings.TRACING_MAX_SPANS
+        self.spans: list[Span] = []
+        self.dropped_spans = 0
+
+    @property
+    def root(self) -> Span | None:
+        """
+        :return: The first span of the trace in this process, e.g. the span of the request.
+        """
+        return self.spans[0] if self.spans else None
+
+    def start_span(
+        self,
+        name: str,
+        parent_id: str | None = None,
+        kind: str = "internal",
+        attributes: dict[str, Any] | None = None,
+        start_ns: int | None = None,
+    ) -> Span:
+        """
+        Starts a span of the trace.
+
+        :param name: Name of the operation.
+        :param parent_id: Id of the parent span.
+        :param kind: Kind of the span, see `Span`.
+        :param attributes: Details of the operation.
+        :param start_ns: Start time of the span, defaults to now.
+        :return: The span, to end when the operation is done.
+        """
+        span = Span(
+            trace_id=self.trace_id,
+            span_id=new_span_id(),
+            parent_id=parent_id,
+            name=name,
+            kind=kind,
+            start_ns=start_ns or time.time_ns(),
+            attributes=attributes or {},
+            trace=self,
+        )
+        if not self.sampled:
+            return span
+        if len(self.spans) < self.max_spans:
+            self.spans.append(span)
+        else:
+            self.dropped_spans += 1
+        return span
+
+
+# span of the operation the current task runs, set by the TracingMiddleware and trace_span
+current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def _recording_span() -> Span | None:
+    span = current_span.get()
+    if span is None or span.trace is None or not span.trace.sampled:
+        return None
+    return span
+
+
+@contextmanager
+def trace_span(
+    name: str, kind: str = "internal", **attributes: Any
+) -> Iterator[Span | None]:
+    """
+    Records the operation run in the context as a child span of the current span, if the trace
+    is recorded.
+
+    :param name: Name of the operation, e.g. "render".
+    :param kind: Kind of the span, see `Span`.
+    :param attributes: Details of the operation.
+    :return: The span, or None if it is not recorded.
+
+    Example usage:
+        with trace_span("render", template=name):
+            html = catalog.render(name, **kwargs)
+    """
+    parent = _recording_span()
+    if parent is None:
+        yield None
+        return
+    span = parent.trace.start_span(name, parent.span_id, kind, attributes)  # type: ignore[union-attr]
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        span.end()
+        current_span.reset(token)
+
+
+def record_span(
+    name: str, seconds: float, kind: str = "internal", **attributes: Any
+) -> None:
+    """
+    Adds an operation that just ended, timed by the caller, as a child span of the current span.
+
+    :param name: Name of the operation, e.g. "db SELECT".
+    :param seconds: Duration of the operation.
+    :param kind: Kind of the span, see `Span`.
+    :param attributes: Details of the operation.
+    """
+    parent = _recording_span()
+    if parent is None:
+        return
+    end_ns = time.time_ns()
+    span = parent.trace.start_span(  # type: ignore[union-attr]
+        name, parent.span_id, kind, attributes, start_ns=end_ns - int(seconds * 1e9)
+    )
+    span.end(end_ns)
+
+
+def traced[**P, T](
+    name: str | None = None,
+    attributes: Callable[..., dict[str, Any]] | None = None,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """
+    Decorates an async function, so each call is recorded as a span.
+
+    :param name: Name of the spans, defaults to the qualified name of the function.
+    :param attributes: Called with the arguments of the function, returns the attributes of the
+        span.
+
+    Example usage:
+        class UserService:
+            @traced()
+            async def get_user_by_id(self, *, user_id: UUID) -> User:
+                ...
+    """
+
+    def decorator(fn: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            if _recording_span() is None:
+                return await fn(*args, **kwargs)
+            span_attributes = attributes(*args, **kwargs) if attributes else {}
+            with trace_span(span_name, **span_attributes):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_traceparent() -> str | None:
+    """
+    :return: Value of the `traceparent` header for a call to another service made in the current
+        span, or None outside of a trace.
+
+    Example usage:
+        headers = {"traceparent": traceparent} if (traceparent := current_traceparent()) else {}
+    """
+    span = current_span.get()
+    return format_traceparent(span.context) if span is not None else None
+
+
+@dataclass
+class WaterfallRow:
+    """
+    A span of a trace, placed on the time line of the trace.
+
+    :param span: The span.
+    :param depth: Number of ancestors of the span in the trace.
+    :param offset: Start of the span after the start of the trace, as a share of its duration.
+    :param width: Duration of the span, as a share of the duration of the trace.
+    """
+
+    span: Span
+    depth: int
+    offset: float
+    width: float
+
+
+def waterfall(trace: Trace) -> list[WaterfallRow]:
+    """
+    Lays out the spans of a trace under their parents, in the order they started.
+
+    :param trace: A trace.
+    :return: The rows of the waterfall chart of the trace.
+    """
+    root = trace.root
+    if root is None:
+        return []
+    total = max(1, root.end_ns - root.start_ns)
+    children: dict[str | None, list[Span]] = {}
+    for span in trace.spans[1:]:
+        children.setdefault(span.parent_id, []).append(span)
+
+    rows: list[WaterfallRow] = []
+
+    def add(span: Span, depth: int) -> None:
+        rows.append(
+            WaterfallRow(
+                span=span,
+                depth=depth,
+                offset=max(0, span.start_ns - root.start_ns) / total,
+                width=max(0, span.end_ns - span.start_ns) / total,
+            )
+        )
+        for child in sorted(children.get(span.span_id, []), key=lambda s: s.start_ns):
+            add(child, depth + 1)
+
+    add(root, 0)
+    return rows
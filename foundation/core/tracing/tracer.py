@@ -0,0 +1,204 @@
+import queue
+import threading
+from typing import Any, Sequence
+
+from loguru import logger
+
+from foundation.core.config import settings
+from foundation.core.metrics import metrics
+from foundation.core.tracing.exporters import SpanExporter, create_exporters
+from foundation.core.tracing.spans import (
+    Sampler,
+    Span,
+    Trace,
+    new_trace_id,
+    parse_traceparent,
+)
+
+"""
+This module starts the traces of the requests and hands the finished traces to the exporters.
+
+Exporting (writing a file, posting to a collector) is done by a daemon thread, so the requests
+never wait for it. The finished traces wait in a bounded queue: if the exporters can not keep up,
+the traces that do not fit are dropped and counted in `traces_dropped_total`.
+
+Usage:
+    root = tracer.start_trace("GET /users", traceparent=headers.get("traceparent"))
+    token = current_span.set(root)
+    ...
+    tracer.end_trace(root)
+"""
+
+TRACES_EXPORTED = metrics.counter(
+    "traces_exported_total", "Traces handed to an exporter.", ["exporter"]
+)
+TRACES_DROPPED = metrics.counter(
+    "traces_dropped_total",
+    "Traces not exported because the export queue was full or the exporter failed.",
+    ["reason"],
+)
+# most traces handed to the exporters at once
+EXPORT_BATCH_SIZE = 100
+
+
+class Tracer:
+    """
+    Starts traces, and exports the recorded ones from a background thread.
+
+    :param exporters: Exporters of the traces, defaults to the `settings.TRACING_EXPORTERS`.
+    :param sampler: Decides which traces are recorded, defaults to a `Sampler` with the settings.
+    :param queue_size: Most traces waiting to be exported, defaults to
+        `settings.TRACING_EXPORT_QUEUE_SIZE`.
+
+    Example usage:
+
+        tracer = Tracer(exporters=[MemoryExporter()], sampler=Sampler(rate=1.0))
+        root = tracer.start_trace("GET /users")
+        ...
+        tracer.end_trace(root)
+        tracer.flush()
+    """
+
+    def __init__(
+        self,
+        exporters: Sequence[SpanExporter] | None = None,
+        sampler: Sampler | None = None,
+        queue_size: int | None = None,
+    ):
+        self._exporters = list(exporters) if exporters is not None else None
+        self.sampler = sampler or Sampler()
+        self._queue: queue.Queue[Any] = queue.Queue(
+            maxsize=queue_size or settings.TRACING_EXPORT_QUEUE_SIZE
+        )
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def exporters(self) -> list[SpanExporter]:
+        if self._exporters is None:
+            self._exporters = create_exporters(settings.TRACING_EXPORTERS)
+        return self._exporters
+
+    def start_trace(
+        self,
+        name: str,
+        traceparent: str | None = None,
+        kind: str = "server",
+        attributes: dict[str, Any] | None = None,
+    ) -> Span:
+        """
+        Starts the root span of the trace of a request.
+
+        :param name: Name of the root span.
+        :param traceparent: The `traceparent` header of the request, continuing the trace of the
+            caller.
+        :param kind: Kind of the span, see `Span`.
+        :param attributes: Details of the request.
+        :return: The root span, recorded only if the trace is sampled.
+        """
+        parent = parse_traceparent(traceparent)
+        trace_id = parent.trace_id if parent is not None else new_trace_id()
+        trace = Trace(trace_id, self.sampler.should_sample(trace_id, parent))
+        return trace.start_span(
+            name, parent.span_id if parent else None, kind, attributes
+        )
+
+    def end_trace(self, root: Span) -> None:
+        """
+        Ends the root span, and queues the trace for export if it is recorded.
+
+        :param root: The span returned by `start_trace`.
+        """
+        root.end()
+        trace = root.trace
+        if trace is None or not trace.sampled:
+            return
+        if trace.dropped_spans:
+            root.set_attribute("dropped_spans", trace.dropped_spans)
+        self._start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            TRACES_DROPPED.inc(reason="queue_full")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Waits until the traces queued so far are exported.
+
+        :param timeout: Seconds to wait at most.
+        :return: True if the traces were exported in time.
+        """
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """
+        Exports the queued traces, then stops the export thread and the exporters.
+
+        :param timeout: Seconds to wait for the export of the queued traces.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="trace-exporter", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: list[Trace] = []
+            markers: list[threading.Event] = []
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if stop or len(batch) >= EXPORT_BATCH_SIZE:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._export(batch)
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    def _export(self, batch: list[Trace]) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(batch)
+            except Exception as e:
+                logger.warning(
+                    f"unable to export {len(batch)} traces to {exporter.name}: {e}"
+                )
+                TRACES_DROPPED.inc(len(batch), reason=exporter.name)
+            else:
+                TRACES_EXPORTED.inc(len(batch), exporter=exporter.name)
+
+
+tracer = Tracer()
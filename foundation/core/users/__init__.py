@@ -1,6 +1,8 @@
 from fastapi import HTTPException
 from fastapi_jwt import JwtAuthorizationCredentials
 
+from foundation.core.timing import expose_server_timing, timing_span
+from foundation.core.tracing import trace_span
 from foundation.core.users.models import User, StatusEnum, RoleEnum
 from foundation.core.users.services import UserService, UserNotFoundError
 
@@ -25,12 +27,16 @@ async def get_current_user(
             status_code=401, detail="No id found in authorization token"
         )
 
-    try:
-        user: User = await user_service.get_user_by_id(user_id=user_id)
-    except UserNotFoundError:
-        raise HTTPException(status_code=404, detail="User not found")
+    with timing_span("auth"), trace_span("auth.current_user"):
+        try:
+            user: User = await user_service.get_user_by_id(user_id=user_id)
+        except UserNotFoundError:
+            raise HTTPException(status_code=404, detail="User not found")
     if not user.status == StatusEnum.ACTIVE:
         raise HTTPException(status_code=400, detail="Inactive user")
+    if user.role == RoleEnum.ADMIN:
+        # admins see where the time of their requests goes in the browser devtools
+        expose_server_timing()
     return user
 
 
@@ -1,4 +1,4 @@
-from typing import Annotated, Tuple, Any
+from typing import Annotated, Tuple, Any, Sequence
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,6 +9,7 @@ from foundation.core.users.models import User
 from foundation.core.users.services import UserService
 from fastapi import Request
 from sqlalchemy import Select
+from starlette.datastructures import URL
 from foundation.core.pagination import Paginator
 
 
@@ -69,6 +70,9 @@ class UserPagination:
         order_by: str,
         asc: bool = True,
         page_size: int = 10,
+        url: URL | None = None,
+        count_repository: Repository[User] | None = None,
+        columns: Sequence[str] | None = None,
     ):
         return Paginator(
             request,
@@ -77,6 +81,9 @@ class UserPagination:
             page_size=page_size,
             order_by=order_by,
             ascending=asc,
+            url=url,
+            count_repository=count_repository,
+            columns=columns,
         )
 
 
@@ -71,6 +71,7 @@ class User(BaseWithId):
     Properties:
         is_admin: Checks if the user's role is ADMIN.
         is_active: Checks if the user's status is ACTIVE.
+        version: Changes whenever the user is updated.
 
     Example usage:
         user = User(email='example@example.com', hashed_password='hashed_pw')
@@ -106,3 +107,10 @@ class User(BaseWithId):
     @property
     def is_active(self):
         return self.status == StatusEnum.ACTIVE
+
+    @property
+    def version(self) -> str:
+        """
+        A value that changes whenever the user or one of its public fields is updated, used to build ETags.
+        """
+        return f"{self.id}|{self.updated_at}|{self.email}|{self.full_name}|{self.status}|{self.role}"
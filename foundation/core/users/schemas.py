@@ -2,8 +2,16 @@ import re
 import uuid
 from typing import Sequence, Annotated
 
-from pydantic import BaseModel, EmailStr, ConfigDict, field_validator, StringConstraints
-
+from pydantic import (
+    BaseModel,
+    EmailStr,
+    ConfigDict,
+    Field,
+    field_validator,
+    StringConstraints,
+)
+
+from foundation.core.config import settings
 from foundation.core.users.models import StatusEnum, RoleEnum
 
 
@@ -238,6 +246,118 @@ class UsersPublic(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UsersCursorPublic(BaseModel):
+    """
+    Represents a page of public user information fetched after a cursor.
+
+    Attributes:
+        data (Sequence[UserPublic]): A list of UserPublic objects.
+        next_cursor (str | None): Cursor of the next page, None on the last page.
+        has_more (bool): True if there are users after this page.
+
+    Example:
+        page = UsersCursorPublic(data=[user1, user2], next_cursor="WyIyMDI2...", has_more=True)
+    """
+
+    data: Sequence[UserPublic]
+    next_cursor: str | None
+    has_more: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UsersLookup(BaseModel):
+    """
+    Represents a request for the users with any of the given IDs or emails.
+
+    Attributes:
+        ids (list[uuid.UUID]): IDs of the users to fetch.
+        emails (list[EmailStr]): Emails of the users to fetch.
+
+    Example:
+        lookup = UsersLookup(ids=[user_id], emails=["user@example.com"])
+    """
+
+    ids: list[uuid.UUID] = Field(default=[], max_length=settings.API_MAX_PAGE_SIZE)
+    emails: list[EmailStr] = Field(default=[], max_length=settings.API_MAX_PAGE_SIZE)
+
+
+class UsersLookupPublic(BaseModel):
+    """
+    Represents the result of a UsersLookup.
+
+    Attributes:
+        data (Sequence[UserPublic]): The users found.
+        missing (list[str]): The requested IDs and emails that no user has.
+
+    Example:
+        result = UsersLookupPublic(data=[user1], missing=["nobody@example.com"])
+    """
+
+    data: Sequence[UserPublic]
+    missing: list[str]
+
+
+class UserBulkUpdate(UserUpdate):
+    """
+    Represents the update of one user in a bulk update, a UserUpdate with the ID of the user.
+
+    Example:
+        update = UserBulkUpdate(id=user_id, email="john@example.com", full_name="John Doe")
+    """
+
+    id: uuid.UUID
+    password: str | None = None
+
+
+class UsersBulkDelete(BaseModel):
+    """
+    Represents a request to delete users.
+
+    Attributes:
+        ids (list[uuid.UUID]): IDs of the users to delete.
+
+    Example:
+        request = UsersBulkDelete(ids=[user_id1, user_id2])
+    """
+
+    ids: list[uuid.UUID] = Field(max_length=settings.API_MAX_PAGE_SIZE)
+
+
+class UserBulkResult(BaseModel):
+    """
+    Represents the result of the operation on one user of a bulk request.
+
+    Attributes:
+        id (uuid.UUID): ID of the user.
+        status (int): HTTP status code the operation would have on its own, e.g. 200 or 404.
+        detail (str | None): Reason of a failed operation.
+        user (UserPublic | None): The updated user, for a successful update.
+
+    Example:
+        result = UserBulkResult(id=user_id, status=404, detail="The user ... does not exist")
+    """
+
+    id: uuid.UUID
+    status: int
+    detail: str | None = None
+    user: UserPublic | None = None
+
+
+class UsersBulkResults(BaseModel):
+    """
+    Represents the results of a bulk request, in the order of its operations.
+
+    Attributes:
+        results (list[UserBulkResult]): Result of the operation on each user.
+
+    Example:
+        results = UsersBulkResults(results=[UserBulkResult(id=user_id, status=200)])
+    """
+
+    results: list[UserBulkResult]
+
+
 class ForgotPassword(BaseModel):
     """
     This class represents a model for initiating a forgot password request.
@@ -1,23 +1,26 @@
-from typing import Any, Sequence
+from typing import Any, Collection, Sequence
 from uuid import UUID
 
 from loguru import logger
-from sqlalchemy import select, func
+from sqlalchemy import select, func, or_
 from sqlalchemy.exc import IntegrityError
 
-from foundation.core.config import settings
 from foundation.core.email import (
     generate_new_account_email,
-    send_email,
     generate_reset_password_email,
 )
+from foundation.core.outbox import EmailOutbox, EmailOutboxService
+from foundation.core.pagination import CursorPage, CursorPaginator
 from foundation.core.repository import Repository
+from foundation.core.singleflight import coalesce
+from foundation.core.tracing import traced
 from foundation.core.security import (
-    verify_password,
-    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
     generate_password_reset_token,
 )
 from foundation.core.users.models import User, StatusEnum, RoleEnum
+from foundation.core.versioning import data_versions
 
 
 class UserNotFoundError(Exception):
@@ -90,31 +93,91 @@ class UserValueError(Exception):
         super().__init__(f"The user can not be updated with value '{value}'")
 
 
+def _session_is_clean(service: "UserService") -> bool:
+    # a session with pending changes could read them back, they must not be shared
+    session = service.repository.session
+    return not (session.new or session.dirty or session.deleted)
+
+
+async def _merge_user(service: "UserService", user: User) -> User:
+    # a user shared by another request belongs to its session, use a copy in this one
+    return await service.repository.session.merge(user, load=False)
+
+
 class UserService:
     """
     Handles user-related operations such as creation, updation, deletion, and querying.
+
+    Emails are queued in the outbox using the same session as the repository, so they are
+    committed together with the user changes and delivered by the `EmailDispatcher`.
+
+    Every write bumps the "user" data version, which invalidates cached fragments showing users.
     """
 
     repository: Repository[User]
     current_user: User | None
-
-    def __init__(self, repository: Repository[User], current_user: User | None = None):
+    outbox: EmailOutboxService
+
+    def __init__(
+        self,
+        repository: Repository[User],
+        current_user: User | None = None,
+        outbox: EmailOutboxService | None = None,
+    ):
         self.repository = repository
         self.current_user = current_user
+        self.outbox = outbox or EmailOutboxService(
+            Repository(repository.session, EmailOutbox)
+        )
 
-    async def get_users(self, *, skip: int, limit: int) -> tuple[int, Sequence[User]]:
+    @traced()
+    async def get_users(
+        self, *, skip: int, limit: int, columns: Sequence[str] | None = None
+    ) -> tuple[int, Sequence[Any]]:
         """
         Gets a paginated list of users along with the total user count.
 
         :param skip: Number of users to skip
         :param limit: Maximum number of users to return
+        :param columns: Names of the columns to load; when given, the users are rows with only
+            these attributes instead of User entities
         :return: Tuple containing the total user count and a sequence of users
         :raises: DatabaseError if the database query fails
+        :raises ValueError: If a column is not a column of the user table
         """
         count = await self.repository.count()
-        users = await self.repository.find_all(skip, limit)
+        users = await self.repository.find_all(skip, limit, columns)
         return count, users
 
+    @traced()
+    async def get_users_page(
+        self,
+        *,
+        cursor: str | None,
+        limit: int,
+        columns: Sequence[str] | None = None,
+    ) -> CursorPage:
+        """
+        Gets the users after a cursor, in the order they were created.
+
+        :param cursor: `next_cursor` of the previous page, None for the first page
+        :param limit: Maximum number of users to return
+        :param columns: Names of the columns to load; when given, the users are rows with these
+            attributes instead of User entities
+        :return: The page of users with the cursor of the next page
+        :raises ValueError: If the cursor is malformed or a column is not a column of the user table
+        """
+        paginator = CursorPaginator(
+            self.repository,
+            select(User),
+            order_by="created_at",
+            limit=limit,
+            columns=columns,
+        )
+        return await paginator.page(cursor)
+
+    @traced()
+    @coalesce(adopt=_merge_user, can_share=_session_is_clean)
     async def get_user_by_id(self, *, user_id: UUID) -> User:
         """
         Fetches user information based on the provided user ID.
@@ -132,6 +195,40 @@ class UserService:
             raise error
         return user
 
+    @traced()
+    async def get_users_by_ids(self, *, user_ids: Collection[UUID]) -> Sequence[User]:
+        """
+        Fetches the users with the given IDs in a single query. IDs of missing users are ignored.
+
+        :param user_ids: Unique identifiers of the users to fetch
+        :return: Sequence of the found users, in no particular order
+        """
+        if not user_ids:
+            return []
+        query = select(User).where(User.id.in_(user_ids))
+        result = await self.repository.execute_query(query)
+        return result.scalars().all()
+
+    @traced()
+    async def lookup_users(
+        self, *, user_ids: Collection[UUID], emails: Collection[str]
+    ) -> Sequence[User]:
+        """
+        Fetches the users with any of the given IDs or emails in a single query. Missing users are
+        ignored.
+
+        :param user_ids: Unique identifiers of the users to fetch
+        :param emails: Email addresses of the users to fetch
+        :return: Sequence of the found users, in no particular order
+        """
+        if not user_ids and not emails:
+            return []
+        query = select(User).where(or_(User.id.in_(user_ids), User.email.in_(emails)))
+        result = await self.repository.execute_query(query)
+        return result.scalars().all()
+
+    @traced()
+    @coalesce(adopt=_merge_user, can_share=_session_is_clean)
     async def get_user_by_email(self, *, email: str) -> User:
         """
         Fetches a user by their email address.
@@ -148,6 +245,22 @@ class UserService:
             raise error
         return user
 
+    @traced()
+    @coalesce(can_share=_session_is_clean)
+    async def get_users_version(self) -> str:
+        """
+        Fetches a version of the user table with a single aggregate query. It changes whenever a
+        user is created, updated or deleted, so it can be used to build ETags for user lists.
+
+        :return: The version as a string of the user count and the latest `updated_at`.
+        """
+        query = select(func.count(), func.max(User.updated_at)).select_from(User)
+        result = await self.repository.execute_query(query)
+        count, updated_at = result.one()
+        return f"{count}|{updated_at}"
+
+    @traced()
+    @coalesce(can_share=_session_is_clean)
     async def get_users_count(self) -> int:
         """
         Counts the number of users in the repository.
@@ -156,6 +269,8 @@ class UserService:
         """
         return await self.repository.count()
 
+    @traced()
+    @coalesce(can_share=_session_is_clean)
     async def get_active_users_count(self) -> int:
         """
         Fetches the active users count from the database.
@@ -170,6 +285,8 @@ class UserService:
         )
         return await self.repository.count(query)
 
+    @traced()
+    @coalesce(can_share=_session_is_clean)
     async def get_admin_users_count(self) -> int:
         """
         Fetches the number of users with an 'ADMIN' role asynchronously.
@@ -182,6 +299,24 @@ class UserService:
         )
         return await self.repository.count(query)
 
+    @traced()
+    @coalesce(can_share=_session_is_clean)
+    async def get_user_counts(self) -> dict[str, int]:
+        """
+        Counts all, active and admin users with a single aggregate query.
+
+        :return: Dictionary with the "total", "active" and "admin" user counts.
+        """
+        query = select(
+            func.count(),
+            func.count().filter(User.status == StatusEnum.ACTIVE),
+            func.count().filter(User.role == RoleEnum.ADMIN),
+        ).select_from(User)
+        result = await self.repository.execute_query(query)
+        total, active, admin = result.one()
+        return {"total": total, "active": active, "admin": admin}
+
+    @traced()
     async def create_user(self, *, create_dict: dict[str, Any]) -> User:
         """
         Creates a new user with the provided details.
@@ -200,30 +335,26 @@ class UserService:
         """
         create_dict.update(
             {
-                "hashed_password": get_password_hash(create_dict["password"]),
+                "hashed_password": await get_password_hash_async(
+                    create_dict["password"]
+                ),
                 "status": StatusEnum.ACTIVE,
             }
         )
+        # queue the welcome email so it is committed in the same transaction as the user
+        email = create_dict["email"]
+        email_data = generate_new_account_email(email_to=email, username=email)
+        await self.outbox.enqueue(email_to=email, email_data=email_data)
         try:
             user = await self.repository.create(create_dict)
         except IntegrityError as e:
             logger.info(f"error creating user: {e}")
             raise UserCreateError(create_dict["email"]) from e
 
-        if settings.EMAIL_ENABLED and user.email:  # pragma: no cover
-            email_data = generate_new_account_email(
-                email_to=user.email,
-                username=user.email,
-                password=create_dict["password"],
-            )
-            send_email(
-                email_to=user.email,
-                subject=email_data.subject,
-                html_content=email_data.html_content,
-            )
-
+        data_versions.bump(User.__tablename__)
         return user
 
+    @traced()
     async def update_user(
         self, *, user_id: UUID, update_dict: dict[str, Any]
     ) -> User | None:
@@ -240,13 +371,102 @@ class UserService:
         """
         password = update_dict.get("password")
         if password:
-            update_dict.update({"hashed_password": get_password_hash(password)})
+            update_dict.update(
+                {"hashed_password": await get_password_hash_async(password)}
+            )
         try:
-            return await self.repository.update(user_id, update_dict)
+            user = await self.repository.update(user_id, update_dict)
         except IntegrityError as e:
             logger.info(f"error updating user: {e}")
             raise UserValueError(update_dict["email"]) from e
+        if user is not None:
+            data_versions.bump(User.__tablename__)
+        return user
+
+    @traced()
+    async def update_users(
+        self, *, updates: Sequence[dict[str, Any]]
+    ) -> dict[UUID, User | UserNotFoundError | UserValueError]:
+        """
+        Updates many users in one transaction, each from a dictionary like the `update_dict` of
+        `update_user` with the "id" of the user.
+
+        Missing users and emails that would fail the unique constraint (an email of another user
+        or repeated in the batch) are checked with one query up front and reported per user; the
+        other users are updated with a single executemany UPDATE.
+
+        :param updates: Dictionaries with the "id" and the fields to update of each user
+        :return: The updated User, or the error of the users that were not updated, by id
+        :raises UserValueError: If an id is repeated, or the update still violates a constraint,
+            e.g. because of a concurrent write; no user is updated then
+
+        Example usage:
+            results = await update_users(updates=[{"id": user_id, "full_name": "Jane Doe"}])
+        """
+        results: dict[UUID, User | UserNotFoundError | UserValueError] = {}
+        ids = [update["id"] for update in updates]
+        if len(set(ids)) != len(ids):
+            raise UserValueError("duplicate user ids")
+        emails = [update["email"] for update in updates if update.get("email")]
+        query = select(User.id, User.email).where(
+            or_(User.id.in_(ids), User.email.in_(emails))
+        )
+        rows = (await self.repository.execute_query(query)).all()
+        existing_ids = {row.id for row in rows}
+        email_owners = {row.email: row.id for row in rows}
+
+        rows_to_update = []
+        seen_emails = set()
+        for update in updates:
+            user_id, email = update["id"], update.get("email")
+            if user_id not in existing_ids:
+                results[user_id] = UserNotFoundError(user_id)
+            elif email and (
+                email in seen_emails or email_owners.get(email, user_id) != user_id
+            ):
+                results[user_id] = UserValueError(email)
+            else:
+                seen_emails.add(email)
+                row = dict(update)
+                if row.get("password"):
+                    row["hashed_password"] = await get_password_hash_async(
+                        row["password"]
+                    )
+                rows_to_update.append(row)
+
+        try:
+            await self.repository.update_many(rows_to_update)
+        except IntegrityError as e:
+            await self.repository.session.rollback()
+            logger.info(f"error updating users: {e}")
+            raise UserValueError(", ".join(emails)) from e
+
+        updated_ids = [row["id"] for row in rows_to_update]
+        if updated_ids:
+            query = (
+                select(User)
+                .where(User.id.in_(updated_ids))
+                .execution_options(populate_existing=True)
+            )
+            users = (await self.repository.execute_query(query)).scalars().all()
+            results.update({user.id: user for user in users})
+            data_versions.bump(User.__tablename__)
+        return results
+
+    @traced()
+    async def delete_users(self, *, user_ids: Collection[UUID]) -> set[UUID]:
+        """
+        Deletes many users with a single DELETE statement.
+
+        :param user_ids: Unique identifiers of the users to delete
+        :return: Identifiers of the users that existed and were deleted
+        """
+        deleted = await self.repository.delete_many(user_ids)
+        if deleted:
+            data_versions.bump(User.__tablename__)
+        return deleted
 
+    @traced()
     async def delete_user(self, *, user_id: UUID) -> None:
         """
         Deletes a user from the repository using the given user_id.
@@ -261,7 +481,9 @@ class UserService:
             error = UserNotFoundError(user_id)
             logger.info(f"error deleting user: {error}")
             raise error
+        data_versions.bump(User.__tablename__)
 
+    @traced()
     async def authenticate(self, *, email: str, password: str) -> User | None:
         """
         Authenticate a user by their email and password.
@@ -287,14 +509,15 @@ class UserService:
             user = await self.get_user_by_email(email=email)
         except UserNotFoundError:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await verify_password_async(password, user.hashed_password):
             logger.info(f"error verifying password for user: {user.id}")
             return None
         return user
 
+    @traced()
     async def recover_password(self, email: str) -> None:
         """
-        Sends a password recovery email to the user associated with the provided email address.
+        Queues a password recovery email to the user associated with the provided email address.
 
         :param email: The email address of the user requesting password recovery.
         :return: None
@@ -303,9 +526,9 @@ class UserService:
         1. Retrieves the user object for the given email.
         2. Generates a password reset token.
         3. Constructs the content needed for the password reset email.
-        4. Sends the password reset email to the user's email address.
+        4. Queues the password reset email in the outbox; it is sent by the email dispatcher.
 
-        Raises an exception if the user with the specified email does not exist or sending the email fails.
+        Raises an exception if the user with the specified email does not exist.
         """
         user = await self.get_user_by_email(email=email)
 
@@ -313,8 +536,6 @@ class UserService:
         email_data = generate_reset_password_email(
             email_to=user.email, email=email, token=password_reset_token
         )
-        send_email(
-            email_to=user.email,
-            subject=email_data.subject,
-            html_content=email_data.html_content,
+        await self.outbox.enqueue(
+            email_to=user.email, email_data=email_data, commit=True
         )
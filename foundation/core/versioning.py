@@ -0,0 +1,51 @@
+from collections import defaultdict
+
+"""
+This module keeps a version counter per table that is bumped on every write through the services.
+
+Caches of rendered data include the version of the tables the data came from in their keys, so a
+write makes every cached entry for that table unreachable without tracking which entries it affects.
+
+The counters are process-local. Writes made by other workers are not seen, so caches keyed on a
+version must also expire their entries after a short TTL.
+
+Usage:
+    version = data_versions.get("user")
+    ...
+    data_versions.bump("user")
+"""
+
+
+class DataVersions:
+    """
+    Write counters for database tables.
+
+    Example usage:
+
+        versions = DataVersions()
+        versions.bump("user")
+        assert versions.get("user") == 1
+    """
+
+    def __init__(self):
+        self._versions: defaultdict[str, int] = defaultdict(int)
+
+    def get(self, table: str) -> int:
+        """
+        :param table: Name of the table.
+        :return: The current version of the table, 0 if it was never written.
+        """
+        return self._versions[table]
+
+    def bump(self, table: str) -> int:
+        """
+        Records a write to a table.
+
+        :param table: Name of the table.
+        :return: The new version of the table.
+        """
+        self._versions[table] += 1
+        return self._versions[table]
+
+
+data_versions = DataVersions()
@@ -0,0 +1,15 @@
+from foundation.middleware.compression import CompressionMiddleware
+from foundation.middleware.metrics import MetricsMiddleware
+from foundation.middleware.profiling import ProfilingMiddleware
+from foundation.middleware.scoped import PathScopedMiddleware
+from foundation.middleware.timing import ServerTimingMiddleware
+from foundation.middleware.tracing import TracingMiddleware
+
+__all__ = [
+    "CompressionMiddleware",
+    "MetricsMiddleware",
+    "PathScopedMiddleware",
+    "ProfilingMiddleware",
+    "ServerTimingMiddleware",
+    "TracingMiddleware",
+]
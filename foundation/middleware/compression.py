@@ -0,0 +1,244 @@
+import zlib
+from typing import Protocol, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from foundation.core.config import settings
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover
+    brotli = None
+
+"""
+This module provides response compression for the HTML pages, fragments and JSON API responses.
+
+The body is compressed with brotli if the client accepts it and the optional `brotli` package is
+installed, with gzip otherwise. Only responses with a content type on the allowlist and of at
+least `minimum_size` bytes are compressed, and responses that already have a `Content-Encoding`
+(e.g. the precompressed static assets) are passed through untouched.
+
+Streaming responses are buffered only until `minimum_size` bytes have arrived. After that every
+chunk is compressed and flushed as it arrives, so a streamed page still reaches the browser
+progressively.
+
+Usage:
+    app.add_middleware(CompressionMiddleware, minimum_size=500, gzip_level=6)
+"""
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """
+    Parses an Accept-Encoding header.
+
+    :param accept_encoding: Value of the header.
+    :return: Names of the accepted encodings, without the ones refused with `q=0`.
+    """
+    encodings = set()
+    for item in accept_encoding.split(","):
+        name, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            encodings.add(name.lower())
+    return encodings
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        ...
+
+    def flush(self) -> bytes:
+        ...
+
+    def finish(self) -> bytes:
+        ...
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        # wbits 16 + MAX_WBITS writes the gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)  # type: ignore
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing response bodies with brotli or gzip.
+
+    :param app: The ASGI app to wrap.
+    :param minimum_size: Bodies smaller than this many bytes are sent uncompressed.
+    :param gzip_level: Compression level of gzip, 1 (fastest) to 9 (smallest).
+    :param brotli_quality: Compression quality of brotli, 0 (fastest) to 11 (smallest).
+    :param content_types: Media types that are compressed.
+
+    Example usage:
+
+        app.add_middleware(CompressionMiddleware)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int | None = None,
+        gzip_level: int | None = None,
+        brotli_quality: int | None = None,
+        content_types: Sequence[str] | None = None,
+    ):
+        self.app = app
+        self.minimum_size = (
+            minimum_size
+            if minimum_size is not None
+            else settings.COMPRESSION_MINIMUM_SIZE
+        )
+        self.gzip_level = gzip_level or settings.COMPRESSION_GZIP_LEVEL
+        self.brotli_quality = (
+            brotli_quality
+            if brotli_quality is not None
+            else settings.COMPRESSION_BROTLI_QUALITY
+        )
+        self.content_types = frozenset(
+            content_types or settings.COMPRESSION_CONTENT_TYPES
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def choose_encoding(self, accept_encoding: str) -> str | None:
+        """
+        Picks the response encoding for an Accept-Encoding header.
+
+        :param accept_encoding: Value of the request header.
+        :return: "br", "gzip" or None if the response is sent uncompressed.
+        """
+        accepted = accepted_encodings(accept_encoding)
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def should_compress(self, status: int, headers: Headers) -> bool:
+        """
+        Returns whether a response can be compressed, based on its status and headers.
+        """
+        if status < 200 or status in (204, 304) or "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return media_type in self.content_types
+
+    def create_compressor(self, encoding: str) -> Compressor:
+        if encoding == "br":
+            return BrotliCompressor(self.brotli_quality)
+        return GzipCompressor(self.gzip_level)
+
+
+class CompressionResponder:
+    """
+    Compresses the messages of one response before passing them to `send`.
+
+    The start message is held back until the first body chunks decide whether the response is
+    compressed, since compressing changes its `Content-Length` and `Content-Encoding` headers.
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Message | None = None
+        self.passthrough = False
+        self.compressor: Compressor | None = None
+        self.buffer = b""
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            status, headers = message["status"], Headers(raw=message["headers"])
+            self.passthrough = not self.middleware.should_compress(status, headers)
+            if self.passthrough:
+                await self._send(message)
+            return
+        if self.passthrough or message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            self.buffer += body
+            if len(self.buffer) < self.middleware.minimum_size:
+                if more_body:
+                    return
+                # the whole body is too small to be worth compressing
+                self.passthrough = True
+                await self._send(self.start)  # type: ignore
+                await self._send({"type": "http.response.body", "body": self.buffer})
+                return
+            body, self.buffer = self.buffer, b""
+            self.compressor = self.middleware.create_compressor(self.encoding)
+            data = self._compress(body, more_body)
+            await self._send(self._compressed_start(data, more_body))
+        else:
+            data = self._compress(body, more_body)
+        await self._send(
+            {"type": "http.response.body", "body": data, "more_body": more_body}
+        )
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        assert self.compressor is not None
+        data = self.compressor.compress(body)
+        return data + (
+            self.compressor.flush() if more_body else self.compressor.finish()
+        )
+
+    def _compressed_start(self, data: bytes, more_body: bool) -> Message:
+        assert self.start is not None
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        del headers["content-length"]
+        if not more_body:
+            headers["content-length"] = str(len(data))
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # the compressed body is no longer byte for byte identical to the original
+            headers["etag"] = f"W/{etag}"
+        return {**self.start, "headers": headers.raw}
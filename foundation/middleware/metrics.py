@@ -0,0 +1,93 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from foundation.core.metrics import (
+    RequestStats,
+    metrics,
+    request_scope,
+    request_stats,
+)
+
+"""
+This module records the latency and the database work of every request.
+
+Requests are labeled with the path template of the route that handled them (e.g.
+`/api/users/{user_id}`), never with the raw path, so the number of series stays bounded. Requests
+no route matched are labeled `unmatched`.
+
+Usage:
+    app.add_middleware(MetricsMiddleware)
+"""
+
+REQUEST_DURATION = metrics.histogram(
+    "http_request_duration_seconds",
+    "Time to handle a request, until the last byte of the response is sent.",
+    ["method", "route", "status"],
+)
+REQUEST_DB_QUERIES = metrics.histogram(
+    "http_request_db_queries",
+    "Database queries executed per request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUEST_DB_DURATION = metrics.histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing database queries per request.",
+    ["route"],
+)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    :param scope: Scope of a handled request.
+    :return: Path template of the route or mount that handled the request, or "unmatched".
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware observing the duration and the database queries of each HTTP request.
+
+    :param app: The ASGI app to wrap.
+
+    Example usage:
+
+        app.add_middleware(MetricsMiddleware)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        scope_token = request_scope.set(scope)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            request_stats.reset(token)
+            request_scope.reset(scope_token)
+            route = route_template(scope)
+            REQUEST_DURATION.observe(
+                elapsed, method=scope["method"], route=route, status=status
+            )
+            REQUEST_DB_QUERIES.observe(stats.queries, route=route)
+            REQUEST_DB_DURATION.observe(stats.db_seconds, route=route)
@@ -0,0 +1,174 @@
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from fastapi_jwt.jwt_backends.abstract_backend import BackendException
+from loguru import logger
+from starlette.datastructures import MutableHeaders, QueryParams
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from foundation.core.config import settings
+from foundation.core.db import async_sessionmaker
+from foundation.core.profiling import (
+    Profile,
+    SamplingProfiler,
+    new_profile_id,
+    profile_store,
+)
+from foundation.core.security import access_token_security
+from foundation.core.users.models import RoleEnum, StatusEnum, User
+
+"""
+This module profiles single requests on demand, for admins.
+
+A request with the `X-Profile` header or the `profile` query parameter, e.g. `/users?profile=1`,
+is run under the sampling profiler of `foundation.core.profiling` if it carries the access token
+of an active admin, in the bearer header or the access token cookie. The token is checked before
+the profiler starts, so other clients can not take the profiling slot of the worker. The profile
+is saved to the profile store and its id is sent in the `X-Profile-Id` response header; the
+profiles are browsable at `/admin/profiles`.
+
+Each worker profiles one request at a time, other requests asking for a profile run unprofiled, so
+the profiler costs nothing to requests that do not ask for it and little to those that do.
+
+Usage:
+    app.add_middleware(ProfilingMiddleware)
+"""
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_PARAM = "profile"
+
+
+def profile_requested(scope: Scope) -> bool:
+    """
+    :param scope: Scope of a request.
+    :return: True if the request asks to be profiled.
+    """
+    if any(name == PROFILE_HEADER for name, _ in scope["headers"]):
+        return True
+    query_string = scope.get("query_string", b"")
+    # only parse the query strings that may have the parameter
+    return PROFILE_QUERY_PARAM.encode() in query_string and (
+        PROFILE_QUERY_PARAM in QueryParams(query_string)
+    )
+
+
+def access_token(scope: Scope) -> str | None:
+    """
+    :param scope: Scope of a request.
+    :return: The access token of the bearer header, else of the access token cookie.
+    """
+    connection = HTTPConnection(scope)
+    scheme, _, token = connection.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return token
+    return connection.cookies.get("access_token_cookie")
+
+
+async def is_admin_request(scope: Scope) -> bool:
+    """
+    Checks that a request is made by an active admin, from its access token.
+
+    :param scope: Scope of a request.
+    :return: True if the access token is valid and belongs to an active admin.
+    """
+    token = access_token(scope)
+    if not token:
+        return False
+    try:
+        payload = access_token_security.jwt_backend.decode(token, settings.JWT_SECRET)
+    except BackendException:
+        return False
+    if not payload or payload.get("type") != "access":
+        return False
+    try:
+        user_id = uuid.UUID(str(payload["subject"]["id"]))
+    except (KeyError, TypeError, ValueError):
+        return False
+    try:
+        async with async_sessionmaker() as session:
+            user = await session.get(User, user_id)
+    except Exception as e:
+        logger.warning(f"unable to check the profiling access of user {user_id}: {e}")
+        return False
+    return (
+        user is not None
+        and user.status == StatusEnum.ACTIVE
+        and user.role == RoleEnum.ADMIN
+    )
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware running the requests of admins asking to be profiled under the sampling
+    profiler.
+
+    :param app: The ASGI app to wrap.
+    :param authorize: Checks that a request may be profiled, before the profiler starts. Defaults
+        to `is_admin_request`.
+
+    Example usage:
+
+        app.add_middleware(ProfilingMiddleware)
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        authorize: Callable[[Scope], Awaitable[bool]] = is_admin_request,
+    ):
+        self.app = app
+        self.authorize = authorize
+        self.profiling = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.PROFILING_ENABLED
+            or self.profiling
+            or not profile_requested(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+        # another request may have taken the slot while the access was checked
+        if not await self.authorize(scope) or self.profiling:
+            await self.app(scope, receive, send)
+            return
+
+        self.profiling = True
+        profile_id = new_profile_id()
+        status = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        profiler = SamplingProfiler(asyncio.current_task())  # type: ignore[arg-type]
+        started_at = time.time()
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            samples = profiler.stop()
+            duration = time.perf_counter() - start
+            self.profiling = False
+            profile = Profile(
+                id=profile_id,
+                method=scope["method"],
+                path=scope["path"],
+                started_at=started_at,
+                duration=duration,
+                interval=profiler.interval,
+                status=status,
+                samples=dict(samples),
+            )
+            try:
+                await asyncio.to_thread(profile_store.save, profile)
+            except OSError as e:
+                logger.error(f"unable to save profile {profile.id}: {e}")
@@ -0,0 +1,74 @@
+from typing import Any, Sequence
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+"""
+This module lets a middleware skip the requests it is not needed for.
+
+The session and CSRF middleware only serve the HTML routes, but as app middleware they would run
+for every request: each bearer-token API call and static file would verify and re-sign the
+session cookie sent along by the browser. Wrapped in `PathScopedMiddleware`, requests under the
+excluded path prefixes go straight to the app.
+
+Usage:
+    app.add_middleware(
+        PathScopedMiddleware,
+        middleware=SessionMiddleware,
+        exclude=["/api", "/static"],
+        secret_key=settings.JWT_SECRET,
+    )
+"""
+
+
+class PathScopedMiddleware:
+    """
+    Applies a middleware only to requests outside of the excluded path prefixes.
+
+    A prefix matches the path itself and everything below it, e.g. "/api" matches "/api" and
+    "/api/users" but not "/apidocs".
+
+    :param app: The ASGI app to wrap.
+    :param middleware: The middleware class to apply.
+    :param exclude: Path prefixes of the requests that skip the middleware.
+    :param options: Arguments of the middleware class.
+
+    Example usage:
+
+        app.add_middleware(
+            PathScopedMiddleware,
+            middleware=CSRFProtectMiddleware,
+            exclude=["/api"],
+            csrf_secret=settings.CSRF_SECRET,
+        )
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        middleware: type,
+        *,
+        exclude: Sequence[str],
+        **options: Any,
+    ):
+        self.app = app
+        self.scoped = middleware(app, **options)
+        self.exclude = tuple(prefix.rstrip("/") for prefix in exclude)
+
+    def is_excluded(self, path: str) -> bool:
+        """
+        Returns whether requests to a path skip the middleware.
+
+        :param path: The request path.
+        :return: True if the path is under one of the excluded prefixes.
+        """
+        return any(
+            path == prefix or path.startswith(prefix + "/") for prefix in self.exclude
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket") and not self.is_excluded(
+            scope["path"]
+        ):
+            await self.scoped(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
@@ -0,0 +1,63 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from foundation.core.config import settings
+from foundation.core.timing import ServerTiming, server_timing
+
+"""
+This module sends the `Server-Timing` header, so the browser devtools show where the time of a
+request went: JWT validation, loading the current user, database statements, rendering and
+password hashing (see `foundation.core.timing`).
+
+The header is sent on every response while `settings.SERVER_TIMING_ENABLED` is on, and otherwise
+on the responses to admins only, since the breakdown tells e.g. whether an email is registered.
+
+Usage:
+    app.add_middleware(ServerTimingMiddleware)
+"""
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware collecting the timing spans of each HTTP request and sending them in the
+    `Server-Timing` header.
+
+    The header is added when the response starts, so it covers the work done before the first byte
+    and, for streamed responses, not the time spent streaming.
+
+    :param app: The ASGI app to wrap.
+
+    Example usage:
+
+        app.add_middleware(ServerTimingMiddleware)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timing = ServerTiming()
+        token = server_timing.set(timing)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and (
+                settings.SERVER_TIMING_ENABLED or timing.exposed
+            ):
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    timing.header_value(total=time.perf_counter() - start),
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            server_timing.reset(token)
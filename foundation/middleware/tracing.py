@@ -0,0 +1,84 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from foundation.core.config import settings
+from foundation.core.tracing import current_span, format_traceparent, tracer
+from foundation.middleware.metrics import route_template
+
+"""
+This module traces the requests, see `foundation.core.tracing`.
+
+Every request gets a root span, continuing the trace of the caller when the request has a W3C
+`traceparent` header. The root span is named after the route that handled the request, e.g.
+`GET /users/{user_id}`. The responses of the traced requests carry a `traceresponse` header, with
+the id of the trace to look up at `/admin/traces`.
+
+Usage:
+    app.add_middleware(TracingMiddleware)
+"""
+
+
+def is_excluded(path: str) -> bool:
+    """
+    :param path: Path of a request.
+    :return: True if the path is under one of the `TRACING_EXCLUDED_PATHS`.
+    """
+    return any(
+        path == prefix or path.startswith(prefix.rstrip("/") + "/")
+        for prefix in settings.TRACING_EXCLUDED_PATHS
+    )
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware recording the root span of each HTTP request.
+
+    :param app: The ASGI app to wrap.
+
+    Example usage:
+
+        app.add_middleware(TracingMiddleware)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.TRACING_ENABLED
+            or is_excluded(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        root = tracer.start_trace(
+            scope["method"],
+            traceparent=Headers(scope=scope).get("traceparent"),
+            attributes={"http.method": scope["method"], "http.target": scope["path"]},
+        )
+        token = current_span.set(root)
+        sampled = root.context.sampled
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+                if message["status"] >= 500:
+                    root.status = "error"
+                if sampled:
+                    MutableHeaders(scope=message).append(
+                        "traceresponse", format_traceparent(root.context)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as e:
+            root.record_error(e)
+            raise
+        finally:
+            route = route_template(scope)
+            root.name = f"{scope['method']} {route}"
+            root.set_attribute("http.route", route)
+            current_span.reset(token)
+            tracer.end_trace(root)
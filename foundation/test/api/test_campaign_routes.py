@@ -0,0 +1,106 @@
+import uuid
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from foundation.app import app
+from foundation.core.campaigns import CampaignStatusEnum, EmailCampaign
+from foundation.core.campaigns.deps import get_campaign_service
+from foundation.core.campaigns.schemas import CampaignPublic
+from foundation.core.campaigns.services import EmailCampaignService
+from foundation.core.repository import Repository
+from foundation.core.users import User
+from foundation.test.utils import get_auth_token_headers
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def campaign_client(client: AsyncClient, session) -> AsyncClient:
+    app.dependency_overrides[get_campaign_service] = lambda: EmailCampaignService(
+        Repository(session, EmailCampaign)
+    )
+    yield client
+    app.dependency_overrides.pop(get_campaign_service)
+
+
+async def test_create_campaign(
+    campaign_client: AsyncClient, superuser_auth_token_headers
+) -> None:
+    data = {
+        "subject": "Maintenance",
+        "html_template": "<p>Hi {{ recipient.full_name }}</p>",
+        "segment_status": "active",
+    }
+    r = await campaign_client.post(
+        "/api/campaigns/", json=data, headers=superuser_auth_token_headers
+    )
+    assert r.status_code == 201
+    campaign = CampaignPublic.model_validate(r.json())
+    assert campaign.status == CampaignStatusEnum.PENDING
+    assert campaign.segment_status == "active"
+    assert campaign.segment_role is None
+
+    r = await campaign_client.get(
+        f"/api/campaigns/{campaign.id}", headers=superuser_auth_token_headers
+    )
+    assert r.status_code == 200
+
+    r = await campaign_client.post(
+        f"/api/campaigns/{campaign.id}/cancel", headers=superuser_auth_token_headers
+    )
+    assert r.status_code == 200
+    assert r.json()["status"] == CampaignStatusEnum.CANCELLED
+
+
+async def test_create_campaign_invalid_template(
+    campaign_client: AsyncClient, superuser_auth_token_headers
+) -> None:
+    data = {"subject": "Maintenance", "html_template": "<p>{{ recipient.</p>"}
+    r = await campaign_client.post(
+        "/api/campaigns/", json=data, headers=superuser_auth_token_headers
+    )
+    assert r.status_code == 422
+
+    data = {"subject": "Maintenance", "html_template": "<p>{{ ''.__class__ }}</p>"}
+    r = await campaign_client.post(
+        "/api/campaigns/", json=data, headers=superuser_auth_token_headers
+    )
+    assert r.status_code == 422
+    assert "Unsafe template" in r.text
+
+    # errors raised rendering the template are invalid templates too, not server errors
+    for html_template in ["<p>{{ recipient.x.y }}</p>", "<p>{{ 1/0 }}</p>"]:
+        data = {"subject": "Maintenance", "html_template": html_template}
+        r = await campaign_client.post(
+            "/api/campaigns/", json=data, headers=superuser_auth_token_headers
+        )
+        assert r.status_code == 422
+        assert "Invalid template" in r.text
+
+
+async def test_get_campaign_not_found_404(
+    campaign_client: AsyncClient, superuser_auth_token_headers
+) -> None:
+    r = await campaign_client.get(
+        f"/api/campaigns/{uuid.uuid4()}", headers=superuser_auth_token_headers
+    )
+    assert r.status_code == 404
+
+    r = await campaign_client.post(
+        f"/api/campaigns/{uuid.uuid4()}/cancel", headers=superuser_auth_token_headers
+    )
+    assert r.status_code == 404
+
+
+async def test_create_campaign_not_admin_403(
+    campaign_client: AsyncClient, sample_user: User, sample_user_password: str
+) -> None:
+    headers = await get_auth_token_headers(
+        campaign_client,
+        {"username": sample_user.email, "password": sample_user_password},
+    )
+    data = {"subject": "Maintenance", "html_template": "<p>hi</p>"}
+    r = await campaign_client.post("/api/campaigns/", json=data, headers=headers)
+    assert r.status_code == 403
@@ -0,0 +1,19 @@
+import pytest
+from httpx import AsyncClient
+
+from foundation.core.config import settings
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_readyz_checks_the_database(client: AsyncClient, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "READINESS_CACHE_SECONDS", 0)
+
+    r = await client.get("/readyz")
+
+    assert r.status_code == 200
+    checks = r.json()["checks"]
+    assert checks["database"]["ok"] is True
+    assert checks["pool"]["ok"] is True
+    # the outbox is shared by the workers, its lag is a metric and not a readiness check
+    assert "email_outbox" not in checks
@@ -0,0 +1,52 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from foundation.app import app
+from foundation.core.config import settings
+from foundation.core.deps import get_async_session
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def metrics_client(client: AsyncClient, session) -> AsyncClient:
+    app.dependency_overrides[get_async_session] = lambda: session
+    yield client
+    app.dependency_overrides.pop(get_async_session)
+
+
+async def test_metrics_from_allowed_network(
+    metrics_client: AsyncClient, monkeypatch
+) -> None:
+    # the test client connects from 127.0.0.1
+    monkeypatch.setattr(settings, "METRICS_ALLOWED_NETWORKS", ["127.0.0.0/8"])
+    await metrics_client.get("/api/users/", params={"limit": 1})
+
+    r = await metrics_client.get("/metrics")
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in r.text
+    assert 'route="/api/users/"' in r.text
+    assert "email_outbox_pending 0" in r.text
+    assert "email_outbox_lag_seconds 0" in r.text
+
+
+async def test_metrics_not_allowed_by_default(metrics_client: AsyncClient) -> None:
+    assert settings.METRICS_ALLOWED_NETWORKS == []
+
+    r = await metrics_client.get("/metrics")
+    assert r.status_code == 403
+
+
+async def test_metrics_requires_admin_outside_allowed_networks(
+    metrics_client: AsyncClient, superuser_auth_token_headers, monkeypatch
+) -> None:
+    monkeypatch.setattr(settings, "METRICS_ALLOWED_NETWORKS", ["10.0.0.0/8"])
+
+    r = await metrics_client.get("/metrics")
+    assert r.status_code == 403
+
+    r = await metrics_client.get("/metrics", headers=superuser_auth_token_headers)
+    assert r.status_code == 200
@@ -0,0 +1,57 @@
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from foundation.core.config import settings
+from foundation.core.users import User
+from foundation.test.utils import get_auth_token
+
+pytestmark = pytest.mark.asyncio
+
+
+async def login_cookies(
+    client: AsyncClient, username: str, password: str
+) -> dict[str, str]:
+    token = await get_auth_token(client, {"username": username, "password": password})
+    return {"access_token_cookie": token.access_token}
+
+
+@pytest_asyncio.fixture
+async def superuser_cookies(client: AsyncClient) -> dict[str, str]:
+    return await login_cookies(
+        client, settings.SUPERUSER_EMAIL, settings.SUPERUSER_PASSWORD
+    )
+
+
+async def test_users_list(client: AsyncClient, superuser_cookies) -> None:
+    r = await client.get("/users/list", cookies=superuser_cookies)
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert settings.SUPERUSER_EMAIL in r.text
+
+    r = await client.get(
+        "/users/list", cookies=superuser_cookies, headers={"If-None-Match": etag}
+    )
+    assert r.status_code == 304
+
+
+async def test_user_view(
+    client: AsyncClient, superuser_cookies, sample_user: User, sample_user_password
+) -> None:
+    r = await client.get(f"/users/{sample_user.id}", cookies=superuser_cookies)
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert sample_user.email in r.text
+
+    r = await client.get(
+        f"/users/{sample_user.id}",
+        cookies=superuser_cookies,
+        headers={"If-None-Match": etag},
+    )
+    assert r.status_code == 304
+
+    # the page differs for the owner, so does its ETag
+    owner_cookies = await login_cookies(client, sample_user.email, sample_user_password)
+    r = await client.get(f"/users/{sample_user.id}", cookies=owner_cookies)
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
@@ -143,6 +143,118 @@ async def test_get_users(
     assert new_user_found
 
 
+async def test_get_users_fields(
+    client: AsyncClient, superuser_auth_token_headers
+) -> None:
+    r = await client.get(
+        "/api/users/?fields=id,email", headers=superuser_auth_token_headers
+    )
+    assert r.status_code == 200
+    users = r.json()
+    assert users["count"] >= 1
+    assert all(set(item) == {"id", "email"} for item in users["data"])
+
+    r = await client.get(
+        "/api/users/?fields=id,hashed_password", headers=superuser_auth_token_headers
+    )
+    assert r.status_code == 400
+
+
+async def test_get_users_cursor(
+    client: AsyncClient, superuser_auth_token_headers, user_repository
+) -> None:
+    total = await user_repository.count()
+    emails = []
+    r = await client.get(
+        "/api/users/cursor?limit=1&fields=email", headers=superuser_auth_token_headers
+    )
+    while True:
+        assert r.status_code == 200
+        page = r.json()
+        assert "count" not in page
+        emails.extend(item["email"] for item in page["data"])
+        if not page["has_more"]:
+            assert page["next_cursor"] is None
+            break
+        r = await client.get(
+            "/api/users/cursor",
+            params={"limit": 1, "fields": "email", "cursor": page["next_cursor"]},
+            headers=superuser_auth_token_headers,
+        )
+    assert len(emails) == len(set(emails)) == total
+
+
+async def test_get_users_cursor_invalid(
+    client: AsyncClient, superuser_auth_token_headers
+) -> None:
+    r = await client.get(
+        "/api/users/cursor?cursor=nope", headers=superuser_auth_token_headers
+    )
+    assert r.status_code == 400
+    r = await client.get(
+        "/api/users/cursor?limit=1000000", headers=superuser_auth_token_headers
+    )
+    assert r.status_code == 422
+
+
+async def test_get_users_not_modified(
+    client: AsyncClient, superuser_auth_token_headers, user_repository: Repository[User]
+) -> None:
+    r = await client.get("/api/users/", headers=superuser_auth_token_headers)
+    etag = r.headers["etag"]
+
+    r = await client.get(
+        "/api/users/",
+        headers={**superuser_auth_token_headers, "If-None-Match": etag},
+    )
+    assert r.status_code == 304
+    assert r.content == b""
+
+    # a new user changes the version of the list
+    await user_repository.create(
+        {
+            "full_name": "New user",
+            "email": random_email(),
+            "hashed_password": random_lower_string(),
+        }
+    )
+    r = await client.get(
+        "/api/users/",
+        headers={**superuser_auth_token_headers, "If-None-Match": etag},
+    )
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+
+
+async def test_get_user_not_modified(
+    client: AsyncClient, superuser_auth_token_headers, sample_user: User
+) -> None:
+    r = await client.get(
+        f"/api/users/{sample_user.id}", headers=superuser_auth_token_headers
+    )
+    etag = r.headers["etag"]
+
+    r = await client.get(
+        f"/api/users/{sample_user.id}",
+        headers={**superuser_auth_token_headers, "If-None-Match": etag},
+    )
+    assert r.status_code == 304
+
+    r = await client.patch(
+        f"/api/users/{sample_user.id}",
+        headers=superuser_auth_token_headers,
+        json={"full_name": "Jane Doe", "email": sample_user.email, "password": None},
+    )
+    assert r.status_code == 200
+
+    r = await client.get(
+        f"/api/users/{sample_user.id}",
+        headers={**superuser_auth_token_headers, "If-None-Match": etag},
+    )
+    assert r.status_code == 200
+    assert r.json()["full_name"] == "Jane Doe"
+
+
 async def test_get_users_401(client: AsyncClient) -> None:
     r = await client.get("/api/users/", headers=None)
     assert r.is_error
@@ -510,3 +622,78 @@ async def test_superuser_cannot_delete_self(
     assert r.status_code == 200
     data = r.json()
     assert data.get("message") is not None
+
+
+async def test_lookup_users(
+    client: AsyncClient, superuser_auth_token_headers, sample_user: User
+) -> None:
+    missing_email = random_email()
+    r = await client.post(
+        "/api/users/lookup",
+        headers=superuser_auth_token_headers,
+        json={"ids": [str(sample_user.id)], "emails": [missing_email]},
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert [user["id"] for user in data["data"]] == [str(sample_user.id)]
+    assert data["missing"] == [missing_email]
+
+
+async def test_lookup_users_not_admin(
+    client: AsyncClient, sample_user_auth_token_headers
+) -> None:
+    r = await client.post(
+        "/api/users/lookup", headers=sample_user_auth_token_headers, json={"ids": []}
+    )
+    assert r.status_code == 403
+
+
+async def test_update_users(
+    client: AsyncClient, superuser_auth_token_headers, sample_user: User
+) -> None:
+    missing_id = str(uuid.uuid4())
+    r = await client.patch(
+        "/api/users/",
+        headers=superuser_auth_token_headers,
+        json=[
+            {
+                "id": str(sample_user.id),
+                "email": sample_user.email,
+                "full_name": "Bulk",
+            },
+            {"id": missing_id, "email": random_email(), "full_name": "Missing"},
+        ],
+    )
+    assert r.status_code == 200
+    first, second = r.json()["results"]
+    assert first["status"] == 200
+    assert first["user"]["full_name"] == "Bulk"
+    assert second == {
+        "id": missing_id,
+        "status": 404,
+        "detail": f"The user {missing_id} does not exist",
+        "user": None,
+    }
+
+
+async def test_delete_users(
+    client: AsyncClient, superuser_auth_token_headers, user_repository: Repository[User]
+) -> None:
+    user = await user_repository.create(
+        {
+            "full_name": "John Doe",
+            "email": random_email(),
+            "hashed_password": random_lower_string(),
+        }
+    )
+    missing_id = str(uuid.uuid4())
+    r = await client.request(
+        "DELETE",
+        "/api/users/",
+        headers=superuser_auth_token_headers,
+        json={"ids": [str(user.id), missing_id]},
+    )
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert [result["status"] for result in results] == [200, 404]
+    assert await user_repository.find_by_id(user.id) is None
@@ -1,4 +1,5 @@
 import asyncio
+import gc
 from typing import AsyncGenerator
 
 import pytest
@@ -10,10 +11,14 @@ from sqlalchemy.orm import sessionmaker
 
 from foundation.app import app
 from foundation.core import security
+from foundation.core.config import settings
 from foundation.core.db import engine
+from foundation.core.email import precompile_email_templates
+from foundation.core.loopmonitor import LoopMonitor
 from foundation.core.repository import Repository
 from foundation.core.users.deps import get_user_repository
 from foundation.core.users.models import User, StatusEnum
+from foundation.web.templates import precompile_templates
 from foundation.test.utils import (
     get_superuser_auth_token_headers,
     random_email,
@@ -45,6 +50,45 @@ AsyncTestingSessionLocal = sessionmaker(  # pyright: ignore [reportCallIssue]
 )
 
 
+@pytest_asyncio.fixture
+async def strict_loop_monitor() -> AsyncGenerator[LoopMonitor, None]:
+    """
+    Fails the test if it blocks the event loop for longer than `LOOP_MONITOR_BLOCK_THRESHOLD`.
+
+    Used by every async test with `LOOP_MONITOR_STRICT` on, see `make test-blocking`.
+    """
+    # a full garbage collection scans every object the session has accumulated so far and
+    # would block whichever test it lands in, collect and freeze them before the test instead
+    gc.collect()
+    gc.freeze()
+    monitor = LoopMonitor(strict=True)
+    monitor.start()
+    yield monitor
+    await monitor.stop()
+    monitor.check()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def precompiled_templates():
+    """
+    Compiles the templates once per session, like the app does when it starts, so the first
+    test rendering a template does not block the event loop compiling it.
+    """
+    precompile_email_templates()
+    precompile_templates()
+
+
+@pytest.fixture(autouse=True)
+def fail_on_blocking_calls(request):
+    # with LOOP_MONITOR_STRICT on, the async tests blocking the event loop fail
+    if (
+        settings.LOOP_MONITOR_STRICT
+        and request.node.get_closest_marker("asyncio")
+        and not request.node.get_closest_marker("blocking")
+    ):
+        request.getfixturevalue("strict_loop_monitor")
+
+
 @pytest.fixture(scope="session")
 def event_loop(request):
     """Create an instance of the default event loop for each test case."""
@@ -148,7 +192,9 @@ async def sample_user(user_repository: Repository[User], sample_user_password: s
         {
             "full_name": "John Doe",
             "email": random_email(),
-            "hashed_password": security.get_password_hash(sample_user_password),
+            "hashed_password": await security.get_password_hash_async(
+                sample_user_password
+            ),
             "status": StatusEnum.ACTIVE,
         }
     )
@@ -161,7 +207,9 @@ async def inactive_user(user_repository: Repository[User], sample_user_password:
         {
             "full_name": "Lazy John Doe",
             "email": random_email(),
-            "hashed_password": security.get_password_hash(sample_user_password),
+            "hashed_password": await security.get_password_hash_async(
+                sample_user_password
+            ),
             "status": StatusEnum.INACTIVE,
         }
     )
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+from sqlalchemy import delete, select
+
+from foundation.core import bootstrap as bootstrap_module
+from foundation.core.bootstrap import bootstrap, seed_admin_user, warm_pool
+from foundation.core.config import settings
+from foundation.core.db import async_sessionmaker, engine
+from foundation.core.users.models import RoleEnum, User
+from foundation.test.utils import random_email
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def hashes(monkeypatch) -> list[str]:
+    # passwords hashed by the bootstrap
+    hashed: list[str] = []
+
+    def get_password_hash(password: str) -> str:
+        hashed.append(password)
+        return "hashed"
+
+    monkeypatch.setattr(bootstrap_module, "get_password_hash", get_password_hash)
+    return hashed
+
+
+@pytest.fixture
+def admin_email(monkeypatch) -> str:
+    email = random_email()
+    monkeypatch.setattr(settings, "SUPERUSER_EMAIL", email)
+    return email
+
+
+async def test_seed_admin_user_creates_the_admin(session, admin_email, hashes):
+    assert await seed_admin_user(session) is True
+
+    user = await session.scalar(select(User).where(User.email == admin_email))
+    assert user.role == RoleEnum.ADMIN
+    assert user.hashed_password == "hashed"
+    assert hashes == [settings.SUPERUSER_PASSWORD]
+
+
+async def test_seed_admin_user_does_not_hash_if_the_admin_exists(
+    session, admin_email, hashes
+):
+    await seed_admin_user(session)
+
+    assert await seed_admin_user(session) is False
+    assert len(hashes) == 1
+
+
+async def test_concurrent_bootstraps_seed_once(admin_email, hashes):
+    try:
+        created = await asyncio.gather(*(bootstrap() for _ in range(4)))
+
+        assert sorted(created) == [False, False, False, True]
+        assert len(hashes) == 1
+    finally:
+        async with async_sessionmaker() as session, session.begin():
+            await session.execute(delete(User).where(User.email == admin_email))
+
+
+async def test_warm_pool_opens_connections():
+    assert await warm_pool(engine, connections=2) == 2
+    assert engine.pool.checkedin() >= 2  # pyright: ignore [reportAttributeAccessIssue]
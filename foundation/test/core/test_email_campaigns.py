@@ -0,0 +1,155 @@
+import smtplib
+
+import pytest
+import pytest_asyncio
+from jinja2.exceptions import SecurityError
+
+from foundation.core.campaigns import (
+    CampaignNotFoundError,
+    CampaignStatusEnum,
+    CampaignTemplate,
+    EmailCampaign,
+    EmailCampaignService,
+)
+from foundation.core.campaigns import runner as runner_module
+from foundation.core.campaigns.runner import CampaignRunner, TokenBucket
+from foundation.core.repository import Repository
+from foundation.core.users.models import StatusEnum
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def campaign_service(session) -> EmailCampaignService:
+    return EmailCampaignService(Repository(session, EmailCampaign))
+
+
+@pytest.fixture
+def sent_emails(monkeypatch) -> list[dict]:
+    sent = []
+
+    async def send_email_async(**kwargs):
+        sent.append(kwargs)
+        return True
+
+    monkeypatch.setattr(runner_module, "send_email_async", send_email_async)
+    return sent
+
+
+async def test_campaign_template_render():
+    template = CampaignTemplate(
+        "<p>{{ app_name }}: hi {{ recipient.full_name }} ({{ recipient.email }})</p>",
+        {"app_name": "Foundation"},
+    )
+    assert (
+        template.render(full_name="<b>Jane</b>", email="jane@example.com")
+        == "<p>Foundation: hi &lt;b&gt;Jane&lt;/b&gt; (jane@example.com)</p>"
+    )
+    assert template.render(full_name=None, email="a@example.com") == (
+        "<p>Foundation: hi  (a@example.com)</p>"
+    )
+
+
+async def test_campaign_template_is_sandboxed():
+    with pytest.raises(SecurityError):
+        CampaignTemplate("{{ ''.__class__ }}")
+    with pytest.raises(SecurityError):
+        CampaignTemplate("{{ ''.__class__.__mro__[1].__subclasses__() }}")
+    with pytest.raises(SecurityError):
+        CampaignTemplate(
+            "{{ app_name.format.__globals__ }}", {"app_name": "Foundation"}
+        )
+
+
+async def test_token_bucket_burst():
+    bucket = TokenBucket(rate=1000, burst=2)
+    for _ in range(5):
+        await bucket.acquire()
+
+
+async def test_run_chunk_sends_to_segment(
+    session, campaign_service, sample_user, inactive_user, sent_emails
+):
+    campaign = await campaign_service.create_campaign(
+        subject="Maintenance",
+        html_template="<p>Hi {{ recipient.full_name }}</p>",
+        segment_status=StatusEnum.ACTIVE,
+    )
+
+    processed = await CampaignRunner(chunk_size=1000, rate_limit=1000).run_chunk(
+        session
+    )
+    assert processed >= 1
+
+    recipients = {email["email_to"] for email in sent_emails}
+    assert sample_user.email in recipients
+    assert inactive_user.email not in recipients
+    assert "<p>Hi John Doe</p>" in [
+        email["html_content"]
+        for email in sent_emails
+        if email["email_to"] == sample_user.email
+    ]
+
+    await session.refresh(campaign)
+    assert campaign.status == CampaignStatusEnum.COMPLETED
+    assert campaign.sent_count == processed
+    assert campaign.completed_at is not None
+
+
+async def test_run_chunk_resumes_from_checkpoint(
+    session, campaign_service, sample_user, inactive_user, sent_emails
+):
+    campaign = await campaign_service.create_campaign(
+        subject="Notice", html_template="<p>notice</p>"
+    )
+    runner = CampaignRunner(chunk_size=1, rate_limit=1000)
+
+    assert await runner.run_chunk(session) == 1
+    await session.refresh(campaign)
+    assert campaign.status == CampaignStatusEnum.RUNNING
+    assert campaign.last_recipient_id is not None
+    checkpoint = campaign.last_recipient_id
+
+    assert await runner.run_chunk(session) == 1
+    await session.refresh(campaign)
+    assert campaign.last_recipient_id > checkpoint
+    assert campaign.sent_count == 2
+    assert sent_emails[0]["email_to"] != sent_emails[1]["email_to"]
+
+
+async def test_run_chunk_counts_failures(
+    session, campaign_service, sample_user, monkeypatch
+):
+    async def send_email_async(**kwargs):
+        raise smtplib.SMTPDataError(550, "mailbox unavailable")
+
+    monkeypatch.setattr(runner_module, "send_email_async", send_email_async)
+
+    campaign = await campaign_service.create_campaign(
+        subject="Notice", html_template="<p>notice</p>"
+    )
+    processed = await CampaignRunner(chunk_size=1000, rate_limit=1000).run_chunk(
+        session
+    )
+
+    await session.refresh(campaign)
+    assert campaign.failed_count == processed
+    assert campaign.sent_count == 0
+
+
+async def test_cancel_campaign(session, campaign_service, sample_user, sent_emails):
+    campaign = await campaign_service.create_campaign(
+        subject="Notice", html_template="<p>notice</p>"
+    )
+    cancelled = await campaign_service.cancel_campaign(campaign.id)
+    assert cancelled.status == CampaignStatusEnum.CANCELLED
+
+    assert await CampaignRunner(rate_limit=1000).run_chunk(session) == 0
+    assert sent_emails == []
+
+
+async def test_get_campaign_not_found(campaign_service):
+    with pytest.raises(CampaignNotFoundError):
+        await campaign_service.get_campaign(
+            "00000000-0000-0000-0000-000000000000"  # pyright: ignore [reportArgumentType]
+        )
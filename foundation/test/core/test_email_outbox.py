@@ -0,0 +1,96 @@
+import smtplib
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from foundation.core.config import settings
+from foundation.core.email import EmailData
+from foundation.core.outbox import EmailOutbox, EmailOutboxService, OutboxStatusEnum
+from foundation.core.outbox import dispatcher as dispatcher_module
+from foundation.core.outbox.dispatcher import EmailDispatcher
+from foundation.core.repository import Repository
+from foundation.test.utils import random_email
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def outbox_service(session) -> EmailOutboxService:
+    return EmailOutboxService(Repository(session, EmailOutbox))
+
+
+@pytest_asyncio.fixture
+async def queued_email(outbox_service) -> EmailOutbox:
+    entry = await outbox_service.enqueue(
+        email_to=random_email(),
+        email_data=EmailData(html_content="<p>hello</p>", subject="subject"),
+        commit=True,
+    )
+    assert entry is not None
+    return entry
+
+
+async def test_enqueue(outbox_service, session):
+    email_to = random_email()
+    entry = await outbox_service.enqueue(
+        email_to=email_to,
+        email_data=EmailData(html_content="<p>hello</p>", subject="subject"),
+    )
+    assert entry is not None
+    await session.commit()
+
+    found = await session.scalar(
+        select(EmailOutbox).where(EmailOutbox.email_to == email_to)
+    )
+    assert found is not None
+    assert found.status == OutboxStatusEnum.PENDING
+    assert found.attempts == 0
+
+
+async def test_enqueue_email_disabled(outbox_service, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_ENABLED", False)
+    entry = await outbox_service.enqueue(
+        email_to=random_email(),
+        email_data=EmailData(html_content="<p>hello</p>", subject="subject"),
+    )
+    assert entry is None
+
+
+async def test_dispatch_batch_sent(session, queued_email, monkeypatch):
+    async def send_email_async(**kwargs):
+        return True
+
+    monkeypatch.setattr(dispatcher_module, "send_email_async", send_email_async)
+
+    processed = await EmailDispatcher(batch_size=100).dispatch_batch(session)
+    assert processed >= 1
+
+    await session.refresh(queued_email)
+    assert queued_email.status == OutboxStatusEnum.SENT
+    assert queued_email.attempts == 1
+    assert queued_email.sent_at is not None
+    assert queued_email.html_content == ""
+
+
+async def test_dispatch_batch_retry(session, queued_email, monkeypatch):
+    async def send_email_async(**kwargs):
+        raise smtplib.SMTPDataError(451, "try again later")
+
+    monkeypatch.setattr(dispatcher_module, "send_email_async", send_email_async)
+
+    await EmailDispatcher(batch_size=100).dispatch_batch(session)
+
+    await session.refresh(queued_email)
+    assert queued_email.status == OutboxStatusEnum.PENDING
+    assert queued_email.attempts == 1
+    assert "try again later" in queued_email.last_error
+    assert queued_email.next_attempt_at > queued_email.created_at
+
+
+async def test_mark_failed_max_attempts(outbox_service, queued_email):
+    queued_email.attempts = settings.EMAIL_OUTBOX_MAX_ATTEMPTS - 1
+    outbox_service.mark_failed(queued_email, "mailbox unavailable")
+    assert queued_email.status == OutboxStatusEnum.FAILED
+    assert queued_email.last_error == "mailbox unavailable"
+    assert queued_email.html_content == ""
@@ -5,10 +5,12 @@ from fastapi_jwt.jwt_backends.abstract_backend import BackendException
 from jwt import InvalidTokenError
 
 from foundation.core.email import (
+    email_templates,
     generate_test_email,
     send_email,
     generate_reset_password_email,
     generate_new_account_email,
+    precompile_email_templates,
 )
 from foundation.core.security import (
     generate_password_reset_token,
@@ -48,14 +50,22 @@ def test_generate_reset_password_email():
 
 def test_generate_new_account_email():
     email_to = "test@test.com"
-    email_data = generate_new_account_email(
-        email_to=email_to, username="test", password="password"
-    )
+    email_data = generate_new_account_email(email_to=email_to, username="test")
     assert email_data is not None
     assert email_data.html_content is not None
+    assert "Password" not in email_data.html_content
     assert email_data.subject is not None
 
 
+def test_email_template_cached():
+    template = email_templates.get_template("test_email.html")
+    assert email_templates.get_template("test_email.html") is template
+
+
+def test_precompile_email_templates():
+    assert precompile_email_templates() >= 3
+
+
 def test_password_reset_token():
     email = "test@test.com"
     reset_token = generate_password_reset_token(email)
@@ -65,28 +75,34 @@ def test_password_reset_token():
     assert token_subject == email
 
 
-def test_verify_password_reset_token_invalid_token_error():
+def test_verify_password_reset_token_invalid_token_error(monkeypatch):
     token = "invalid_token"
 
-    reset_token.jwt_backend.decode = Mock(side_effect=InvalidTokenError)
+    monkeypatch.setattr(
+        reset_token.jwt_backend, "decode", Mock(side_effect=InvalidTokenError)
+    )
 
     email = verify_password_reset_token(token)
     assert email is None
 
 
-def test_verify_password_reset_token_backend_exception():
+def test_verify_password_reset_token_backend_exception(monkeypatch):
     token = "invalid_token"
 
-    reset_token.jwt_backend.decode = Mock(side_effect=BackendException)
+    monkeypatch.setattr(
+        reset_token.jwt_backend, "decode", Mock(side_effect=BackendException)
+    )
 
     email = verify_password_reset_token(token)
     assert email is None
 
 
-def test_verify_password_reset_token_bad_signature_error():
+def test_verify_password_reset_token_bad_signature_error(monkeypatch):
     token = "invalid_token"
 
-    reset_token.jwt_backend.decode = Mock(side_effect=BadSignatureError("result"))
+    monkeypatch.setattr(
+        reset_token.jwt_backend, "decode", Mock(side_effect=BadSignatureError("result"))
+    )
 
     email = verify_password_reset_token(token)
     assert email is None
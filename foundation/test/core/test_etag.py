@@ -0,0 +1,35 @@
+from starlette.requests import Request
+
+from foundation.core.etag import etag_matches, make_etag, not_modified
+
+
+def request_with(if_none_match: str | None) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "headers": headers})
+
+
+def test_make_etag():
+    etag = make_etag("users", "3|2024-01-01", 0, 100)
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == make_etag("users", "3|2024-01-01", 0, 100)
+    assert etag != make_etag("users", "4|2024-01-01", 0, 100)
+
+
+def test_etag_matches():
+    etag = make_etag("users", 1)
+    assert etag_matches(request_with(etag), etag)
+    assert etag_matches(request_with(etag.removeprefix("W/")), etag)
+    assert etag_matches(request_with(f'"other", {etag}'), etag)
+    assert etag_matches(request_with("*"), etag)
+    assert not etag_matches(request_with('"other"'), etag)
+    assert not etag_matches(request_with(None), etag)
+
+
+def test_not_modified():
+    etag = make_etag("users", 1)
+    response = not_modified(etag)
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.body == b""
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from foundation.core.events import EventBroker, RowChange
+from foundation.core.versioning import data_versions
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_row_change_from_payload():
+    user_id = uuid.uuid4()
+    payload = json.dumps({"table": "user", "op": "UPDATE", "id": str(user_id)})
+    assert RowChange.from_payload(payload) == RowChange("user", "UPDATE", user_id)
+
+
+async def test_publish_to_all_subscribers():
+    broker = EventBroker(listen=False)
+    change = RowChange("user", "INSERT", uuid.uuid4())
+    version = data_versions.get("user")
+    async with broker.subscribe() as first, broker.subscribe() as second:
+        broker.publish(change)
+        assert first.get_nowait() == change
+        assert second.get_nowait() == change
+    assert data_versions.get("user") == version + 1
+    assert not broker.subscribers
+
+
+async def test_publish_drops_oldest_change():
+    broker = EventBroker(listen=False, queue_size=2)
+    changes = [RowChange("user", "UPDATE", uuid.uuid4()) for _ in range(3)]
+    async with broker.subscribe() as queue:
+        for change in changes:
+            broker.publish(change)
+        assert [queue.get_nowait(), queue.get_nowait()] == changes[1:]
+
+
+async def test_invalid_notification_ignored():
+    broker = EventBroker(listen=False)
+    async with broker.subscribe() as queue:
+        broker._on_notification(None, 1, "row_changes", "not json")  # type: ignore
+        assert queue.empty()
+
+
+async def test_subscribe_while_the_listener_stops(monkeypatch):
+    broker = EventBroker()
+    listeners = []
+
+    async def listen():
+        listeners.append(asyncio.current_task())
+        try:
+            await asyncio.Event().wait()
+        finally:
+            # closing the connection takes a while
+            await asyncio.sleep(0.01)
+
+    monkeypatch.setattr(broker, "_listen", listen)
+    first = broker.subscribe()
+    await first.__aenter__()
+    await asyncio.sleep(0)
+    # the last subscriber leaves and stops the listener
+    leaving = asyncio.create_task(first.__aexit__(None, None, None))
+    await asyncio.sleep(0)
+    async with broker.subscribe():
+        await leaving
+        await asyncio.sleep(0)
+        # the new subscriber started a listener of its own
+        assert len(listeners) == 2
+        assert listeners[1] is broker._task and not listeners[1].done()
+    assert broker._task is None
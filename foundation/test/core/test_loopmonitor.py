@@ -0,0 +1,68 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from foundation.core.loopmonitor import (
+    LOOP_BLOCKED,
+    LOOP_LAG,
+    BlockingCallError,
+    LoopMonitor,
+)
+from foundation.core.metrics import request_scope
+from foundation.core.security import get_password_hash_async, verify_password_async
+
+pytestmark = pytest.mark.asyncio
+
+
+def hash_password_synchronously() -> None:
+    time.sleep(0.2)
+
+
+@pytest.mark.blocking
+async def test_reports_blocking_calls_with_route_and_function():
+    monitor = LoopMonitor(interval=0.005, threshold=0.05, strict=True)
+    monitor.start()
+    await asyncio.sleep(0.02)
+    route = SimpleNamespace(path="/users/{user_id}")
+    token = request_scope.set({"type": "http", "route": route})
+    try:
+        hash_password_synchronously()
+    finally:
+        request_scope.reset(token)
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    (call,) = monitor.blocking_calls
+    assert call.route == "/users/{user_id}"
+    assert call.function.startswith("hash_password_synchronously ")
+    assert "time.sleep(0.2)" in call.stack
+    assert 0.1 < call.duration < 0.3
+    assert (call.route, call.function) in LOOP_BLOCKED.values
+    with pytest.raises(BlockingCallError, match="event loop blocked for"):
+        monitor.check()
+    # the reports are cleared by the check
+    monitor.check()
+
+
+async def test_does_not_report_a_responsive_loop():
+    monitor = LoopMonitor(interval=0.005, threshold=0.05, strict=True)
+    lag_samples = sum(sum(counts) for counts, _ in LOOP_LAG.values.values())
+    monitor.start()
+    for _ in range(10):
+        await asyncio.sleep(0.01)
+    await monitor.stop()
+
+    monitor.check()
+    assert sum(sum(counts) for counts, _ in LOOP_LAG.values.values()) > lag_samples
+
+
+async def test_password_hashing_does_not_block_the_loop():
+    monitor = LoopMonitor(interval=0.005, threshold=0.05, strict=True)
+    monitor.start()
+    hashed = await get_password_hash_async("password")
+    assert await verify_password_async("password", hashed)
+    await monitor.stop()
+
+    monitor.check()
@@ -0,0 +1,104 @@
+import os
+import time
+
+import pytest
+
+from foundation.core.metrics import MetricsRegistry, merge_snapshots
+
+
+def test_render_counter_and_gauge():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests handled.", ["method"])
+    registry.gauge("pool_size", "Connections.", function=lambda: 5)
+    requests.inc(method="GET")
+    requests.inc(2, method="GET")
+
+    text = registry.render(registry.snapshot())
+
+    assert "# HELP requests_total Requests handled.\n" in text
+    assert "# TYPE requests_total counter\n" in text
+    assert 'requests_total{method="GET"} 3\n' in text
+    assert "pool_size 5\n" in text
+
+
+def test_render_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    duration = registry.histogram("duration_seconds", "Duration.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        duration.observe(value)
+
+    text = registry.render(registry.snapshot())
+
+    assert 'duration_seconds_bucket{le="0.1"} 1\n' in text
+    assert 'duration_seconds_bucket{le="1.0"} 3\n' in text
+    assert 'duration_seconds_bucket{le="+Inf"} 4\n' in text
+    assert "duration_seconds_sum 6.05\n" in text
+    assert "duration_seconds_count 4\n" in text
+
+
+def test_render_escapes_label_values():
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "Errors.", ["message"]).inc(message='a "b"\n')
+
+    text = registry.render(registry.snapshot())
+
+    assert 'errors_total{message="a \\"b\\"\\n"} 1\n' in text
+
+
+def test_labels_must_match():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests handled.", ["method"])
+
+    with pytest.raises(ValueError):
+        requests.inc()
+    with pytest.raises(ValueError):
+        registry.counter("requests_total", "Registered twice.")
+
+
+def test_merge_sums_values_and_skips_gauges_of_stale_workers():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests handled.")
+    in_flight = registry.gauge("in_flight", "Requests in flight.")
+    duration = registry.histogram("duration_seconds", "Duration.", buckets=(1.0,))
+    requests.inc(2)
+    in_flight.set(3)
+    duration.observe(0.5)
+    snapshot = registry.snapshot()
+
+    merged = merge_snapshots([(snapshot, False), (snapshot, False), (snapshot, True)])
+
+    assert merged["requests_total"]["samples"] == [{"labels": [], "value": 6}]
+    assert merged["in_flight"]["samples"] == [{"labels": [], "value": 6}]
+    assert merged["duration_seconds"]["samples"] == [
+        {"labels": [], "counts": [3, 0], "sum": 1.5}
+    ]
+    # merging leaves the snapshots as they were
+    assert snapshot["requests_total"]["samples"] == [{"labels": [], "value": 2}]
+
+
+def test_collect_merges_the_files_of_all_workers(tmp_path):
+    worker = MetricsRegistry()
+    worker.counter("requests_total", "Requests handled.").inc(5)
+    worker.gauge("in_flight", "Requests in flight.").set(1)
+    other = worker.write(tmp_path)
+    os.rename(other, tmp_path / "metrics-1.json")
+    stopped = worker.write(tmp_path)
+    os.rename(stopped, tmp_path / "metrics-2.json")
+    old = time.time() - 3600
+    os.utime(tmp_path / "metrics-2.json", (old, old))
+
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests handled.").inc()
+    registry.gauge("in_flight", "Requests in flight.").set(2)
+    registry.gauge("outbox_pending", "Emails.", live=True).set(7)
+
+    snapshot = registry.collect(tmp_path)
+
+    # counters of stopped workers are kept, so the totals never go down
+    assert snapshot["requests_total"]["samples"][0]["value"] == 11
+    assert snapshot["in_flight"]["samples"][0]["value"] == 3
+    # live gauges are set by the scraped worker only and never written
+    assert snapshot["outbox_pending"]["samples"][0]["value"] == 7
+    assert (
+        "outbox_pending" not in (tmp_path / f"metrics-{os.getpid()}.json").read_text()
+    )
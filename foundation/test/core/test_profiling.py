@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy.util import greenlet_spawn
+
+from foundation.core.profiling import (
+    AWAIT_FRAME,
+    Profile,
+    ProfileStore,
+    SamplingProfiler,
+    flame_graph,
+    new_profile_id,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+def busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def find_rows() -> None:
+    # sync database code, run by SQLAlchemy in a greenlet
+    await greenlet_spawn(busy, 0.05)
+
+
+async def wait_for_database() -> None:
+    await asyncio.sleep(0.05)
+
+
+async def handle_request() -> None:
+    await find_rows()
+    await wait_for_database()
+
+
+def names(stack: tuple[str, ...]) -> list[str]:
+    return [label.split(" ", 1)[0] for label in stack]
+
+
+async def test_samples_running_and_awaiting_stacks():
+    profiler = SamplingProfiler(asyncio.current_task(), interval=0.001)  # type: ignore[arg-type]
+    profiler.start()
+    await handle_request()
+    samples = profiler.stop()
+
+    stacks = [names(stack) for stack in samples]
+    # the greenlet frames are attached to the coroutines that spawned them
+    running = [s for s in stacks if s[-1] == "busy"]
+    assert running
+    assert running[0][-4:] == ["handle_request", "find_rows", "greenlet_spawn", "busy"]
+    awaiting = [s for s in stacks if s[-1] == AWAIT_FRAME]
+    assert any(
+        s[-4:-1] == ["handle_request", "wait_for_database", "sleep"] for s in awaiting
+    )
+
+
+def create_profile(**kwargs) -> Profile:
+    data = dict(
+        id=new_profile_id(),
+        method="GET",
+        path="/users",
+        started_at=time.time(),
+        duration=0.01,
+        interval=0.001,
+        status=200,
+        samples={
+            ("route", "service", "query"): 6,
+            ("route", "service", AWAIT_FRAME): 3,
+            ("route", "render"): 1,
+        },
+    )
+    return Profile(**{**data, **kwargs})
+
+
+async def test_top_functions_and_call_tree():
+    profile = create_profile()
+
+    top = profile.top_functions(limit=2)
+    assert [(f.name, f.own, f.total) for f in top] == [
+        ("query", 6, 6),
+        (AWAIT_FRAME, 3, 3),
+    ]
+
+    tree = profile.call_tree()
+    assert (tree.name, tree.samples) == ("GET /users", 10)
+    (route,) = tree.children
+    assert [(c.name, c.samples) for c in route.children] == [
+        ("service", 9),
+        ("render", 1),
+    ]
+
+
+async def test_flame_graph_lays_out_the_call_tree():
+    boxes = flame_graph(create_profile().call_tree(), min_share=0.15)
+
+    layout = {(box.name, box.depth): (box.start, box.width) for box in boxes}
+    assert layout[("GET /users", 0)] == (0.0, 1.0)
+    assert layout[("service", 2)] == (0.0, 0.9)
+    assert layout[("query", 3)] == (0.0, 0.6)
+    assert layout[(AWAIT_FRAME, 3)] == (0.6, pytest.approx(0.3))
+    # less than min_share of the samples
+    assert ("render", 2) not in layout
+
+
+async def test_store_keeps_the_latest_profiles(tmp_path):
+    store = ProfileStore(tmp_path, max_profiles=2)
+    profiles = [create_profile(started_at=1000.0 + i) for i in range(3)]
+    for profile in profiles:
+        store.save(profile)
+
+    assert [p.id for p in store.recent()] == [profiles[2].id, profiles[1].id]
+    assert store.get(profiles[0].id) is None
+    assert store.get(profiles[2].id) == profiles[2]
+    assert store.get("../../etc/passwd") is None
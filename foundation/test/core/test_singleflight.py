@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from foundation.core.config import settings
+from foundation.core.singleflight import SingleFlight, coalesce, singleflight
+
+pytestmark = pytest.mark.asyncio
+
+
+class Query:
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return self.calls
+
+
+async def test_concurrent_calls_share_result():
+    flights, query = SingleFlight(), Query()
+    tasks = [asyncio.create_task(flights.do("key", query, name="q")) for _ in range(5)]
+    await asyncio.sleep(0)
+    query.release.set()
+    results = await asyncio.gather(*tasks)
+    assert [result for result, _ in results] == [1] * 5
+    assert sorted(shared for _, shared in results) == [False] + [True] * 4
+    assert flights.stats() == {"q": {"calls": 1, "coalesced": 4}}
+
+
+async def test_calls_after_completion_run_again():
+    flights, query = SingleFlight(), Query()
+    query.release.set()
+    assert await flights.do("key", query) == (1, False)
+    assert await flights.do("key", query) == (2, False)
+
+
+async def test_different_keys_do_not_share():
+    flights, query = SingleFlight(), Query()
+    first = asyncio.create_task(flights.do("a", query))
+    second = asyncio.create_task(flights.do("b", query))
+    await asyncio.sleep(0)
+    query.release.set()
+    await asyncio.gather(first, second)
+    assert query.calls == 2
+
+
+async def test_exception_is_shared():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    tasks = [asyncio.create_task(flights.do("key", fail)) for _ in range(3)]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flights.calls[""] == 1
+
+
+async def test_leader_cancelled_follower_runs_call():
+    flights, query = SingleFlight(), Query()
+    leader = asyncio.create_task(flights.do("key", query))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("key", query))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    query.release.set()
+    assert await follower == (2, False)
+    assert leader.cancelled()
+
+
+async def test_follower_cancelled_leader_continues():
+    flights, query = SingleFlight(), Query()
+    leader = asyncio.create_task(flights.do("key", query))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("key", query))
+    await asyncio.sleep(0)
+    follower.cancel()
+    await asyncio.sleep(0)
+    query.release.set()
+    assert await leader == (1, False)
+    assert follower.cancelled()
+
+
+class Service:
+    def __init__(self, query: Query, clean: bool = True):
+        self.query = query
+        self.clean = clean
+        self.adopted = False
+
+    async def adopt(self, result):
+        self.adopted = True
+        return result
+
+    @coalesce(
+        "Service.count",
+        adopt=lambda self, result: self.adopt(result),
+        can_share=lambda self: self.clean,
+    )
+    async def count(self, *, status: str) -> int:
+        return await self.query()
+
+
+async def test_coalesce_across_instances():
+    query = Query()
+    first, second = Service(query), Service(query)
+    tasks = [
+        asyncio.create_task(first.count(status="active")),
+        asyncio.create_task(second.count(status="active")),
+    ]
+    await asyncio.sleep(0)
+    query.release.set()
+    assert await asyncio.gather(*tasks) == [1, 1]
+    assert (first.adopted, second.adopted) == (False, True)
+    assert singleflight.coalesced["Service.count"] >= 1
+
+
+async def test_coalesce_skipped(monkeypatch):
+    query = Query()
+    services = [Service(query), Service(query, clean=False)]
+    tasks = [asyncio.create_task(s.count(status="active")) for s in services]
+    await asyncio.sleep(0)
+    query.release.set()
+    await asyncio.gather(*tasks)
+    assert query.calls == 2
+
+    monkeypatch.setattr(settings, "SINGLEFLIGHT_ENABLED", False)
+    tasks = [asyncio.create_task(Service(query).count(status="a")) for _ in range(2)]
+    await asyncio.gather(*tasks)
+    assert query.calls == 4
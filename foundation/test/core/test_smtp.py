@@ -0,0 +1,95 @@
+import socket
+
+import pytest
+import pytest_asyncio
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Sink
+
+from foundation.core.smtp import SMTPConnectionPool
+
+pytestmark = pytest.mark.asyncio
+
+
+class RecordingHandler(Sink):
+    def __init__(self):
+        self.messages = []
+        self.sessions = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.sessions.add(id(session))
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+
+@pytest_asyncio.fixture
+async def pool(smtp_server):
+    controller, _ = smtp_server
+    pool = SMTPConnectionPool(host=controller.hostname, port=controller.port, size=2)
+    yield pool
+    await pool.close()
+
+
+def message(to: str) -> str:
+    return f"From: me@example.com\r\nTo: {to}\r\nSubject: test\r\n\r\nhello\r\n"
+
+
+async def test_send_reuses_connections(pool, smtp_server):
+    _, handler = smtp_server
+    for i in range(5):
+        await pool.send(
+            from_addr="me@example.com",
+            to_addrs=[f"user{i}@example.com"],
+            message=message(f"user{i}@example.com"),
+        )
+
+    assert len(handler.messages) == 5
+    assert len(handler.sessions) == 1
+    assert pool.open_connections == 1
+
+
+async def test_send_keepalive_noop(pool, smtp_server):
+    _, handler = smtp_server
+    pool.keepalive_interval = 0
+    for i in range(2):
+        await pool.send(
+            from_addr="me@example.com",
+            to_addrs=["user@example.com"],
+            message=message("user@example.com"),
+        )
+
+    assert len(handler.messages) == 2
+    assert pool.open_connections == 1
+
+
+async def test_send_reconnects_dropped_connection(pool, smtp_server):
+    _, handler = smtp_server
+    await pool.send(
+        from_addr="me@example.com",
+        to_addrs=["user@example.com"],
+        message=message("user@example.com"),
+    )
+    # simulate the server closing an idle connection
+    pool._idle[0].client.sock.close()
+
+    await pool.send(
+        from_addr="me@example.com",
+        to_addrs=["user@example.com"],
+        message=message("user@example.com"),
+    )
+    assert len(handler.messages) == 2
+    assert pool.open_connections == 1
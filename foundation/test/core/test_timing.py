@@ -0,0 +1,54 @@
+from foundation.core.timing import (
+    ServerTiming,
+    expose_server_timing,
+    record_timing,
+    server_timing,
+    timing_span,
+)
+
+
+def test_sums_spans_by_name():
+    timing = ServerTiming()
+    timing.record("db", 0.002)
+    timing.record("db", 0.001)
+    timing.record("hash", 0.25)
+
+    assert timing.header_value(total=0.3) == (
+        'db;desc="Database (2)";dur=3.0, '
+        'hash;desc="Password hashing (1)";dur=250.0, '
+        "total;dur=300.0"
+    )
+
+
+def test_nested_spans_of_the_same_name_are_counted_once():
+    timing = ServerTiming()
+    with timing.span("render"):
+        with timing.span("render"):
+            pass
+        with timing.span("auth"):
+            pass
+
+    assert timing.spans["render"][1] == 1
+    assert timing.spans["auth"][1] == 1
+
+
+def test_spans_outside_of_a_request_are_ignored():
+    with timing_span("render"):
+        record_timing("db", 0.1)
+        expose_server_timing()
+
+    assert server_timing.get() is None
+
+
+def test_spans_are_recorded_into_the_current_request():
+    timing = ServerTiming()
+    token = server_timing.set(timing)
+    try:
+        with timing_span("render"):
+            record_timing("db", 0.001)
+        expose_server_timing()
+    finally:
+        server_timing.reset(token)
+
+    assert set(timing.spans) == {"render", "db"}
+    assert timing.exposed
@@ -0,0 +1,300 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy.util import greenlet_spawn
+
+from foundation.core.tracing import (
+    JsonLinesExporter,
+    MemoryExporter,
+    OtlpHttpExporter,
+    Sampler,
+    SpanContext,
+    Tracer,
+    current_span,
+    current_traceparent,
+    format_traceparent,
+    parse_traceparent,
+    record_span,
+    trace_span,
+    traced,
+    waterfall,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+TRACEPARENT = f"00-{TRACE_ID}-{PARENT_ID}-01"
+
+
+@pytest.fixture
+def tracer() -> Tracer:
+    return Tracer(exporters=[MemoryExporter()], sampler=Sampler(rate=1.0))
+
+
+@pytest.fixture
+def root(tracer: Tracer):
+    span = tracer.start_trace("GET /users")
+    token = current_span.set(span)
+    yield span
+    current_span.reset(token)
+
+
+class UserService:
+    @traced()
+    async def get_user(self, user_id: int) -> int:
+        record_span("db SELECT", 0.001, kind="client")
+        return user_id
+
+
+def test_parse_traceparent():
+    assert parse_traceparent(TRACEPARENT) == SpanContext(TRACE_ID, PARENT_ID, True)
+    assert parse_traceparent(TRACEPARENT[:-1] + "0").sampled is False
+    # later versions may add fields
+    assert parse_traceparent(f"01-{TRACE_ID}-{PARENT_ID}-01-more") is not None
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        None,
+        "",
+        "garbage",
+        f"ff-{TRACE_ID}-{PARENT_ID}-01",
+        f"00-{'0' * 32}-{PARENT_ID}-01",
+        f"00-{TRACE_ID}-{'0' * 16}-01",
+        f"00-{TRACE_ID}-{PARENT_ID}-01-more",
+    ],
+)
+def test_parse_invalid_traceparent(value):
+    assert parse_traceparent(value) is None
+
+
+def test_format_traceparent():
+    assert format_traceparent(parse_traceparent(TRACEPARENT)) == TRACEPARENT
+
+
+def test_sampler():
+    parent = parse_traceparent(TRACEPARENT)
+    assert Sampler(rate=0.0).should_sample(TRACE_ID, parent) is True
+    assert (
+        Sampler(rate=0.0, parent_based=False).should_sample(TRACE_ID, parent) is False
+    )
+    assert Sampler(rate=1.0).should_sample(TRACE_ID) is True
+    assert Sampler(rate=0.0).should_sample(TRACE_ID) is False
+    # the decision only depends on the low 64 bits of the trace id
+    assert Sampler(rate=0.5).should_sample("f" * 16 + "0" * 16) is True
+    assert Sampler(rate=0.5).should_sample("0" * 16 + "f" * 16) is False
+
+
+@pytest.mark.asyncio
+async def test_spans_nest(tracer: Tracer, root):
+    await UserService().get_user(1)
+    with trace_span("render", template="pages/users.html"):
+        pass
+    tracer.end_trace(root)
+
+    trace = root.trace
+    assert [span.name for span in trace.spans] == [
+        "GET /users",
+        "UserService.get_user",
+        "db SELECT",
+        "render",
+    ]
+    service, query, render = trace.spans[1:]
+    assert service.parent_id == root.span_id
+    assert query.parent_id == service.span_id
+    assert query.kind == "client"
+    assert render.attributes == {"template": "pages/users.html"}
+    assert all(span.end_ns >= span.start_ns > 0 for span in trace.spans)
+
+
+@pytest.mark.asyncio
+async def test_spans_of_sync_database_code(tracer: Tracer, root):
+    # SQLAlchemy runs the statement listeners in a greenlet, with the context of the task
+    await greenlet_spawn(record_span, "db SELECT", 0.001)
+
+    assert [span.name for span in root.trace.spans] == ["GET /users", "db SELECT"]
+
+
+@pytest.mark.asyncio
+async def test_spans_of_concurrent_tasks(tracer: Tracer, root):
+    await asyncio.gather(UserService().get_user(1), UserService().get_user(2))
+
+    services = [s for s in root.trace.spans if s.name == "UserService.get_user"]
+    assert len(services) == 2
+    assert all(span.parent_id == root.span_id for span in services)
+
+
+@pytest.mark.asyncio
+async def test_error_is_recorded(root):
+    with pytest.raises(ValueError):
+        with trace_span("render"):
+            raise ValueError("missing template")
+
+    span = root.trace.spans[-1]
+    assert span.status == "error"
+    assert span.status_message == "ValueError: missing template"
+
+
+@pytest.mark.asyncio
+async def test_no_spans_outside_of_a_trace():
+    with trace_span("render") as span:
+        assert span is None
+    assert await UserService().get_user(1) == 1
+    assert current_traceparent() is None
+
+
+@pytest.mark.asyncio
+async def test_no_spans_in_unsampled_trace():
+    tracer = Tracer(exporters=[MemoryExporter()], sampler=Sampler(rate=0.0))
+    root = tracer.start_trace("GET /users")
+    token = current_span.set(root)
+    try:
+        with trace_span("render") as span:
+            assert span is None
+        # the trace id is still propagated
+        assert current_traceparent() == f"00-{root.trace_id}-{root.span_id}-00"
+    finally:
+        current_span.reset(token)
+    assert root.trace.spans == []
+
+
+@pytest.mark.asyncio
+async def test_continues_the_trace_of_the_caller(tracer: Tracer):
+    root = tracer.start_trace("GET /users", traceparent=TRACEPARENT)
+
+    assert root.trace_id == TRACE_ID
+    assert root.parent_id == PARENT_ID
+
+
+@pytest.mark.asyncio
+async def test_spans_are_capped():
+    tracer = Tracer(exporters=[MemoryExporter()], sampler=Sampler(rate=1.0))
+    root = tracer.start_trace("GET /users")
+    root.trace.max_spans = 3
+    token = current_span.set(root)
+    try:
+        for _ in range(5):
+            record_span("db SELECT", 0.001)
+    finally:
+        current_span.reset(token)
+    tracer.end_trace(root)
+
+    assert len(root.trace.spans) == 3
+    assert root.attributes["dropped_spans"] == 3
+
+
+@pytest.mark.asyncio
+async def test_waterfall(tracer: Tracer, root):
+    await UserService().get_user(1)
+    tracer.end_trace(root)
+
+    rows = waterfall(root.trace)
+
+    assert [(row.span.name, row.depth) for row in rows] == [
+        ("GET /users", 0),
+        ("UserService.get_user", 1),
+        ("db SELECT", 2),
+    ]
+    assert rows[0].offset == 0 and rows[0].width == 1
+    assert all(0 <= row.offset <= 1 for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_tracer_exports_in_the_background(root):
+    exporter = MemoryExporter(max_traces=2)
+    tracer = Tracer(exporters=[exporter], sampler=Sampler(rate=1.0))
+    traces = [tracer.start_trace(f"GET /{i}") for i in range(3)]
+    for span in traces:
+        tracer.end_trace(span)
+
+    assert tracer.flush()
+
+    assert [trace.root.name for trace in exporter.recent()] == ["GET /2", "GET /1"]
+    assert exporter.get(traces[2].trace_id) is traces[2].trace
+    assert exporter.get(traces[0].trace_id) is None
+    tracer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_tracer_survives_failing_exporter():
+    class FailingExporter(MemoryExporter):
+        def export(self, traces):
+            raise OSError("collector down")
+
+    exporter = MemoryExporter()
+    tracer = Tracer(exporters=[FailingExporter(), exporter], sampler=Sampler(rate=1.0))
+    tracer.end_trace(tracer.start_trace("GET /users"))
+
+    assert tracer.flush()
+    assert len(exporter.recent()) == 1
+    tracer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_json_lines_exporter(tmp_path, tracer: Tracer, root):
+    await UserService().get_user(1)
+    tracer.end_trace(root)
+    path = tmp_path / "traces" / "spans.jsonl"
+
+    JsonLinesExporter(str(path)).export([root.trace])
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [span["name"] for span in spans] == [
+        "GET /users",
+        "UserService.get_user",
+        "db SELECT",
+    ]
+    assert spans[1]["parent_id"] == spans[0]["span_id"]
+
+
+@pytest.mark.asyncio
+async def test_otlp_exporter(tracer: Tracer, root):
+    received = []
+
+    class Collector(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append(
+                (self.path, self.headers["Authorization"], json.loads(body))
+            )
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Collector)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    root.set_attribute("http.status_code", 200)
+    tracer.end_trace(root)
+    try:
+        exporter = OtlpHttpExporter(
+            f"http://127.0.0.1:{server.server_port}/v1/traces",
+            headers={"Authorization": "Bearer token"},
+            service_name="foundation",
+        )
+        await asyncio.to_thread(exporter.export, [root.trace])
+    finally:
+        # waits for the poll interval of serve_forever, off the event loop
+        await asyncio.to_thread(server.shutdown)
+        server.server_close()
+
+    path, authorization, payload = received[0]
+    assert path == "/v1/traces"
+    assert authorization == "Bearer token"
+    resource_spans = payload["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "foundation"}}
+    ]
+    span = resource_spans["scopeSpans"][0]["spans"][0]
+    assert span["traceId"] == root.trace_id
+    assert span["spanId"] == root.span_id
+    assert span["kind"] == 2
+    assert span["startTimeUnixNano"] == str(root.start_ns)
+    assert span["attributes"] == [
+        {"key": "http.status_code", "value": {"intValue": "200"}}
+    ]
@@ -1,4 +1,6 @@
-from unittest.mock import Mock
+import uuid
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 import pytest_asyncio
@@ -8,7 +10,12 @@ from sqlalchemy import select
 from starlette import requests
 from starlette.datastructures import URL
 
-from foundation.core.pagination import Paginator
+from foundation.core.pagination import (
+    CursorPaginator,
+    Paginator,
+    decode_cursor,
+    encode_cursor,
+)
 from foundation.core.repository import Repository
 from foundation.core.users import StatusEnum
 from foundation.core.users.deps import UserPagination
@@ -148,3 +155,93 @@ async def test_page_query(
 
     assert page_2.has_previous is True
     assert page_2.previous_page is not None
+
+
+async def test_page_count_repository(mock_request):
+    repository = Mock(spec=Repository)
+    result = Mock()
+    result.scalars.return_value.all.return_value = ["a"]
+    repository.execute_query = AsyncMock(return_value=result)
+    count_repository = Mock(spec=Repository)
+    count_repository.count = AsyncMock(return_value=3)
+    url = URL("http://testserver/users/list")
+    pagination = Paginator(
+        mock_request,
+        repository,
+        query=select(User),
+        page_size=1,
+        url=url,
+        count_repository=count_repository,
+    )
+
+    page = await pagination.page(1)
+
+    assert page.items == ["a"]
+    assert page.total == 3
+    assert page.url == url
+    count_repository.count.assert_awaited_once()
+    assert not repository.count.called
+
+
+async def test_page_columns(
+    mock_request, user_repository: Repository, sample_user, inactive_user
+):
+    query = select(User).order_by(User.email)
+    pagination = Paginator(
+        mock_request, user_repository, query=query, columns=["id", "email"]
+    )
+
+    page = await pagination.page(1)
+
+    assert page.items
+    assert all(not isinstance(item, User) for item in page.items)
+    assert [item.email for item in page.items] == sorted(
+        item.email for item in page.items
+    )
+    assert page.total == await user_repository.count()
+
+
+async def test_cursor_roundtrip():
+    created_at, user_id = datetime(2026, 10, 19, 12, 30, 1, 5), uuid.uuid4()
+    cursor = encode_cursor(created_at, user_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, datetime, uuid.UUID) == (created_at, user_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not base64!", encode_cursor("x", "y"), "e30"])
+async def test_cursor_invalid(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, datetime, uuid.UUID)
+
+
+async def test_cursor_paginator(
+    user_repository: Repository, sample_user, inactive_user
+):
+    paginator = CursorPaginator(
+        user_repository, select(User), order_by="created_at", limit=1
+    )
+    total = await user_repository.count()
+
+    seen = []
+    cursor = None
+    while True:
+        page = await paginator.page(cursor)
+        seen.extend(user.id for user in page.items)
+        if not page.has_more:
+            assert page.next_cursor is None
+            break
+        cursor = page.next_cursor
+
+    assert len(seen) == len(set(seen)) == total
+
+
+async def test_cursor_paginator_columns(user_repository: Repository, sample_user):
+    paginator = CursorPaginator(
+        user_repository, select(User), order_by="created_at", columns=["email"]
+    )
+
+    page = await paginator.page()
+
+    assert page.has_more is False
+    assert all(not isinstance(item, User) for item in page.items)
+    assert sample_user.email in [item.email for item in page.items]
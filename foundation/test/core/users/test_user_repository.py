@@ -35,6 +35,21 @@ async def test_find_all_users(user_repository, sample_user):
     assert len(found_users) == 1
 
 
+@pytest.mark.asyncio
+async def test_find_all_users_columns(user_repository, sample_user, session):
+    rows = await user_repository.find_all(limit=1000, columns=["id", "email"])
+    row = next(row for row in rows if row.id == sample_user.id)
+    assert row.email == sample_user.email
+    assert not isinstance(row, User)
+    assert not hasattr(row, "hashed_password")
+
+
+@pytest.mark.asyncio
+async def test_find_all_users_unknown_column(user_repository):
+    with pytest.raises(ValueError):
+        await user_repository.find_all(columns=["id", "password"])
+
+
 @pytest.mark.asyncio
 async def test_update_user(user_repository, sample_user, session):
     updated_at_orig = sample_user.updated_at
@@ -2,8 +2,10 @@ import uuid
 
 import pytest
 import pytest_asyncio
+from sqlalchemy import select
 
-from foundation.core.security import verify_password
+from foundation.core.outbox import EmailOutbox, OutboxStatusEnum
+from foundation.core.security import verify_password_async
 from foundation.core.users.models import User
 from foundation.core.users.services import (
     UserNotFoundError,
@@ -13,6 +15,7 @@ from foundation.core.users.services import (
 )
 from foundation.test.utils import random_email, random_lower_string, mock_emails_send
 from foundation.core.users import StatusEnum, RoleEnum
+from foundation.core.versioning import data_versions
 
 pytestmark = pytest.mark.asyncio
 
@@ -41,6 +44,52 @@ async def test_get_user_by_id_not_found(user_service):
         await user_service.get_user_by_id(user_id=user_id)
 
 
+async def test_get_users_by_ids(user_service, sample_user: User):
+    users = await user_service.get_users_by_ids(user_ids=[sample_user.id, uuid.uuid4()])
+    assert [user.id for user in users] == [sample_user.id]
+    assert await user_service.get_users_by_ids(user_ids=[]) == []
+
+
+async def test_lookup_users(user_service, sample_user: User, inactive_user: User):
+    users = await user_service.lookup_users(
+        user_ids=[sample_user.id, uuid.uuid4()],
+        emails=[inactive_user.email, random_email()],
+    )
+    assert {user.id for user in users} == {sample_user.id, inactive_user.id}
+    assert await user_service.lookup_users(user_ids=[], emails=[]) == []
+
+
+async def test_update_users(user_service, sample_user: User, inactive_user: User):
+    missing_id = uuid.uuid4()
+    results = await user_service.update_users(
+        updates=[
+            {"id": sample_user.id, "email": random_email(), "full_name": "Bulk One"},
+            {"id": missing_id, "email": random_email(), "full_name": "Missing"},
+            {"id": inactive_user.id, "email": sample_user.email, "full_name": "Taken"},
+        ]
+    )
+    assert results[sample_user.id].full_name == "Bulk One"
+    assert isinstance(results[missing_id], UserNotFoundError)
+    assert isinstance(results[inactive_user.id], UserValueError)
+    user = await user_service.get_user_by_id(user_id=inactive_user.id)
+    assert user.full_name != "Taken"
+
+
+async def test_update_users_duplicate_ids(user_service, sample_user: User):
+    update = {"id": sample_user.id, "email": sample_user.email, "full_name": "Twice"}
+    with pytest.raises(UserValueError):
+        await user_service.update_users(updates=[update, update])
+
+
+async def test_delete_users(user_service, sample_user: User, inactive_user: User):
+    missing_id = uuid.uuid4()
+    deleted = await user_service.delete_users(
+        user_ids=[sample_user.id, inactive_user.id, missing_id]
+    )
+    assert deleted == {sample_user.id, inactive_user.id}
+    assert await user_service.get_users_by_ids(user_ids=list(deleted)) == []
+
+
 async def test_get_user_by_email(user_service, sample_user: User):
     user = await user_service.get_user_by_email(email=sample_user.email)
     assert user.id == sample_user.id
@@ -94,7 +143,26 @@ async def test_create_user(user_service):
     assert created_user.role == RoleEnum.USER
     assert created_user.is_active is True
     assert created_user.is_admin is False
-    assert verify_password(user_create["password"], created_user.hashed_password)
+    assert await verify_password_async(
+        user_create["password"], created_user.hashed_password
+    )
+
+
+async def test_create_user_queues_email(user_service, session):
+    email = random_email()
+    await user_service.create_user(
+        create_dict={
+            "full_name": "John Doe",
+            "email": email,
+            "password": "kszd8t5Sg#NT",
+        }
+    )
+
+    queued = await session.scalar(
+        select(EmailOutbox).where(EmailOutbox.email_to == email)
+    )
+    assert queued is not None
+    assert queued.status == OutboxStatusEnum.PENDING
 
 
 async def test_create_user_fails(user_service, sample_user: User):
@@ -139,7 +207,7 @@ async def test_update_user_password(user_service, sample_user: User):
     await user_service.update_user(user_id=sample_user.id, update_dict=user_update)
 
     user = await user_service.get_user_by_id(user_id=sample_user.id)
-    assert verify_password(new_password, user.hashed_password)
+    assert await verify_password_async(new_password, user.hashed_password)
 
 
 async def test_update_user_fails(user_service, sample_user: User):
@@ -172,6 +240,17 @@ async def test_delete_user(user_service, sample_user: User):
         assert await user_service.get_user_by_id(user_id=sample_user.id)
 
 
+async def test_writes_bump_data_version(user_service, sample_user: User):
+    version = data_versions.get("user")
+    await user_service.update_user(
+        user_id=sample_user.id, update_dict={"full_name": "Jane Doe"}
+    )
+    assert data_versions.get("user") == version + 1
+
+    await user_service.delete_user(user_id=sample_user.id)
+    assert data_versions.get("user") == version + 2
+
+
 async def test_delete_user_not_found(user_service):
     user_id = uuid.uuid4()
     with pytest.raises(UserNotFoundError, match=f"user {user_id} does not exist"):
@@ -190,6 +269,20 @@ async def test_get_admin_users_count(user_service):
     assert await user_service.get_admin_users_count() > 0
 
 
-async def test_recover_password(user_service, sample_user: User):
-    # doesn't fail
+async def test_get_user_counts(user_service):
+    counts = await user_service.get_user_counts()
+    assert counts == {
+        "total": await user_service.get_users_count(),
+        "active": await user_service.get_active_users_count(),
+        "admin": await user_service.get_admin_users_count(),
+    }
+
+
+async def test_recover_password(user_service, sample_user: User, session):
     await user_service.recover_password(email=sample_user.email)
+
+    queued = await session.scalar(
+        select(EmailOutbox).where(EmailOutbox.email_to == sample_user.email)
+    )
+    assert queued is not None
+    assert "Password recovery" in queued.subject
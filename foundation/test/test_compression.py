@@ -0,0 +1,112 @@
+import gzip
+
+from starlette.applications import Starlette
+from starlette.responses import (
+    JSONResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from foundation.middleware.compression import CompressionMiddleware, accepted_encodings
+
+ROWS = [
+    {"id": i, "email": f"user{i}@example.com", "full_name": f"User {i}"}
+    for i in range(100)
+]
+CSS = b"body { color: black; }\n" * 100
+CHUNKS = [f"<tr><td>User {i}</td></tr>\n".encode() for i in range(100)]
+
+
+async def users(request):
+    return JSONResponse({"data": ROWS, "count": len(ROWS)})
+
+
+async def small(request):
+    return PlainTextResponse("ok")
+
+
+async def image(request):
+    return Response(b"\x89PNG" * 500, media_type="image/png")
+
+
+async def precompressed(request):
+    return Response(
+        gzip.compress(CSS), media_type="text/css", headers={"content-encoding": "gzip"}
+    )
+
+
+async def stream(request):
+    async def rows():
+        for chunk in CHUNKS[: int(request.query_params.get("rows", 100))]:
+            yield chunk
+
+    return StreamingResponse(rows(), media_type="text/html")
+
+
+def client() -> TestClient:
+    app = Starlette(
+        routes=[
+            Route("/users", users),
+            Route("/small", small),
+            Route("/image", image),
+            Route("/precompressed", precompressed),
+            Route("/stream", stream),
+        ]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=500, gzip_level=6)
+    return TestClient(app)
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert accepted_encodings("br;q=0, gzip;q=0.8") == {"gzip"}
+    assert accepted_encodings("") == set()
+
+
+def test_compresses_json():
+    response = client().get("/users", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json()["count"] == 100
+
+
+def test_skips_without_accept_encoding():
+    response = client().get("/users", headers={"accept-encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.json()["count"] == 100
+
+
+def test_skips_small_response():
+    response = client().get("/small", headers={"accept-encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
+
+
+def test_skips_content_type_not_allowed():
+    response = client().get("/image", headers={"accept-encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == "2000"
+
+
+def test_skips_encoded_response():
+    response = client().get("/precompressed", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-length"] == str(len(gzip.compress(CSS)))
+    assert response.content == CSS
+
+
+def test_compresses_stream():
+    response = client().get("/stream", headers={"accept-encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == b"".join(CHUNKS)
+
+
+def test_skips_small_stream():
+    response = client().get("/stream?rows=2", headers={"accept-encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.content == b"".join(CHUNKS[:2])
@@ -0,0 +1,64 @@
+import pytest
+
+from foundation.core.versioning import DataVersions
+from foundation.web.cache import FragmentCache, fragment_key
+
+
+def test_fragment_key():
+    assert fragment_key("Stat", 2, id="count", a=1) == "Stat:2:a=1&id=count"
+    assert fragment_key("Stat", 2, id="count") != fragment_key("Stat", 3, id="count")
+
+
+def test_data_versions():
+    versions = DataVersions()
+    assert versions.get("user") == 0
+    assert versions.bump("user") == 1
+    assert versions.get("user") == 1
+    assert versions.get("email_outbox") == 0
+
+
+def test_get_set():
+    cache = FragmentCache(max_bytes=1024, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", "<p>a</p>")
+    assert cache.get("a") == "<p>a</p>"
+    assert cache.size == len("<p>a</p>")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_eviction_by_size():
+    cache = FragmentCache(max_bytes=30, ttl=60)
+    cache.set("a", "a" * 10)
+    cache.set("b", "b" * 10)
+    cache.get("a")
+    cache.set("c", "c" * 15)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.size == 25
+
+    # too large to cache at all
+    cache.set("d", "d" * 31)
+    assert cache.get("d") is None
+    assert len(cache) == 2
+
+
+def test_ttl():
+    cache = FragmentCache(max_bytes=1024, ttl=0)
+    cache.set("a", "a")
+    assert cache.get("a") is None
+    assert cache.size == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_render():
+    cache = FragmentCache(max_bytes=1024, ttl=60)
+    calls = []
+
+    async def render() -> str:
+        calls.append(1)
+        return "<p>rendered</p>"
+
+    assert await cache.get_or_render("a", render) == "<p>rendered</p>"
+    assert await cache.get_or_render("a", render) == "<p>rendered</p>"
+    assert len(calls) == 1
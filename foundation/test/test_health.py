@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from foundation.api.routes import health
+from foundation.app import app
+from foundation.core.config import settings
+from foundation.core.health import ReadinessProbe
+
+
+class FakeSession:
+    """
+    Stands in for the database session of the probe, answering pings after `delay` seconds.
+    """
+
+    def __init__(self, delay: float = 0.0, error: Exception | None = None):
+        self.delay = delay
+        self.error = error
+        self.pings = 0
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        self.pings += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture
+def pool_engine():
+    # the pool opens no connection until one is checked out
+    return create_async_engine(settings.postgres_dsn, pool_size=5, max_overflow=5)
+
+
+def test_healthz():
+    r = TestClient(app).get("/healthz")
+
+    assert r.status_code == 200
+    assert r.text == "ok"
+    assert r.headers["cache-control"] == "no-store"
+    assert "set-cookie" not in r.headers
+
+
+def test_readyz(monkeypatch, pool_engine):
+    probe = ReadinessProbe(pool_engine, FakeSession())
+    monkeypatch.setattr(health, "readiness_probe", probe)
+
+    r = TestClient(app).get("/readyz")
+
+    assert r.status_code == 200
+    assert r.json()["status"] == "ready"
+    assert r.json()["checks"]["pool"] == {
+        "ok": True,
+        "detail": "0/10 connections in use",
+    }
+
+
+def test_readyz_database_error(monkeypatch, pool_engine):
+    probe = ReadinessProbe(pool_engine, FakeSession(error=ConnectionRefusedError()))
+    monkeypatch.setattr(health, "readiness_probe", probe)
+
+    r = TestClient(app).get("/readyz")
+
+    assert r.status_code == 503
+    assert r.json()["status"] == "unavailable"
+    assert r.json()["checks"]["database"]["ok"] is False
+
+
+@pytest.mark.asyncio
+async def test_database_timeout(monkeypatch, pool_engine):
+    monkeypatch.setattr(settings, "READINESS_DB_TIMEOUT_SECONDS", 0.01)
+    probe = ReadinessProbe(pool_engine, FakeSession(delay=1.0))
+
+    readiness = await probe.check()
+
+    assert not readiness.ready
+    assert readiness.checks[-1].detail == "no answer within 0.01s"
+
+
+@pytest.mark.asyncio
+async def test_pool_saturation(monkeypatch, pool_engine):
+    monkeypatch.setattr(pool_engine.pool, "checkedout", lambda: 9)
+    probe = ReadinessProbe(pool_engine, FakeSession())
+
+    readiness = await probe.check()
+
+    assert not readiness.ready
+    assert readiness.checks[0].detail == "9/10 connections in use"
+
+
+@pytest.mark.asyncio
+async def test_result_is_cached_and_shared(pool_engine):
+    session = FakeSession(delay=0.01)
+    probe = ReadinessProbe(pool_engine, session, cache_seconds=60)
+
+    results = await asyncio.gather(*(probe.check() for _ in range(5)))
+    await probe.check()
+
+    assert session.pings == 1
+    assert all(result is results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_result_expires(pool_engine):
+    session = FakeSession()
+    probe = ReadinessProbe(pool_engine, session, cache_seconds=0)
+
+    await probe.check()
+    await probe.check()
+
+    assert session.pings == 2
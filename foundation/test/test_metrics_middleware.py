@@ -0,0 +1,59 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from foundation.core.metrics import RequestStats, request_stats
+from foundation.middleware import MetricsMiddleware
+from foundation.middleware.metrics import REQUEST_DB_QUERIES, REQUEST_DURATION
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/things/{thing_id}")
+    async def get_thing(thing_id: int):
+        stats = request_stats.get()
+        assert isinstance(stats, RequestStats)
+        stats.queries += 2
+        return {"id": thing_id}
+
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def count(key: tuple[str, ...]) -> int:
+    data = REQUEST_DURATION.values.get(key)
+    return sum(data[0]) if data else 0
+
+
+def test_labels_requests_with_the_route_template():
+    client = TestClient(create_app())
+    key = ("GET", "/things/{thing_id}", "200")
+    before = count(key)
+
+    client.get("/things/1")
+    client.get("/things/2")
+
+    assert count(key) == before + 2
+    assert not any(
+        labels[1].startswith("/things/1") for labels in REQUEST_DURATION.values
+    )
+
+
+def test_labels_unmatched_requests():
+    client = TestClient(create_app())
+    key = ("GET", "unmatched", "404")
+    before = count(key)
+
+    assert client.get("/missing/42").status_code == 404
+
+    assert count(key) == before + 1
+
+
+def test_records_the_queries_of_the_request():
+    client = TestClient(create_app())
+    before = REQUEST_DB_QUERIES.values.get(("/things/{thing_id}",), [[0], 0.0])[1]
+
+    client.get("/things/3")
+
+    assert REQUEST_DB_QUERIES.values[("/things/{thing_id}",)][1] == before + 2
+    assert request_stats.get() is None
@@ -0,0 +1,116 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from foundation.core import profiling
+from foundation.core.profiling import ProfileStore
+from foundation.core.security import access_token_security
+from foundation.middleware import ProfilingMiddleware
+from foundation.middleware import profiling as profiling_middleware
+from foundation.middleware.profiling import access_token, is_admin_request
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch) -> ProfileStore:
+    store = ProfileStore(tmp_path)
+    monkeypatch.setattr(profiling, "profile_store", store)
+    monkeypatch.setattr("foundation.middleware.profiling.profile_store", store)
+    return store
+
+
+@pytest.fixture
+def profiler_starts(monkeypatch) -> list[object]:
+    starts = []
+
+    class RecordingProfiler(profiling.SamplingProfiler):
+        def start(self) -> None:
+            starts.append(self)
+            super().start()
+
+    monkeypatch.setattr(profiling_middleware, "SamplingProfiler", RecordingProfiler)
+    return starts
+
+
+async def is_admin(scope) -> bool:
+    return dict(scope["headers"]).get(b"authorization") == b"Bearer admin"
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/things")
+    async def get_things():
+        return []
+
+    app.add_middleware(ProfilingMiddleware, authorize=is_admin)
+    return app
+
+
+ADMIN = {"Authorization": "Bearer admin"}
+
+
+def test_profiles_admin_requests(store):
+    client = TestClient(create_app())
+
+    r = client.get("/things", headers={"X-Profile": "1", **ADMIN})
+
+    profile = store.get(r.headers["x-profile-id"])
+    assert profile is not None
+    assert (profile.method, profile.path, profile.status) == ("GET", "/things", 200)
+
+
+def test_profile_query_parameter(store):
+    client = TestClient(create_app())
+
+    r = client.get("/things", params={"profile": "1"}, headers=ADMIN)
+
+    assert store.get(r.headers["x-profile-id"]) is not None
+
+
+def test_other_users_are_not_profiled(store, profiler_starts):
+    client = TestClient(create_app())
+
+    r = client.get("/things", headers={"X-Profile": "1", "Authorization": "Bearer x"})
+
+    assert r.status_code == 200
+    assert "x-profile-id" not in r.headers
+    # the profiler is not even started, the slot stays free for admins
+    assert profiler_starts == []
+    assert store.recent() == []
+
+
+def test_requests_not_asking_are_not_profiled(store, profiler_starts):
+    client = TestClient(create_app())
+
+    r = client.get("/things", params={"profiles": "1"}, headers=ADMIN)
+
+    assert "x-profile-id" not in r.headers
+    assert profiler_starts == []
+
+
+def test_access_token():
+    def scope(headers: dict[str, str]):
+        return {
+            "type": "http",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        }
+
+    assert access_token(scope({"Authorization": "Bearer abc"})) == "abc"
+    assert access_token(scope({"Cookie": "access_token_cookie=def"})) == "def"
+    assert access_token(scope({"Authorization": "Basic abc"})) is None
+    assert access_token(scope({})) is None
+
+
+@pytest.mark.asyncio
+async def test_is_admin_request_rejects_invalid_tokens():
+    def scope(token: str):
+        return {
+            "type": "http",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+        }
+
+    assert not await is_admin_request({"type": "http", "headers": []})
+    assert not await is_admin_request(scope("not-a-jwt"))
+    # valid signature but no user id, e.g. a password reset token
+    token = access_token_security.create_access_token(subject={"email": "a@b.c"})
+    assert not await is_admin_request(scope(token))
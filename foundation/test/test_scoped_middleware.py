@@ -0,0 +1,50 @@
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from foundation.middleware import PathScopedMiddleware
+
+
+async def has_session(request):
+    return JSONResponse({"session": "session" in request.scope})
+
+
+def client() -> TestClient:
+    app = Starlette(
+        routes=[
+            Route("/users", has_session),
+            Route("/api/users", has_session),
+            Route("/apidocs", has_session),
+        ],
+        middleware=[
+            Middleware(
+                PathScopedMiddleware,
+                middleware=SessionMiddleware,
+                exclude=["/api/"],
+                secret_key="secret",
+            )
+        ],
+    )
+    return TestClient(app)
+
+
+def test_applies_to_other_paths():
+    assert client().get("/users").json() == {"session": True}
+    assert client().get("/apidocs").json() == {"session": True}
+
+
+def test_skips_excluded_paths():
+    assert client().get("/api/users").json() == {"session": False}
+
+
+def test_is_excluded():
+    middleware = PathScopedMiddleware(
+        has_session, SessionMiddleware, exclude=["/api", "/static/"], secret_key="s"
+    )
+    assert middleware.is_excluded("/api")
+    assert middleware.is_excluded("/static/dist/css/output.css")
+    assert not middleware.is_excluded("/")
+    assert not middleware.is_excluded("/apiary")
@@ -0,0 +1,91 @@
+import json
+import uuid
+import warnings
+
+import pytest
+from pydantic import ValidationError
+
+from foundation.api.serialization import ListSerializer, RawJSONResponse
+from foundation.core.users.models import RoleEnum, StatusEnum, User
+from foundation.core.users.schemas import UserPublic, UsersPublic
+
+
+def make_users(rows: int) -> list[User]:
+    return [
+        User(
+            id=uuid.uuid4(),
+            email=f"user{i}@example.com",
+            full_name=f"User {i}",
+            hashed_password="secret",
+            status=StatusEnum.ACTIVE,
+            role=RoleEnum.USER,
+        )
+        for i in range(rows)
+    ]
+
+
+def test_matches_response_model():
+    users = make_users(3)
+    expected = UsersPublic(data=users, count=10).model_dump(mode="json")  # type: ignore
+    data = json.loads(ListSerializer(UserPublic).dump_json(users, 10))
+    assert data == expected
+    assert "hashed_password" not in data["data"][0]
+
+
+def test_enum_values_from_the_database():
+    users = make_users(1)
+    # enum columns are loaded from the database as strings
+    users[0].status = "active"  # type: ignore[assignment]
+    users[0].role = "user"  # type: ignore[assignment]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        data = json.loads(ListSerializer(UserPublic).dump_json(users, 1))
+    assert (data["data"][0]["status"], data["data"][0]["role"]) == ("active", "user")
+
+
+def test_empty_page():
+    assert ListSerializer(UserPublic).dump_json([], 0) == b'{"data":[],"count":0}'
+
+
+def test_untrusted_validates():
+    users = make_users(1)
+    users[0].email = "not an email"
+    serializer = ListSerializer(UserPublic)
+    assert b"not an email" in serializer.dump_json(users, 1)
+    with pytest.raises(ValidationError):
+        serializer.dump_json(users, 1, trusted=False)
+
+
+def test_cursor_page():
+    users = make_users(2)
+    data = json.loads(
+        ListSerializer(UserPublic).dump_cursor_json(users, "abc", True, fields=["id"])
+    )
+    assert data == {
+        "data": [{"id": str(u.id)} for u in users],
+        "next_cursor": "abc",
+        "has_more": True,
+    }
+
+
+def test_raw_json_response():
+    response = RawJSONResponse(b'{"count":0}')
+    assert response.body == b'{"count":0}'
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_sparse_fieldset():
+    serializer = ListSerializer(UserPublic)
+    users = make_users(2)
+    fields = serializer.parse_fields("id, email")
+    assert fields == ("email", "id")
+    data = json.loads(serializer.dump_json(users, 2, fields=fields))
+    assert data["data"] == [{"email": u.email, "id": str(u.id)} for u in users]
+
+
+def test_parse_fields():
+    serializer = ListSerializer(UserPublic)
+    assert serializer.parse_fields(None) is None
+    assert serializer.parse_fields(" , ") is None
+    with pytest.raises(ValueError, match="hashed_password"):
+        serializer.parse_fields("id,hashed_password")
@@ -0,0 +1,46 @@
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from foundation.core.config import settings
+from foundation.core.security import TimedJwtAccessBearer
+from foundation.core.timing import expose_server_timing, record_timing
+from foundation.middleware import ServerTimingMiddleware
+
+optional_bearer = TimedJwtAccessBearer(secret_key="secret", auto_error=False)
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/things", dependencies=[Depends(optional_bearer)])
+    async def get_things():
+        record_timing("db", 0.002)
+        return []
+
+    @app.get("/admin/things")
+    async def get_admin_things():
+        expose_server_timing()
+        return []
+
+    app.add_middleware(ServerTimingMiddleware)
+    return app
+
+
+def test_header_is_sent_to_admins_only():
+    client = TestClient(create_app())
+
+    assert "server-timing" not in client.get("/things").headers
+    assert client.get("/admin/things").headers["server-timing"].startswith("total;")
+
+
+def test_header_is_sent_to_everyone_when_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+    client = TestClient(create_app())
+
+    r = client.get("/things", headers={"Authorization": "Bearer invalid"})
+
+    metrics = [
+        metric.split(";")[0] for metric in r.headers["server-timing"].split(", ")
+    ]
+    assert metrics == ["jwt", "db", "total"]
+    assert 'db;desc="Database (1)";dur=2.0' in r.headers["server-timing"]
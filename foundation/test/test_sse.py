@@ -0,0 +1,42 @@
+import asyncio
+import uuid
+
+import pytest
+
+from foundation.core.events import EventBroker, RowChange
+from foundation.web.sse import event_stream, sse_message
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_sse_message():
+    assert (
+        sse_message("user-count", "<p>1</p>") == "event: user-count\ndata: <p>1</p>\n\n"
+    )
+    assert (
+        sse_message("row", "<tr>\n</tr>") == "event: row\ndata: <tr>\ndata: </tr>\n\n"
+    )
+    assert sse_message("users-changed", "") == "event: users-changed\ndata: \n\n"
+
+
+async def test_event_stream_batches_changes():
+    broker = EventBroker(listen=False)
+    batches = []
+
+    async def render(changes):
+        batches.append(changes)
+        return [("count", str(len(changes)))]
+
+    stream = event_stream(render, broker=broker, keepalive=0.01)
+    assert await anext(stream) == ": connected\n\n"
+    assert await anext(stream) == ": keepalive\n\n"
+
+    changes = [RowChange("user", "UPDATE", uuid.uuid4()) for _ in range(3)]
+    for change in changes:
+        broker.publish(change)
+    assert await anext(stream) == sse_message("count", "3")
+    assert batches == [changes]
+
+    await stream.aclose()
+    await asyncio.sleep(0)
+    assert not broker.subscribers
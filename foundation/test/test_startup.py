@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from foundation.core.startup import StartupReport, parse_import_times, profile_import
+
+# generous, importing the app takes well under a second on a developer machine
+IMPORT_BUDGET = 3.0
+
+IMPORT_TIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        500 |   encodings
+import time:      1000 |       1000 |     foundation.core.config
+import time:       200 |       1200 |   foundation.core
+import time:       500 |       2500 | foundation.app
+"""
+
+
+def test_parse_import_times():
+    profile = parse_import_times("foundation.app", IMPORT_TIME_OUTPUT)
+    assert profile.total == 0.0025
+    assert profile.modules["foundation.core.config"] == 0.001
+    assert profile.cumulative["foundation.core"] == 0.0012
+    package, seconds = profile.by_package()[0]
+    assert package == "foundation"
+    assert seconds == pytest.approx(0.0017)
+    assert profile.slowest(2) == [
+        ("foundation.app", 0.0025),
+        ("foundation.core", 0.0012),
+    ]
+
+
+def test_startup_report():
+    report = StartupReport()
+    with report.step("templates"):
+        pass
+    assert [name for name, _ in report.steps] == ["templates"]
+    assert report.summary().startswith("started in ")
+    assert "templates " in report.summary()
+
+
+def test_app_does_not_import_deferred_modules():
+    # modules only needed by tools or when sending an email
+    code = (
+        "import sys, foundation.app; "
+        "print(','.join(m for m in ('emails', 'typer') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        check=True,
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_import_time_budget():
+    profile = profile_import("foundation.app")
+    assert 0 < profile.total < IMPORT_BUDGET, profile.slowest(10)
@@ -0,0 +1,96 @@
+import gzip
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from foundation.web.static import (
+    IMMUTABLE_CACHE_CONTROL,
+    PrecompressedStaticFiles,
+    StaticManifest,
+    build_static,
+    hashed_name,
+    read_manifest,
+)
+from foundation.web.templates import create_templates
+
+CSS = b"body { color: black; }\n" * 100
+
+
+def build(tmp_path, content: bytes = CSS) -> dict[str, str]:
+    (tmp_path / "dist" / "css").mkdir(parents=True, exist_ok=True)
+    (tmp_path / "dist" / "css" / "output.css").write_bytes(content)
+    return build_static(tmp_path)
+
+
+def client(tmp_path) -> TestClient:
+    static = PrecompressedStaticFiles(
+        directory=tmp_path, manifest=StaticManifest(tmp_path)
+    )
+    return TestClient(Starlette(routes=[Mount("/static", static)]))
+
+
+def test_build_static(tmp_path):
+    manifest = build(tmp_path)
+    hashed = hashed_name("dist/css/output.css", CSS)
+    assert manifest == {"dist/css/output.css": hashed}
+    assert read_manifest(tmp_path) == manifest
+    assert (tmp_path / hashed).read_bytes() == CSS
+    assert gzip.decompress((tmp_path / f"{hashed}.gz").read_bytes()) == CSS
+
+
+def test_build_static_removes_stale(tmp_path):
+    old = build(tmp_path)["dist/css/output.css"]
+    # a second build does not fingerprint the hashed copies again
+    new = build(tmp_path, CSS + b"a { color: blue; }\n")["dist/css/output.css"]
+    assert new != old
+    assert not (tmp_path / old).exists()
+    assert not (tmp_path / f"{old}.gz").exists()
+    assert list(read_manifest(tmp_path)) == ["dist/css/output.css"]
+
+
+def test_static_manifest_url(tmp_path):
+    manifest = StaticManifest(tmp_path)
+    assert manifest.url("dist/css/output.css") == "/static/dist/css/output.css"
+    hashed = build(tmp_path)["dist/css/output.css"]
+    assert manifest.url("/dist/css/output.css") == f"/static/{hashed}"
+    assert manifest.is_hashed(hashed)
+
+
+def test_serves_precompressed_immutable(tmp_path):
+    hashed = build(tmp_path)["dist/css/output.css"]
+    response = client(tmp_path).get(
+        f"/static/{hashed}", headers={"accept-encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/css")
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(CSS)
+    assert response.content == CSS
+
+
+def test_serves_uncompressed(tmp_path):
+    hashed = build(tmp_path)["dist/css/output.css"]
+    response = client(tmp_path).get(
+        f"/static/{hashed}", headers={"accept-encoding": "identity"}
+    )
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.content == CSS
+
+
+def test_unhashed_not_immutable(tmp_path):
+    build(tmp_path)
+    response = client(tmp_path).get("/static/dist/css/output.css")
+    assert response.status_code == 200
+    assert "cache-control" not in response.headers
+
+
+def test_static_url_template_global():
+    templates, catalog = create_templates(production=True)
+    assert "static_url" in templates.env.globals
+    html = catalog.render("BaseLayout", title="Test", __content="")
+    assert "/static/dist/css/output" in html
@@ -0,0 +1,39 @@
+from jinja2.ext import DebugExtension
+
+from foundation.web.templates import (
+    create_templates,
+    find_components,
+    precompile_templates,
+)
+
+
+def test_production_profile():
+    templates, catalog = create_templates(production=True)
+    assert templates.env.auto_reload is False
+    assert catalog.jinja_env.auto_reload is False
+    assert not any(
+        isinstance(ext, DebugExtension) for ext in templates.env.extensions.values()
+    )
+
+
+def test_development_profile():
+    templates, catalog = create_templates(production=False)
+    assert templates.env.auto_reload is True
+    assert any(
+        isinstance(ext, DebugExtension) for ext in templates.env.extensions.values()
+    )
+
+
+def test_find_components():
+    _, catalog = create_templates(production=True)
+    components = find_components(catalog)
+    assert components["Button"][0] == "Button.jinja"
+    assert components["user.UserList"][0] == "user/UserList.jinja"
+    assert "icons.ChevronDown" not in components
+
+
+def test_precompile_templates():
+    templates, catalog = create_templates(production=True)
+    compiled = precompile_templates(templates, catalog)
+    assert compiled > len(templates.env.list_templates(extensions=["html"]))
+    assert catalog.render("Stat", id="count", stat_name="Users", value=3)
@@ -0,0 +1,107 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from foundation.core.config import settings
+from foundation.core.tracing import MemoryExporter, Sampler, Tracer, trace_span
+from foundation.middleware import TracingMiddleware
+from foundation.middleware import tracing as tracing_middleware
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+
+@pytest.fixture
+def exporter(monkeypatch) -> MemoryExporter:
+    exporter = MemoryExporter()
+    tracer = Tracer(exporters=[exporter], sampler=Sampler(rate=1.0))
+    monkeypatch.setattr("foundation.middleware.tracing.tracer", tracer)
+    yield exporter
+    tracer.flush()
+    tracer.shutdown()
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/users/{user_id}")
+    async def get_user(user_id: int):
+        with trace_span("UserService.get_user_by_id"):
+            return {"id": user_id}
+
+    @app.get("/fail")
+    async def fail():
+        raise ValueError("broken")
+
+    @app.get("/healthz")
+    async def healthz():
+        return "ok"
+
+    app.add_middleware(TracingMiddleware)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def flush() -> None:
+    # wait for the export thread of the patched tracer
+    assert tracing_middleware.tracer.flush()
+
+
+def test_request_is_traced(client: TestClient, exporter: MemoryExporter):
+    r = client.get("/users/1")
+    flush()
+
+    trace = exporter.recent()[0]
+    assert trace.root.name == "GET /users/{user_id}"
+    assert trace.root.attributes["http.status_code"] == 200
+    assert trace.root.attributes["http.target"] == "/users/1"
+    assert [span.name for span in trace.spans[1:]] == ["UserService.get_user_by_id"]
+    assert r.headers["traceresponse"] == f"00-{trace.trace_id}-{trace.root.span_id}-01"
+
+
+def test_trace_of_the_caller_is_continued(client: TestClient, exporter: MemoryExporter):
+    r = client.get(
+        "/users/1", headers={"traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-01"}
+    )
+    flush()
+
+    trace = exporter.recent()[0]
+    assert trace.trace_id == TRACE_ID
+    assert trace.root.parent_id == "00f067aa0ba902b7"
+    assert r.headers["traceresponse"].startswith(f"00-{TRACE_ID}-")
+
+
+def test_unsampled_caller_is_not_traced(client: TestClient, exporter: MemoryExporter):
+    r = client.get(
+        "/users/1", headers={"traceparent": f"00-{TRACE_ID}-00f067aa0ba902b7-00"}
+    )
+    flush()
+
+    assert exporter.recent() == []
+    assert "traceresponse" not in r.headers
+
+
+def test_error_is_recorded(client: TestClient, exporter: MemoryExporter):
+    assert client.get("/fail").status_code == 500
+    flush()
+
+    root = exporter.recent()[0].root
+    assert root.name == "GET /fail"
+    assert root.status == "error"
+    assert root.status_message == "ValueError: broken"
+
+
+def test_excluded_paths_are_not_traced(client: TestClient, exporter: MemoryExporter):
+    client.get("/healthz")
+    flush()
+
+    assert exporter.recent() == []
+
+
+def test_tracing_disabled(client: TestClient, exporter: MemoryExporter, monkeypatch):
+    monkeypatch.setattr(settings, "TRACING_ENABLED", False)
+
+    r = client.get("/users/1")
+    flush()
+
+    assert exporter.recent() == []
+    assert "traceresponse" not in r.headers
@@ -0,0 +1,169 @@
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+from typing import Sequence
+
+import typer
+from loguru import logger
+from starlette.requests import Request
+
+from foundation.app import app
+from foundation.core.pagination import Page
+from foundation.core.users.models import RoleEnum, StatusEnum, User
+from foundation.core.users.schemas import UserPublic, UsersPublic
+from foundation.middleware.compression import CompressionMiddleware, brotli
+from foundation.web.templates import catalog
+
+logger.remove()
+logger.add(sys.stderr, colorize=True, backtrace=True, diagnose=True, level="WARNING")
+
+NAMES = ["Ada", "Grace", "Alan", "Edsger", "Barbara", "Donald", "Ken", "Margaret"]
+# bytes per chunk of the streamed variant of a route
+STREAM_CHUNK_SIZE = 4096
+
+
+def fake_users(rows: int) -> list[User]:
+    users = []
+    for _ in range(rows):
+        first, last = random.choice(NAMES), random.choice(NAMES)
+        users.append(
+            User(
+                id=uuid.uuid4(),
+                email=f"{first}.{last}{random.randint(1, 9999)}@example.com".lower(),
+                full_name=f"{first} {last}",
+                status=random.choice(list(StatusEnum)),
+                role=random.choice(list(RoleEnum)),
+            )
+        )
+    return users
+
+
+def fake_request(path: str) -> Request:
+    # the real router, so url_for in the templates resolves the app routes
+    return Request(
+        {
+            "type": "http",
+            "app": app,
+            "router": app.router,
+            "method": "GET",
+            "scheme": "http",
+            "server": ("localhost", 80),
+            "root_path": "",
+            "path": path,
+            "query_string": b"",
+            "headers": [],
+        }
+    )
+
+
+def user_list_html(rows: int) -> bytes:
+    request = fake_request("/users/list")
+    page = Page(request.url, fake_users(rows), 1, rows, rows * 10, "full_name", True)
+    return catalog.render(
+        "user.UserList", request=request, current_user=None, page=page
+    ).encode()
+
+
+def users_public_json(rows: int) -> bytes:
+    users = [
+        UserPublic.model_validate(user, from_attributes=True)
+        for user in fake_users(rows)
+    ]
+    return UsersPublic(data=users, count=rows * 10).model_dump_json().encode()
+
+
+def stat_html(rows: int) -> bytes:
+    return catalog.render(
+        "Stat",
+        id="user-count",
+        stat_name="Total Users",
+        value=random.randint(1, 10_000),
+    ).encode()
+
+
+ROUTES = {
+    "GET /users/list (UserList)": ("text/html; charset=utf-8", user_list_html),
+    "GET /api/users (UsersPublic)": ("application/json", users_public_json),
+    "GET /stats/users (Stat)": ("text/html; charset=utf-8", stat_html),
+}
+
+
+def body_app(body: bytes, content_type: str, streaming: bool):
+    async def asgi(scope, receive, send):
+        headers = [(b"content-type", content_type.encode())]
+        if not streaming:
+            headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        chunk_size = STREAM_CHUNK_SIZE if streaming else len(body)
+        for i in range(0, len(body), chunk_size):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": body[i : i + chunk_size],
+                    "more_body": i + chunk_size < len(body),
+                }
+            )
+
+    return asgi
+
+
+async def measure(
+    bodies: list[bytes], content_type: str, encoding: str, streaming: bool
+) -> tuple[list[int], list[float]]:
+    sizes, cpu = [], []
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", encoding.encode())],
+    }
+    for body in bodies:
+        sent = 0
+
+        async def send(message):
+            nonlocal sent
+            sent += len(message.get("body", b""))
+
+        middleware = CompressionMiddleware(body_app(body, content_type, streaming))
+        start = time.process_time()
+        await middleware(scope, None, send)  # type: ignore
+        cpu.append(time.process_time() - start)
+        sizes.append(sent)
+    return sizes, cpu
+
+
+def percentile(values: Sequence[float], p: int) -> float:
+    return statistics.quantiles(values, n=100)[p - 1]
+
+
+def main(requests: int = 200, rows: int = 100):  # pragma: no cover
+    """
+    Reports the p50 and p95 payload size and the mean CPU time per request of the compression
+    middleware for the user list fragment, the user list JSON and a dashboard stat, uncompressed,
+    with gzip and with brotli (if installed), for complete and streamed bodies.
+
+    Example:
+        poetry run python foundation/tools/bench_compression.py --requests 500 --rows 50
+    """
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    for route, (content_type, build) in ROUTES.items():
+        bodies = [build(rows) for _ in range(requests)]
+        typer.echo(route)
+        for streaming in (False, True):
+            for encoding in encodings:
+                sizes, cpu = asyncio.run(
+                    measure(bodies, content_type, encoding, streaming)
+                )
+                typer.echo(
+                    f"  {'stream' if streaming else 'body':<6} {encoding:<8}"
+                    f" p50 {percentile(sizes, 50) / 1024:7.1f}KiB"
+                    f" p95 {percentile(sizes, 95) / 1024:7.1f}KiB"
+                    f" cpu {statistics.mean(cpu) * 1_000_000:6.0f}us"
+                )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    typer.run(main)
@@ -0,0 +1,133 @@
+import asyncio
+import base64
+import json
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import typer
+from itsdangerous import TimestampSigner
+from loguru import logger
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+from starlette_wtf import CSRFProtectMiddleware
+
+from foundation.core.config import settings
+from foundation.middleware import PathScopedMiddleware
+from foundation.web.static import PrecompressedStaticFiles
+
+logger.remove()
+logger.add(sys.stderr, colorize=True, backtrace=True, diagnose=True, level="WARNING")
+
+USER_ID = uuid.uuid4()
+
+
+async def get_user(request):
+    return JSONResponse({"id": request.path_params["user_id"], "email": "a@b.c"})
+
+
+def session_cookie() -> str:
+    # the session a logged-in browser sends along with every same-origin request
+    data = base64.b64encode(json.dumps({"csrf_token": "x" * 40}).encode())
+    return TimestampSigner(settings.JWT_SECRET).sign(data).decode()
+
+
+def create_app(static_dir: str, scoped: bool) -> Starlette:
+    exclude = settings.HTML_MIDDLEWARE_EXCLUDED_PATHS
+    if scoped:
+        middleware = [
+            Middleware(
+                PathScopedMiddleware,
+                middleware=SessionMiddleware,
+                exclude=exclude,
+                secret_key=settings.JWT_SECRET,
+            ),
+            Middleware(
+                PathScopedMiddleware,
+                middleware=CSRFProtectMiddleware,
+                exclude=exclude,
+                csrf_secret=settings.CSRF_SECRET,
+            ),
+        ]
+    else:
+        middleware = [
+            Middleware(SessionMiddleware, secret_key=settings.JWT_SECRET),
+            Middleware(CSRFProtectMiddleware, csrf_secret=settings.CSRF_SECRET),
+        ]
+    return Starlette(
+        routes=[
+            Route("/api/users/{user_id}", get_user),
+            Mount("/static", PrecompressedStaticFiles(directory=static_dir)),
+        ],
+        middleware=middleware,
+    )
+
+
+async def request(app: Starlette, path: str, cookie: str) -> None:
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("localhost", 80),
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(b"cookie", f"session={cookie}".encode())],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app: Starlette, path: str, cookie: str, requests: int) -> float:
+    for _ in range(100):
+        await request(app, path, cookie)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await request(app, path, cookie)
+    return (time.perf_counter() - start) / requests
+
+
+def main(requests: int = 5000):  # pragma: no cover
+    """
+    Reports the time per request of `/api/users/{id}` and a static file with the session and CSRF
+    middleware applied to every request, and scoped to the HTML routes. The requests carry the
+    session cookie a logged-in browser sends.
+
+    Example:
+        poetry run python foundation/tools/bench_middleware.py --requests 20000
+    """
+    cookie = session_cookie()
+    with tempfile.TemporaryDirectory() as static_dir:
+        Path(static_dir, "app.css").write_text("body { color: black; }\n" * 50)
+        paths = {
+            "/api/users/{id}": f"/api/users/{USER_ID}",
+            "static": "/static/app.css",
+        }
+        for name, path in paths.items():
+            results = {}
+            for label, scoped in (("all requests", False), ("html routes only", True)):
+                app = create_app(static_dir, scoped)
+                results[label] = asyncio.run(measure(app, path, cookie, requests))
+            before, after = results["all requests"], results["html routes only"]
+            typer.echo(
+                f"{name:<16} session+csrf on all requests {before * 1e6:6.1f}us,"
+                f" html routes only {after * 1e6:6.1f}us"
+                f" ({(before - after) * 1e6:.1f}us saved per request)"
+            )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    typer.run(main)
@@ -0,0 +1,66 @@
+import asyncio
+import statistics
+import sys
+import time
+
+import typer
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from loguru import logger
+from starlette.responses import JSONResponse
+
+from foundation.api.routes.users import users_serializer
+from foundation.core.users.schemas import UsersPublic
+from foundation.tools.bench_compression import fake_users
+
+logger.remove()
+logger.add(sys.stderr, colorize=True, backtrace=True, diagnose=True, level="WARNING")
+
+# the field FastAPI builds for `response_model=UsersPublic`
+RESPONSE_FIELD = create_model_field("Response_get_users", UsersPublic)
+
+
+async def response_model_path(users: list, count: int) -> bytes:
+    # what the route did before: build the model, then let FastAPI validate and encode it
+    content = UsersPublic(data=users, count=count)  # type: ignore
+    value = await serialize_response(field=RESPONSE_FIELD, response_content=content)
+    return bytes(JSONResponse(value).body)
+
+
+async def type_adapter_path(users: list, count: int) -> bytes:
+    return users_serializer.dump_json(users, count)
+
+
+async def measure(path, users: list, requests: int) -> tuple[float, int]:
+    timings, body = [], b""
+    for _ in range(requests):
+        start = time.perf_counter()
+        body = await path(users, len(users))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(body)
+
+
+def main(
+    requests: int = 10, rows: list[int] = [100, 1_000, 10_000]
+):  # pragma: no cover
+    """
+    Reports the median time to serialize the `GET /api/users` response through the response model
+    and through the precompiled TypeAdapter, for pages of 100, 1k and 10k users.
+
+    Example:
+        poetry run python foundation/tools/bench_serialization.py --requests 20 --rows 500
+    """
+    for count in rows:
+        users = fake_users(count)
+        before, size = asyncio.run(measure(response_model_path, users, requests))
+        after, _ = asyncio.run(measure(type_adapter_path, users, requests))
+        typer.echo(
+            f"{count:>6} rows {size / 1024:8.1f}KiB"
+            f"  response_model {before * 1000:8.2f}ms"
+            f"  TypeAdapter {after * 1000:7.2f}ms"
+            f"  ({before / after:.0f}x)"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    typer.run(main)
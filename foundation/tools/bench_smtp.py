@@ -0,0 +1,105 @@
+import asyncio
+import socket
+import sys
+import time
+
+import emails  # type: ignore
+import typer
+from aiosmtpd.controller import Controller
+from aiosmtpd.handlers import Sink
+from loguru import logger
+
+from foundation.core.smtp import SMTPConnectionPool
+
+logger.remove()
+logger.add(sys.stderr, colorize=True, backtrace=True, diagnose=True)
+
+FROM_ADDR = "bench@example.com"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def build_message(i: int) -> emails.Message:
+    return emails.Message(
+        subject=f"Benchmark message {i}",
+        html=f"<p>message {i}</p>",
+        text="hello",
+        mail_from=("Bench", FROM_ADDR),
+    )
+
+
+async def send_per_connection(host: str, port: int, messages: int, concurrency: int):
+    """
+    The previous send path: a new SMTP connection per message, run in worker threads.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(i: int):
+        async with semaphore:
+            message = build_message(i)
+            await asyncio.to_thread(
+                message.send,
+                to=f"user{i}@example.com",
+                smtp={"host": host, "port": port},
+            )
+
+    await asyncio.gather(*(send(i) for i in range(messages)))
+
+
+async def send_pooled(host: str, port: int, messages: int, pool_size: int):
+    pool = SMTPConnectionPool(host=host, port=port, size=pool_size)
+
+    async def send(i: int):
+        message = build_message(i)
+        message.set_mail_to(f"user{i}@example.com")
+        content = message.as_string()
+        assert content is not None, f"unable to build message {i}"
+        await pool.send(
+            from_addr=FROM_ADDR,
+            to_addrs=[f"user{i}@example.com"],
+            message=content,
+        )
+
+    await asyncio.gather(*(send(i) for i in range(messages)))
+    await pool.close()
+
+
+def main(messages: int = 500, pool_size: int = 4):  # pragma: no cover
+    """
+    Compares SMTP throughput of a connection per message against the pooled connections,
+    using a local aiosmtpd server that discards every message.
+
+    Example:
+        poetry run python foundation/tools/bench_smtp.py --messages 1000 --pool-size 8
+    """
+    controller = Controller(Sink(), hostname="127.0.0.1", port=free_port())
+    controller.start()
+    try:
+        for name, run in (
+            (
+                "connection per message",
+                send_per_connection(
+                    controller.hostname, controller.port, messages, pool_size
+                ),
+            ),
+            (
+                "pooled connections",
+                send_pooled(controller.hostname, controller.port, messages, pool_size),
+            ),
+        ):
+            start = time.perf_counter()
+            asyncio.run(run)
+            elapsed = time.perf_counter() - start
+            logger.info(
+                f"{name}: {messages} messages in {elapsed:.2f}s ({messages / elapsed:.0f} msg/s)"
+            )
+    finally:
+        controller.stop()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    typer.run(main)
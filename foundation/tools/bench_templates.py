@@ -0,0 +1,62 @@
+import sys
+import tempfile
+import time
+
+import typer
+from loguru import logger
+
+from foundation.core.config import settings
+from foundation.web.templates import create_templates, precompile_templates
+
+logger.remove()
+logger.add(sys.stderr, colorize=True, backtrace=True, diagnose=True, level="WARNING")
+
+COMPONENTS = {
+    "Stat": {"id": "user-count", "stat_name": "Total Users", "value": 42},
+    "Notification": {"title": "Saved", "message": "User updated", "error": False},
+}
+
+
+def cold_start(production: bool) -> float:
+    start = time.perf_counter()
+    templates, catalog = create_templates(production=production)
+    precompile_templates(templates, catalog)
+    return time.perf_counter() - start
+
+
+def steady_state(production: bool, renders: int) -> dict[str, float]:
+    templates, catalog = create_templates(production=production)
+    precompile_templates(templates, catalog)
+    results = {}
+    for name, kwargs in COMPONENTS.items():
+        catalog.render(name, **kwargs)
+        start = time.perf_counter()
+        for _ in range(renders):
+            catalog.render(name, **kwargs)
+        results[name] = (time.perf_counter() - start) / renders
+    return results
+
+
+def main(renders: int = 2000):  # pragma: no cover
+    """
+    Reports the cold-start (create + precompile) time of the templates, without and with a warm
+    bytecode cache, and the steady-state render time of components in both template profiles.
+
+    Example:
+        poetry run python foundation/tools/bench_templates.py --renders 5000
+    """
+    with tempfile.TemporaryDirectory() as cache_dir:
+        settings.TEMPLATES_BYTECODE_CACHE_DIR = None
+        typer.echo(f"cold start, no bytecode cache:   {cold_start(True) * 1000:.0f}ms")
+        settings.TEMPLATES_BYTECODE_CACHE_DIR = cache_dir
+        cold_start(True)
+        typer.echo(f"cold start, warm bytecode cache: {cold_start(True) * 1000:.0f}ms")
+
+    settings.TEMPLATES_BYTECODE_CACHE_DIR = None
+    for profile, production in (("development", False), ("production", True)):
+        for name, seconds in steady_state(production, renders).items():
+            typer.echo(f"{profile:<12} render {name:<13} {seconds * 1_000_000:.0f}us")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    typer.run(main)
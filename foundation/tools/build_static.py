@@ -0,0 +1,26 @@
+import sys
+
+import typer
+from loguru import logger
+
+from foundation.web.static import STATIC_DIR, build_static
+
+logger.remove()
+logger.add(sys.stderr, colorize=True, backtrace=True, diagnose=True)
+
+
+def main(static_dir: str = STATIC_DIR):  # pragma: no cover
+    """
+    Fingerprints the built static assets, writes their .gz and .br siblings and the manifest
+    used by the `static_url` template helper. Run it after building the tailwind css.
+
+    Example:
+        poetry run python foundation/tools/build_static.py
+    """
+    manifest = build_static(static_dir)
+    for name, hashed in manifest.items():
+        logger.info(f"{name} -> {hashed}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    typer.run(main)
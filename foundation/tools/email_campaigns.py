@@ -0,0 +1,38 @@
+import asyncio
+import sys
+
+import typer
+from loguru import logger
+
+from foundation.core.campaigns.runner import CampaignRunner
+from foundation.core.config import settings
+
+logger.remove()
+logger.add(sys.stderr, colorize=True, backtrace=True, diagnose=True)
+
+
+def main(
+    chunk_size: int = settings.EMAIL_CAMPAIGN_CHUNK_SIZE,
+    concurrency: int = settings.EMAIL_CAMPAIGN_CONCURRENCY,
+    rate_limit: float = settings.EMAIL_CAMPAIGN_RATE_LIMIT_PER_SECOND,
+):  # pragma: no cover
+    """
+    Runs the email campaign runner as a standalone worker process.
+
+    Use this with EMAIL_CAMPAIGN_RUNNER_ENABLED=False to send campaigns from a dedicated
+    process instead of the app workers.
+
+    Example:
+        poetry run python foundation/tools/email_campaigns.py --rate-limit 20
+    """
+    runner = CampaignRunner(
+        chunk_size=chunk_size, concurrency=concurrency, rate_limit=rate_limit
+    )
+    try:
+        asyncio.run(runner.run())
+    except KeyboardInterrupt:
+        logger.info("email campaign runner stopped")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    typer.run(main)
@@ -0,0 +1,35 @@
+import asyncio
+import sys
+
+import typer
+from loguru import logger
+
+from foundation.core.config import settings
+from foundation.core.outbox.dispatcher import EmailDispatcher
+
+logger.remove()
+logger.add(sys.stderr, colorize=True, backtrace=True, diagnose=True)
+
+
+def main(
+    batch_size: int = settings.EMAIL_OUTBOX_BATCH_SIZE,
+    poll_interval: float = settings.EMAIL_OUTBOX_POLL_INTERVAL_SECONDS,
+):  # pragma: no cover
+    """
+    Runs the email outbox dispatcher as a standalone worker process.
+
+    Use this with EMAIL_OUTBOX_DISPATCHER_ENABLED=False to deliver emails from a dedicated
+    process instead of the app workers.
+
+    Example:
+        poetry run python foundation/tools/email_dispatcher.py --batch-size 100
+    """
+    dispatcher = EmailDispatcher(batch_size=batch_size, poll_interval=poll_interval)
+    try:
+        asyncio.run(dispatcher.run())
+    except KeyboardInterrupt:
+        logger.info("email dispatcher stopped")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    typer.run(main)
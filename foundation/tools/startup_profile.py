@@ -0,0 +1,25 @@
+import typer
+
+from foundation.core.startup import profile_import
+
+
+def main(module: str = "foundation.app", limit: int = 20):  # pragma: no cover
+    """
+    Reports the time taken to import the app in a fresh interpreter, by top level package and for
+    the slowest modules (including their imports).
+
+    Example:
+        poetry run python foundation/tools/startup_profile.py --limit 30
+    """
+    profile = profile_import(module)
+    typer.echo(f"import {module}: {profile.total * 1000:.0f}ms\n")
+    typer.echo("by package:")
+    for package, seconds in profile.by_package()[:limit]:
+        typer.echo(f"  {package:<30} {seconds * 1000:8.1f}ms")
+    typer.echo("\nslowest modules, including their imports:")
+    for name, seconds in profile.slowest(limit):
+        typer.echo(f"  {name:<50} {seconds * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    typer.run(main)
@@ -0,0 +1,79 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import typer
+
+TRACES_PATH = "/v1/traces"
+
+
+def print_spans(payload: dict) -> None:
+    """
+    Prints the spans of an OTLP/HTTP JSON request, indented under their parents.
+
+    :param payload: The decoded `ExportTraceServiceRequest`.
+    """
+    spans = [
+        span
+        for resource_spans in payload.get("resourceSpans", [])
+        for scope_spans in resource_spans.get("scopeSpans", [])
+        for span in scope_spans.get("spans", [])
+    ]
+    children: dict[str | None, list[dict]] = {}
+    ids = {span["spanId"] for span in spans}
+    for span in spans:
+        parent = span.get("parentSpanId")
+        children.setdefault(parent if parent in ids else None, []).append(span)
+
+    def show(span: dict, depth: int) -> None:
+        duration = (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6
+        error = " ERROR" if span.get("status", {}).get("code") == 2 else ""
+        typer.echo(f"{'  ' * depth}{span['name']} {duration:.2f}ms{error}")
+        for child in sorted(
+            children.get(span["spanId"], []), key=lambda s: int(s["startTimeUnixNano"])
+        ):
+            show(child, depth + 1)
+
+    for root in children.get(None, []):
+        typer.echo(f"trace {root['traceId']}")
+        show(root, 1)
+
+
+class CollectorHandler(BaseHTTPRequestHandler):
+    def do_POST(self):  # pragma: no cover
+        if self.path != TRACES_PATH:
+            self.send_error(404)
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            print_spans(json.loads(body))
+        except (ValueError, KeyError) as e:
+            self.send_error(400, str(e))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):  # pragma: no cover
+        pass
+
+
+def main(host: str = "127.0.0.1", port: int = 4318):  # pragma: no cover
+    """
+    Runs a stand-in for an OpenTelemetry collector, printing the spans it receives. Receives
+    OTLP/HTTP with JSON encoding, the format of the "otlp" trace exporter.
+
+    Example:
+        poetry run python foundation/tools/trace_collector.py --port 4318
+        TRACING_EXPORTERS='["otlp"]' make run
+    """
+    server = ThreadingHTTPServer((host, port), CollectorHandler)
+    typer.echo(f"collecting traces on http://{host}:{port}{TRACES_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    typer.run(main)
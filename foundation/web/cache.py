@@ -0,0 +1,133 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from foundation.core.config import settings
+
+"""
+This module provides a cache for rendered HTML fragments.
+
+HTMX requests re-render the same components over and over while the data behind them rarely
+changes. Keys are built from the component name, the version of the tables it shows (see
+`foundation.core.versioning`) and the arguments that change its output, so a write to the table
+makes all of its fragments unreachable. Unreachable entries are evicted as least recently used
+once the cache grows over its byte limit, and every entry expires after a TTL to pick up writes
+made by other worker processes.
+
+Usage:
+    key = fragment_key("Stat", data_versions.get("user"), id="user-count")
+    html = await fragment_cache.get_or_render(key, render_stat)
+"""
+
+
+def fragment_key(name: str, version: int, **args: Any) -> str:
+    """
+    Builds the cache key of a fragment.
+
+    :param name: Name of the component or template.
+    :param version: Version of the data shown by the fragment.
+    :param args: Arguments that change the rendered output.
+    :return: The cache key.
+
+    Example usage:
+        key = fragment_key("user.UserList", 3, page_num=1, page_size=10)
+        # "user.UserList:3:page_num=1&page_size=10"
+    """
+    arg_str = "&".join(f"{k}={args[k]}" for k in sorted(args))
+    return f"{name}:{version}:{arg_str}"
+
+
+class FragmentCache:
+    """
+    LRU cache of rendered HTML, bounded by the total size of the cached fragments.
+
+    :param max_bytes: Maximum total size of the cached fragments in bytes (UTF-8 encoded).
+    :param ttl: Seconds a fragment is served from the cache.
+
+    Example usage:
+
+        cache = FragmentCache(max_bytes=1024 * 1024, ttl=10)
+        cache.set("key", "<p>hi</p>")
+        cache.get("key")
+    """
+
+    def __init__(self, *, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        # key -> (expires at, size in bytes, html), least recently used first
+        self._entries: OrderedDict[str, tuple[float, int, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> str | None:
+        """
+        :param key: The fragment key.
+        :return: The cached HTML, or None if it is not cached or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, _, html = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return html
+
+    def set(self, key: str, html: str) -> None:
+        """
+        Caches a fragment, evicting the least recently used fragments to stay under `max_bytes`.
+        Fragments larger than `max_bytes` are not cached.
+
+        :param key: The fragment key.
+        :param html: The rendered HTML.
+        """
+        size = len(html.encode())
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            return
+        while self.size + size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl, size, html)
+        self.size += size
+
+    async def get_or_render(
+        self, key: str, render: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Returns the cached fragment, or renders and caches it.
+
+        :param key: The fragment key.
+        :param render: Coroutine function loading the data and rendering the fragment; only called on a miss.
+        :return: The rendered HTML.
+        """
+        html = self.get(key)
+        if html is None:
+            html = await render()
+            self.set(key, html)
+        return html
+
+    def clear(self) -> None:
+        """
+        Removes all fragments.
+        """
+        self._entries.clear()
+        self.size = 0
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+
+
+fragment_cache = FragmentCache(
+    max_bytes=settings.FRAGMENT_CACHE_MAX_BYTES,
+    ttl=settings.FRAGMENT_CACHE_TTL_SECONDS,
+)
@@ -2,13 +2,14 @@ from typing import Annotated
 
 from foundation.core.users import validate_role_is_admin, get_current_user
 from fastapi import Security, HTTPException, Depends, status
-from fastapi_jwt import JwtAccessCookie, JwtAuthorizationCredentials
+from fastapi_jwt import JwtAuthorizationCredentials
 
 from foundation.core.config import settings
+from foundation.core.security import TimedJwtAccessCookie
 from foundation.core.users.deps import UserServiceDep
 from foundation.core.users.schemas import UserPublic
 
-access_token_security = JwtAccessCookie(
+access_token_security = TimedJwtAccessCookie(
     secret_key=settings.JWT_SECRET, auto_error=False
 )
 
@@ -1,5 +1,8 @@
 from .app import router as app_router
 from .auth import router as auth_router
+from .events import router as events_router
+from .profiles import router as profiles_router
+from .traces import router as traces_router
 from .users import router as users_router
 from ..utils import HTMLRouter
 
@@ -9,3 +12,6 @@ html_router = HTMLRouter()
 html_router.include_router(app_router, tags=["App"])
 html_router.include_router(auth_router, tags=["Auth"])
 html_router.include_router(users_router, tags=["Users"])
+html_router.include_router(events_router, tags=["Events"])
+html_router.include_router(profiles_router, tags=["Profiles"])
+html_router.include_router(traces_router, tags=["Traces"])
@@ -1,13 +1,63 @@
 from fastapi import Request
+from markupsafe import Markup
+
+from foundation.core.config import settings
 from foundation.core.users.deps import UserServiceDep
+from foundation.core.users.models import User
+from foundation.core.users.services import UserService
+from foundation.core.versioning import data_versions
 from starlette.responses import RedirectResponse, HTMLResponse
 
+from foundation.web.cache import fragment_cache, fragment_key
 from foundation.web.deps import CurrentUserDep, LoginRequired, AdminRequired
 from foundation.web.templates import templates, render
 from foundation.web.utils import HTMLRouter
 
 router = HTMLRouter()
 
+# dashboard stats: element id -> (title, key of the count in UserService.get_user_counts)
+USER_STATS = {
+    "user-count": ("Total Users", "total"),
+    "active-user-count": ("Active Users", "active"),
+    "admin-user-count": ("Admin Users", "admin"),
+}
+
+
+async def render_user_stats(user_service: UserService) -> dict[str, str]:
+    """
+    Renders all dashboard `Stat` components of the user counts, cached until the next change of a user.
+
+    The counts are loaded with one aggregate query, and only if any of the stats is not cached.
+
+    :param user_service: The user service used to count the users.
+    :return: Dictionary of stat id to the rendered `Stat` component.
+    """
+    version = data_versions.get(User.__tablename__)
+    keys = {
+        stat_id: fragment_key("Stat", version, id=stat_id) for stat_id in USER_STATS
+    }
+    stats = {stat_id: fragment_cache.get(key) for stat_id, key in keys.items()}
+    if all(html is not None for html in stats.values()):
+        return stats  # pyright: ignore [reportReturnType]
+
+    counts = await user_service.get_user_counts()
+    for stat_id, (stat_name, count) in USER_STATS.items():
+        html = render("Stat", id=stat_id, stat_name=stat_name, value=counts[count])
+        fragment_cache.set(keys[stat_id], html)
+        stats[stat_id] = html
+    return stats  # pyright: ignore [reportReturnType]
+
+
+async def render_user_stat(user_service: UserService, stat_id: str) -> str:
+    """
+    Renders one dashboard `Stat` of the user counts, see `render_user_stats`.
+
+    :param user_service: The user service used to count the users.
+    :param stat_id: Id of the stat, one of the `USER_STATS` keys.
+    :return: The rendered `Stat` component.
+    """
+    return (await render_user_stats(user_service))[stat_id]
+
 
 @router.get("/")
 async def index(
@@ -26,20 +76,32 @@ async def index(
 @router.get("/dashboard", dependencies=[AdminRequired])
 async def dashboard(
     request: Request,
+    user_service: UserServiceDep,
     current_user: CurrentUserDep,
 ):
     """
     Fetches and renders the dashboard page for the current user if they are an admin.
 
+    With WEB_INLINE_INITIAL_DATA the stats are rendered into the page, otherwise the page
+    lazy-loads each of them with a separate request.
+
     :param request: The incoming HTTP request object.
+    :param user_service: The user service used to count the users for the stats.
     :param current_user: The current authenticated user object.
     :return: Renders the 'dashboard.html' template with provided request and current user context.
     """
+    stats = None
+    if settings.WEB_INLINE_INITIAL_DATA:
+        stats = {
+            stat_id: Markup(html)
+            for stat_id, html in (await render_user_stats(user_service)).items()
+        }
     return templates.TemplateResponse(
         "pages/dashboard.html",
         dict(
             request=request,
             current_user=current_user,
+            stats=stats,
         ),
     )
 
@@ -54,11 +116,7 @@ async def dashboard_users_count(request: Request, user_service: UserServiceDep):
     Asynchronously retrieves the total number of users from the user service.
     Renders the `Stat` component with the user count data.
     """
-    users_count = await user_service.get_users_count()
-    modal_component = render(
-        "Stat", id="user-count", stat_name="Total Users", value=users_count
-    )
-    return HTMLResponse(modal_component)
+    return HTMLResponse(await render_user_stat(user_service, "user-count"))
 
 
 @router.get("/dashboard/users/active_count", dependencies=[AdminRequired])
@@ -74,12 +132,7 @@ async def dashboard_active_users_count(request: Request, user_service: UserServi
         @router.get("/dashboard/users/active_count", dependencies=[AdminRequired])
         async def dashboard_active_users_count(request: Request, user_service: UserServiceDep)
     """
-    count = await user_service.get_active_users_count()
-
-    modal_component = render(
-        "Stat", id="active-user-count", stat_name="Active Users", value=count
-    )
-    return HTMLResponse(modal_component)
+    return HTMLResponse(await render_user_stat(user_service, "active-user-count"))
 
 
 @router.get("/dashboard/users/admin_count", dependencies=[AdminRequired])
@@ -91,11 +144,7 @@ async def dashboard_admin_users_count(request: Request, user_service: UserServic
 
     Retrieve the count of admin users using `user_service` and render an HTML fragment displaying this count.
     """
-    count = await user_service.get_admin_users_count()
-    modal_component = render(
-        "Stat", id="admin-user-count", stat_name="Admin Users", value=count
-    )
-    return HTMLResponse(modal_component)
+    return HTMLResponse(await render_user_stat(user_service, "admin-user-count"))
 
 
 @router.get("/profile", dependencies=[LoginRequired])
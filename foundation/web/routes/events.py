@@ -0,0 +1,88 @@
+from fastapi import Request
+
+from foundation.core.db import async_sessionmaker
+from foundation.core.events import RowChange
+from foundation.core.repository import Repository
+from foundation.core.users.models import User
+from foundation.core.users.services import UserService
+from foundation.core.versioning import data_versions
+from foundation.web.cache import fragment_cache, fragment_key
+from foundation.web.deps import AdminRequired
+from foundation.web.routes.app import render_user_stats
+from foundation.web.sse import EventStreamResponse, event_stream
+from foundation.web.templates import render
+from foundation.web.utils import HTMLRouter
+
+router = HTMLRouter()
+
+
+def user_changes(changes: list[RowChange]) -> list[RowChange]:
+    return [change for change in changes if change.table == User.__tablename__]
+
+
+@router.get("/events/dashboard", dependencies=[AdminRequired])
+async def dashboard_events(request: Request):
+    """
+    Streams the dashboard stats as server-sent events whenever a user changes.
+
+    A database session is only opened to render the stats after a change, an open dashboard
+    does not hold a connection while nothing changes.
+
+    :param request: The incoming HTTP request.
+    :return: Event stream with one event per stat, named like the stat id.
+
+    HTMX Specific Behavior:
+    - The dashboard connects with `sse-connect` and each stat swaps in the event named like its id.
+    """
+
+    async def render_stats(changes: list[RowChange]) -> list[tuple[str, str]]:
+        if not user_changes(changes):
+            return []
+        async with async_sessionmaker() as session:
+            user_service = UserService(Repository(session, User))
+            return list((await render_user_stats(user_service)).items())
+
+    return EventStreamResponse(event_stream(render_stats))
+
+
+@router.get("/events/users", dependencies=[AdminRequired])
+async def users_events(request: Request):
+    """
+    Streams changed users of the users page as server-sent events.
+
+    :param request: The incoming HTTP request.
+    :return: Event stream with a `UserRow` event for every updated user, named like the row id,
+        and a `users-changed` event when users were created or deleted.
+
+    HTMX Specific Behavior:
+    - Rows of updated users are swapped in place, rows that are not on the current page ignore the event.
+    - The `UserList` reloads the current page on `users-changed`, since the rows on the page shift.
+    """
+
+    async def render_users(changes: list[RowChange]) -> list[tuple[str, str]]:
+        changes = user_changes(changes)
+        events = []
+        if any(change.op != "UPDATE" for change in changes):
+            events.append(("users-changed", ""))
+        updated = {
+            change.id
+            for change in changes
+            if change.op == "UPDATE" and change.id is not None
+        }
+        if not updated:
+            return events
+        async with async_sessionmaker() as session:
+            user_service = UserService(Repository(session, User))
+            users = await user_service.get_users_by_ids(user_ids=updated)
+        version = data_versions.get(User.__tablename__)
+        for user in users:
+            # rendered once per change for all connected admins
+            key = fragment_key("user.UserRow", version, id=user.id)
+            html = fragment_cache.get(key)
+            if html is None:
+                html = render("user.UserRow", request=request, user=user)
+                fragment_cache.set(key, html)
+            events.append((f"user-row-{user.id}", html))
+        return events
+
+    return EventStreamResponse(event_stream(render_users))
@@ -0,0 +1,64 @@
+from fastapi import HTTPException, Request
+
+from foundation.core.profiling import flame_graph, profile_store
+from foundation.web.deps import AdminRequired, CurrentUserDep
+from foundation.web.templates import templates
+from foundation.web.utils import HTMLRouter
+
+router = HTMLRouter()
+
+# functions with less than this share of the samples are left out of the flame graph
+FLAME_GRAPH_MIN_SHARE = 0.005
+# height of a row of the flame graph in pixels
+FLAME_GRAPH_ROW_HEIGHT = 18
+
+
+@router.get("/admin/profiles", dependencies=[AdminRequired])
+async def profiles(request: Request, current_user: CurrentUserDep):
+    """
+    Lists the kept request profiles, newest first.
+
+    :param request: The incoming HTTP request.
+    :param current_user: The current admin.
+    :return: Renders the 'pages/profiles.html' template.
+    """
+    return templates.TemplateResponse(
+        "pages/profiles.html",
+        dict(
+            request=request,
+            current_user=current_user,
+            profiles=profile_store.recent(),
+        ),
+    )
+
+
+@router.get("/admin/profiles/{profile_id}", dependencies=[AdminRequired])
+async def profile_view(request: Request, profile_id: str, current_user: CurrentUserDep):
+    """
+    Shows a request profile: the functions with the most samples, and the call tree as a flame
+    graph.
+
+    :param request: The incoming HTTP request.
+    :param profile_id: Id of the profile, as sent in the `X-Profile-Id` header.
+    :param current_user: The current admin.
+    :return: Renders the 'pages/profile_view.html' template.
+
+    Error cases:
+    - 404 if the profile is not kept (anymore).
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    tree = profile.call_tree()
+    return templates.TemplateResponse(
+        "pages/profile_view.html",
+        dict(
+            request=request,
+            current_user=current_user,
+            profile=profile,
+            top_functions=profile.top_functions(),
+            tree=tree,
+            flame_boxes=flame_graph(tree, FLAME_GRAPH_MIN_SHARE),
+            row_height=FLAME_GRAPH_ROW_HEIGHT,
+        ),
+    )
@@ -0,0 +1,54 @@
+from fastapi import HTTPException, Request
+
+from foundation.core.tracing import memory_exporter, waterfall
+from foundation.web.deps import AdminRequired, CurrentUserDep
+from foundation.web.templates import templates
+from foundation.web.utils import HTMLRouter
+
+router = HTMLRouter()
+
+
+@router.get("/admin/traces", dependencies=[AdminRequired])
+async def traces(request: Request, current_user: CurrentUserDep):
+    """
+    Lists the traces kept in memory by this worker, newest first.
+
+    :param request: The incoming HTTP request.
+    :param current_user: The current admin.
+    :return: Renders the 'pages/traces.html' template.
+    """
+    return templates.TemplateResponse(
+        "pages/traces.html",
+        dict(
+            request=request,
+            current_user=current_user,
+            traces=[trace for trace in memory_exporter.recent() if trace.root],
+        ),
+    )
+
+
+@router.get("/admin/traces/{trace_id}", dependencies=[AdminRequired])
+async def trace_view(request: Request, trace_id: str, current_user: CurrentUserDep):
+    """
+    Shows the spans of a trace as a waterfall chart.
+
+    :param request: The incoming HTTP request.
+    :param trace_id: Id of the trace, as sent in the `traceresponse` header.
+    :param current_user: The current admin.
+    :return: Renders the 'pages/trace_view.html' template.
+
+    Error cases:
+    - 404 if the trace is not kept (anymore) by this worker.
+    """
+    trace = memory_exporter.get(trace_id)
+    if trace is None or trace.root is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return templates.TemplateResponse(
+        "pages/trace_view.html",
+        dict(
+            request=request,
+            current_user=current_user,
+            trace=trace,
+            rows=waterfall(trace),
+        ),
+    )
@@ -3,10 +3,19 @@ from uuid import UUID
 from fastapi import Request, Header, HTTPException
 from fastapi import Response
 from fastapi import status
+from markupsafe import Markup
+from starlette.datastructures import URL
 from starlette.responses import HTMLResponse
 
 from foundation.api.routes.users import update_user
-from foundation.core.users.deps import UserServiceDep, UserPaginationDep
+from foundation.core.config import settings
+from foundation.core.db import async_sessionmaker
+from foundation.core.repository import Repository
+from foundation.core.users.deps import (
+    UserPagination,
+    UserPaginationDep,
+    UserServiceDep,
+)
 from foundation.core.users.models import User
 from foundation.core.users.schemas import UserPublic
 from foundation.core.users.services import (
@@ -18,9 +27,14 @@ from sqlalchemy import select, desc, asc
 from starlette_wtf import csrf_token
 from starlette_wtf.csrf import get_csrf_token
 
+from foundation.core.etag import etag_headers, etag_matches, make_etag, not_modified
+from foundation.core.timing import timing_span
+from foundation.core.tracing import trace_span
+from foundation.core.versioning import data_versions
+from foundation.web.cache import fragment_cache, fragment_key
 from foundation.web.deps import CurrentUserDep, LoginRequired, AdminRequired
 from foundation.web.forms import UserEditForm, UserCreateForm
-from foundation.web.templates import template, render
+from foundation.web.templates import template, render, templates
 from foundation.web.utils import HTMLRouter, error_notification
 
 router = HTMLRouter(dependencies=[LoginRequired])
@@ -43,20 +57,103 @@ def authorize_admin_or_owner(*, user: User, current_user: UserPublic):
         return Response(status_code=status.HTTP_403_FORBIDDEN)
 
 
+async def render_user_list(
+    request: Request,
+    user_pagination: UserPagination,
+    current_user: UserPublic,
+    *,
+    url: URL,
+    page_num: int = 1,
+    page_size: int = 10,
+    order_by: str = "full_name",
+    ascending: bool = True,
+    count_repository: Repository[User] | None = None,
+) -> str:
+    """
+    Renders a page of the `UserList` component, cached until the next change of a user.
+
+    :param request: The request object
+    :param user_pagination: Pagination of the users
+    :param current_user: The current authenticated user
+    :param url: URL of the `/users/list` request the page links are built from
+    :param page_num: The number of the page to render
+    :param page_size: The number of users per page
+    :param order_by: The field by which to order the users, "full_name" or "email"
+    :param ascending: True for ascending order
+    :param count_repository: Repository on a second session to count the users concurrently
+    :return: The rendered `UserList`
+    """
+
+    async def render_page() -> str:
+        query = select(User)
+
+        if ascending:
+            query = query.order_by(asc(getattr(User, order_by)))
+        else:
+            query = query.order_by(desc(getattr(User, order_by)))
+
+        pagination = user_pagination.paginate(
+            request,
+            query,
+            page_size=page_size,
+            order_by=order_by,
+            asc=ascending,
+            url=url,
+            count_repository=count_repository,
+        )
+        page = await pagination.page(page=page_num)
+        return render(
+            "user.UserList", request=request, current_user=current_user, page=page
+        )
+
+    # the pagination links are built from the url
+    key = fragment_key(
+        "user.UserList",
+        data_versions.get(User.__tablename__),
+        url=url,
+        current_user=current_user.id,
+    )
+    return await fragment_cache.get_or_render(key, render_page)
+
+
 @router.get("/users", dependencies=[AdminRequired])
-async def users_page(request: Request, current_user: CurrentUserDep):
+async def users_page(
+    request: Request,
+    user_pagination: UserPaginationDep,
+    current_user: CurrentUserDep,
+):
     """
+    With WEB_INLINE_INITIAL_DATA the first page of users is rendered into the page, with the
+    users and their count queried concurrently. Otherwise the page lazy-loads it from `/users/list`.
+    Further pages are always loaded from `/users/list`.
+
     :param request: The incoming HTTP request.
+    :param user_pagination: Dependency that provides pagination functionality
     :param current_user: Dependency that holds information about the currently authenticated user.
     :return: Renders the users page with the current user's information.
     """
-    return template(request, "pages/users.html", {"current_user": current_user})
+    user_list = None
+    if settings.WEB_INLINE_INITIAL_DATA:
+        async with async_sessionmaker() as count_session:
+            user_list = await render_user_list(
+                request,
+                user_pagination,
+                current_user,
+                url=request.url_for("users_list"),
+                count_repository=Repository(count_session, User),
+            )
+    return template(
+        request,
+        "pages/users.html",
+        {"current_user": current_user, "user_list": user_list and Markup(user_list)},
+    )
 
 
 @router.get("/users/list", dependencies=[AdminRequired])
 async def users_list(
     request: Request,
     user_pagination: UserPaginationDep,
+    user_service: UserServiceDep,
     current_user: CurrentUserDep,
     page_num: int = 1,
     page_size: int = 10,
@@ -68,6 +165,7 @@ async def users_list(
 
     :param request: The request object
     :param user_pagination: Dependency that provides pagination functionality
+    :param user_service: Dependency that provides the version of the user data for the ETag
     :param current_user: Dependency that provides the current authenticated user
     :param page_num: The number of the page to retrieve, default is 1
     :param page_size: The number of items per page, default is 10
@@ -81,27 +179,32 @@ async def users_list(
     - If `order_by` is not "full_name" or "email", it defaults to "full_name".
     HTMX Specific Behavior:
     - Returns a UserList component containing the paginated user list.
+    - Returns 304 Not Modified if no user changed since the version in `If-None-Match`.
     """
     if order_by not in ["full_name", "email"]:
         order_by = "full_name"
 
-    query = select(User)
-
-    if ascending:
-        query = query.order_by(asc(getattr(User, order_by)))
-    else:
-        query = query.order_by(desc(getattr(User, order_by)))
-
-    pagination = user_pagination.paginate(
-        request, query, page_size=page_size, order_by=order_by, asc=ascending
+    etag = make_etag(
+        "user.UserList",
+        await user_service.get_users_version(),
+        request.url,
+        current_user.id,
+        current_user.role,
     )
-    page = await pagination.page(page=page_num)
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-    # Render the component and return it in response
-    modal_component = render(
-        "user.UserList", request=request, current_user=current_user, page=page
+    user_list = await render_user_list(
+        request,
+        user_pagination,
+        current_user,
+        url=request.url,
+        page_num=page_num,
+        page_size=page_size,
+        order_by=order_by,
+        ascending=ascending,
     )
-    return HTMLResponse(modal_component)
+    return HTMLResponse(user_list, headers=etag_headers(etag))
 
 
 @router.get("/users/create", dependencies=[AdminRequired])
@@ -190,13 +293,35 @@ async def user_detail_view(
     - Throws authorization error if current user is neither admin nor owner.
     HTMX Specific Behavior:
     - Returns a partial template "pages/user_view.html" displaying the user details.
+    - Returns 304 Not Modified if the user did not change since the version in `If-None-Match`.
     """
     view_user = await user_service.get_user_by_id(user_id=user_id)
     authorize_admin_or_owner(user=view_user, current_user=current_user)
-    return template(
-        request,
+
+    etag = make_etag(
+        "pages/user_view.html", view_user.version, current_user.id, current_user.role
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    async def render_user_view() -> str:
+        with (
+            timing_span("render"),
+            trace_span("render", template="pages/user_view.html"),
+        ):
+            return templates.get_template("pages/user_view.html").render(
+                request=request, user=view_user, current_user=current_user
+            )
+
+    key = fragment_key(
         "pages/user_view.html",
-        {"user": view_user, "current_user": current_user},
+        data_versions.get(User.__tablename__),
+        user_id=user_id,
+        current_user=current_user.id,
+    )
+    return HTMLResponse(
+        await fragment_cache.get_or_render(key, render_user_view),
+        headers=etag_headers(etag),
     )
 
 
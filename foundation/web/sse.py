@@ -0,0 +1,85 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Sequence
+
+from starlette.responses import StreamingResponse
+
+from foundation.core.config import settings
+from foundation.core.events import EventBroker, RowChange, event_broker
+
+"""
+This module streams server-sent events rendered from database row changes.
+
+The page connects with the htmx SSE extension (`hx-ext="sse" sse-connect="/events/..."`) and
+elements swap in the HTML of the events named in their `sse-swap` attribute. Changes that arrive
+together are rendered as one batch, so a bulk write renders every fragment once.
+
+Usage:
+    async def render(changes: list[RowChange]) -> list[tuple[str, str]]:
+        return [("user-count", render("Stat", ...))]
+
+    return EventStreamResponse(event_stream(render))
+"""
+
+# events rendered for a batch of row changes, as (event name, HTML) tuples
+Renderer = Callable[[list[RowChange]], Awaitable[Sequence[tuple[str, str]]]]
+
+
+def sse_message(event: str, data: str) -> str:
+    """
+    Formats a server-sent event.
+
+    :param event: Name of the event.
+    :param data: Data of the event, may span several lines.
+    :return: The event in the `text/event-stream` format.
+
+    Example usage:
+        sse_message("user-count", "<div>42</div>")  # "event: user-count\\ndata: <div>42</div>\\n\\n"
+    """
+    lines = "".join(f"data: {line}\n" for line in data.splitlines() or [""])
+    return f"event: {event}\n{lines}\n"
+
+
+async def event_stream(
+    render: Renderer,
+    *,
+    broker: EventBroker | None = None,
+    keepalive: float | None = None,
+) -> AsyncIterator[str]:
+    """
+    Subscribes to row changes and yields the events rendered for them until the client disconnects.
+
+    :param render: Coroutine rendering the events for a batch of changes.
+    :param broker: Broker to subscribe to, defaults to the app event broker.
+    :param keepalive: Seconds between comments sent while there are no changes.
+    :return: Async iterator of server-sent events.
+    """
+    broker = broker or event_broker
+    keepalive = keepalive or settings.EVENTS_KEEPALIVE_SECONDS
+    async with broker.subscribe() as changes:
+        # sends the response headers right away, so the browser knows it is connected
+        yield ": connected\n\n"
+        while True:
+            try:
+                batch = [await asyncio.wait_for(changes.get(), keepalive)]
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            while not changes.empty():
+                batch.append(changes.get_nowait())
+            for event, data in await render(batch):
+                yield sse_message(event, data)
+
+
+class EventStreamResponse(StreamingResponse):
+    """
+    Streaming response for server-sent events, never cached or buffered by proxies.
+
+    Example usage:
+        return EventStreamResponse(event_stream(render))
+    """
+
+    media_type = "text/event-stream"
+
+    def __init__(self, content: AsyncIterator[str], **kwargs):
+        headers = {"cache-control": "no-cache", "x-accel-buffering": "no"}
+        super().__init__(content, headers=headers, **kwargs)
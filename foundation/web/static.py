@@ -0,0 +1,286 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import stat
+from pathlib import Path
+
+import anyio
+from loguru import logger
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from foundation.core.config import BASE_DIR
+from foundation.core.templating import templates_auto_reload
+from foundation.middleware.compression import accepted_encodings
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover
+    brotli = None
+
+"""
+This module builds and serves the fingerprinted static assets.
+
+`build_static` copies every built asset (the tailwind output in `web/static/dist`) to a name
+containing a hash of its content, e.g. `dist/css/output.css` to `dist/css/output.1a2b3c4d5e6f.css`,
+writes `.gz` and `.br` siblings of the copies and records the hashed names in `manifest.json`.
+Templates link assets with `static_url`, which resolves the hashed name from the manifest.
+
+A hashed URL changes whenever the content does, so `PrecompressedStaticFiles` can let browsers
+cache it forever, and serves the precompressed sibling that matches the `Accept-Encoding` of the
+request instead of compressing the asset on every response.
+
+Usage:
+    make build-static
+    <link href="{{ static_url('dist/css/output.css') }}" rel="stylesheet" />
+"""
+
+STATIC_DIR = f"{BASE_DIR}/web/static"
+STATIC_URL_PREFIX = "/static"
+MANIFEST_NAME = "manifest.json"
+# directories of built assets, relative to the static dir
+ASSET_DIRS = ("dist",)
+
+HASH_LENGTH = 12
+HASHED_NAME = re.compile(rf"\.[0-9a-f]{{{HASH_LENGTH}}}(\.[^.]+)?$")
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+)
+# encoding name -> file suffix, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def hashed_name(path: str, content: bytes) -> str:
+    """
+    Returns the fingerprinted name of an asset.
+
+    :param path: Path of the asset, e.g. `dist/css/output.css`.
+    :param content: Content of the asset.
+    :return: The path with a hash of the content before the extension.
+
+    Example usage:
+        hashed_name("dist/css/output.css", b"body{}")  # "dist/css/output.4f0b5e2c7b1d.css"
+    """
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest}{ext}"
+
+
+def is_compressible(path: str) -> bool:
+    media_type, _ = mimetypes.guess_type(path)
+    return media_type is not None and media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(content: bytes) -> dict[str, bytes]:
+    """
+    Compresses an asset with every available encoding, at the highest compression level.
+
+    Brotli is only used if the optional `brotli` package is installed.
+
+    :param content: Content of the asset.
+    :return: Dictionary of file suffix to compressed content.
+    """
+    # mtime=0 keeps the output identical between builds
+    variants = {ENCODINGS["gzip"]: gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[ENCODINGS["br"]] = brotli.compress(content, quality=11)
+    return variants
+
+
+def read_manifest(static_dir: str | Path = STATIC_DIR) -> dict[str, str]:
+    """
+    Reads the asset manifest of a static dir.
+
+    :param static_dir: The static dir.
+    :return: Dictionary of asset path to hashed path, empty if no build was run.
+    """
+    try:
+        return json.loads((Path(static_dir) / MANIFEST_NAME).read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def build_static(static_dir: str | Path = STATIC_DIR) -> dict[str, str]:
+    """
+    Fingerprints and precompresses the built assets and writes the manifest.
+
+    Hashed copies and compressed siblings of a previous build that are no longer in the manifest
+    are removed.
+
+    :param static_dir: The static dir containing the asset dirs.
+    :return: The new manifest, a dictionary of asset path to hashed path.
+
+    Example usage:
+        manifest = build_static()
+    """
+    static_dir = Path(static_dir)
+    previous = read_manifest(static_dir)
+    manifest: dict[str, str] = {}
+
+    for asset_dir in ASSET_DIRS:
+        for path in sorted((static_dir / asset_dir).rglob("*")):
+            name = path.relative_to(static_dir).as_posix()
+            if (
+                not path.is_file()
+                or name.endswith(tuple(ENCODINGS.values()))
+                or HASHED_NAME.search(path.name)
+            ):
+                continue
+            content = path.read_bytes()
+            manifest[name] = hashed_name(name, content)
+            target = static_dir / manifest[name]
+            target.write_bytes(content)
+            if is_compressible(name):
+                for suffix, compressed in compress(content).items():
+                    # a larger compressed file is never served
+                    if len(compressed) < len(content):
+                        target.with_name(target.name + suffix).write_bytes(compressed)
+
+    stale = set(previous.values()) - set(manifest.values())
+    for name in stale:
+        for suffix in ("", *ENCODINGS.values()):
+            (static_dir / (name + suffix)).unlink(missing_ok=True)
+
+    (static_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, indent=2, sort_keys=True)
+    )
+    logger.info(
+        f"fingerprinted {len(manifest)} static assets, removed {len(stale)} stale"
+    )
+    return manifest
+
+
+class StaticManifest:
+    """
+    Resolves asset paths to their fingerprinted URLs.
+
+    The manifest is read on first use. Outside production it is read again whenever the file
+    changes, so `make build-static` is picked up by a running dev server. Assets missing from
+    the manifest, or all assets if the build was never run, resolve to their unhashed URL.
+
+    :param static_dir: The static dir containing the manifest.
+    :param url_prefix: URL the static dir is mounted at.
+
+    Example usage:
+        manifest = StaticManifest()
+        manifest.url("dist/css/output.css")  # "/static/dist/css/output.1a2b3c4d5e6f.css"
+    """
+
+    def __init__(
+        self, static_dir: str | Path = STATIC_DIR, url_prefix: str = STATIC_URL_PREFIX
+    ):
+        self.path = Path(static_dir) / MANIFEST_NAME
+        self.url_prefix = url_prefix
+        self.auto_reload = templates_auto_reload()
+        self._assets: dict[str, str] | None = None
+        self._hashed: set[str] = set()
+        self._mtime: float | None = None
+
+    def _load(self) -> dict[str, str]:
+        if self._assets is not None and not self.auto_reload:
+            return self._assets
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if self._assets is None or mtime != self._mtime:
+            self._assets = read_manifest(self.path.parent) if mtime is not None else {}
+            self._hashed = set(self._assets.values())
+            self._mtime = mtime
+        return self._assets
+
+    def url(self, path: str) -> str:
+        """
+        Returns the URL of an asset.
+
+        :param path: Path of the asset relative to the static dir.
+        :return: URL of the hashed asset, or of the asset itself if it was not fingerprinted.
+        """
+        path = path.lstrip("/")
+        return f"{self.url_prefix}/{self._load().get(path, path)}"
+
+    def is_hashed(self, path: str) -> bool:
+        """
+        Returns whether a path relative to the static dir is a fingerprinted asset.
+        """
+        self._load()
+        return path in self._hashed
+
+
+static_manifest = StaticManifest()
+
+
+def static_url(path: str) -> str:
+    """
+    Template helper returning the fingerprinted URL of an asset.
+
+    :param path: Path of the asset relative to the static dir, e.g. `dist/css/output.css`.
+    :return: The URL of the asset.
+    """
+    return static_manifest.url(path)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles serving fingerprinted assets as immutable and from precompressed siblings.
+
+    If the request accepts brotli or gzip and a `.br` or `.gz` sibling of the requested file
+    exists, the sibling is sent with a `Content-Encoding` header. Assets listed in the manifest
+    are sent with `Cache-Control: immutable`, all other files are served like `StaticFiles` does.
+
+    :param manifest: Manifest of the fingerprinted assets.
+
+    Example usage:
+        app.mount("/static", PrecompressedStaticFiles(directory=STATIC_DIR), name="static")
+    """
+
+    def __init__(self, *args, manifest: StaticManifest | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.manifest = manifest or static_manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = None
+        if scope["method"] in ("GET", "HEAD") and is_compressible(path):
+            accepted = accepted_encodings(
+                Headers(scope=scope).get("accept-encoding", "")
+            )
+            for encoding, suffix in ENCODINGS.items():
+                if encoding not in accepted:
+                    continue
+                response = await self._encoded_response(path, suffix, encoding, scope)
+                if response is not None:
+                    break
+        if response is None:
+            response = await super().get_response(path, scope)
+            if is_compressible(path):
+                response.headers["vary"] = "Accept-Encoding"
+        if response.status_code in (200, 304) and self.manifest.is_hashed(path):
+            response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    async def _encoded_response(
+        self, path: str, suffix: str, encoding: str, scope: Scope
+    ) -> Response | None:
+        full_path, stat_result = await anyio.to_thread.run_sync(
+            self.lookup_path, path + suffix
+        )
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            return None
+        response = FileResponse(
+            full_path,
+            stat_result=stat_result,
+            media_type=mimetypes.guess_type(path)[0],
+            headers={"content-encoding": encoding, "vary": "Accept-Encoding"},
+        )
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
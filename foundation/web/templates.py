@@ -1,22 +1,185 @@
+import os
+import re
+import time
 import typing
+from pathlib import Path
 
 import jinjax
+from jinja2 import Environment, FileSystemLoader
 from jinja2.ext import DebugExtension
+from loguru import logger
 from starlette.requests import Request
 from starlette.templating import Jinja2Templates
 
 from foundation.core.config import BASE_DIR
+from foundation.core.templating import create_bytecode_cache, templates_auto_reload
+from foundation.core.timing import timing_span
+from foundation.core.tracing import trace_span
+from foundation.web.static import static_url
 
-templates = Jinja2Templates(directory=f"{BASE_DIR}/web/templates")
-templates.env.add_extension(DebugExtension)
+TEMPLATES_DIR = f"{BASE_DIR}/web/templates"
+COMPONENT_DIRS = [
+    f"{BASE_DIR}/web/components",
+    f"{BASE_DIR}/web/components/ui",
+    f"{BASE_DIR}/web/components/icons",
+    f"{BASE_DIR}/web/layouts",
+    f"{BASE_DIR}/webexamples",
+]
+# the icon library has over a thousand components, only the ones in use are precompiled
+ICONS_DIR = f"{BASE_DIR}/web/components/icons"
 
-templates.env.add_extension(jinjax.JinjaX)  # pyright: ignore [reportPrivateImportUsage]
-catalog = jinjax.Catalog(jinja_env=templates.env)  # pyright: ignore [reportPrivateImportUsage]
-catalog.add_folder(f"{BASE_DIR}/web/components")
-catalog.add_folder(f"{BASE_DIR}/web/components/ui")
-catalog.add_folder(f"{BASE_DIR}/web/components/icons")
-catalog.add_folder(f"{BASE_DIR}/web/layouts")
-catalog.add_folder(f"{BASE_DIR}/webexamples")
+COMPONENT_EXT = ".jinja"
+# a component tag, e.g. <Button or <user.UserList
+COMPONENT_TAG = re.compile(r"<((?:[a-z_]\w*\.)*[A-Z]\w*)")
+
+
+class TimedJinja2Templates(Jinja2Templates):
+    """
+    Page templates recording the rendering of each response as the `render` span of the
+    `Server-Timing` header.
+
+    Example usage:
+        templates = TimedJinja2Templates(env=env)
+    """
+
+    def TemplateResponse(self, *args: typing.Any, **kwargs: typing.Any):
+        # the name follows the request, or comes first in the deprecated signature
+        name = kwargs.get("name") or next(
+            (arg for arg in args if isinstance(arg, str)), ""
+        )
+        with timing_span("render"), trace_span("render", template=name):
+            return super().TemplateResponse(*args, **kwargs)
+
+
+def create_templates(
+    *, production: bool | None = None
+) -> tuple[Jinja2Templates, jinjax.Catalog]:  # pyright: ignore [reportPrivateImportUsage]
+    """
+    Creates the page templates and the JinjaX component catalog.
+
+    The production profile leaves out the debug extension and does not check template files
+    for changes before rendering. Both profiles use the shared bytecode cache if one is configured.
+
+    :param production: Use the production profile. Defaults to True when ENVIRONMENT is production.
+    :return: Tuple of the Jinja2Templates for pages and the Catalog for components.
+
+    Example usage:
+        templates, catalog = create_templates(production=True)
+    """
+    if production is None:
+        production = not templates_auto_reload()
+    extensions: list = [jinjax.JinjaX]  # pyright: ignore [reportPrivateImportUsage]
+    if not production:
+        extensions.append(DebugExtension)
+    bytecode_cache = create_bytecode_cache()
+
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        autoescape=True,
+        auto_reload=not production,
+        bytecode_cache=bytecode_cache,
+        extensions=extensions,
+    )
+    jinja_templates = TimedJinja2Templates(env=env)
+
+    jinja_catalog = jinjax.Catalog(  # pyright: ignore [reportPrivateImportUsage]
+        jinja_env=env, auto_reload=not production
+    )
+    # the catalog renders components with its own environment
+    jinja_catalog.jinja_env.auto_reload = not production
+    jinja_catalog.jinja_env.bytecode_cache = bytecode_cache
+    for folder in COMPONENT_DIRS:
+        jinja_catalog.add_folder(folder)
+
+    env.globals["static_url"] = static_url
+    jinja_catalog.jinja_env.globals["static_url"] = static_url
+    return jinja_templates, jinja_catalog
+
+
+templates, catalog = create_templates()
+
+
+def find_components(
+    jinja_catalog: jinjax.Catalog,  # pyright: ignore [reportPrivateImportUsage]
+) -> dict[str, tuple[str, str]]:
+    """
+    Finds every component in the catalog folders.
+
+    A component file is named relative to the most specific folder it was added with, the same
+    way the catalog resolves it, e.g. `web/components/ui/Button.jinja` is `Button` and
+    `web/components/user/UserList.jinja` is `user.UserList`.
+
+    :param jinja_catalog: The component catalog.
+    :return: Dictionary of component name to a tuple of its template name and file path.
+    """
+    roots = [os.path.abspath(root) for root in jinja_catalog.prefixes[""].searchpath]
+    components: dict[str, tuple[str, str]] = {}
+    for root in roots:
+        nested_roots = [other for other in roots if other.startswith(root + os.sep)]
+        for folder, dirs, files in os.walk(root):
+            # files in a nested root are named relative to that root
+            dirs[:] = [d for d in dirs if os.path.join(folder, d) not in nested_roots]
+            for filename in files:
+                if not filename.endswith(COMPONENT_EXT):
+                    continue
+                path = os.path.join(folder, filename)
+                template_name = os.path.relpath(path, root)
+                name = template_name.removesuffix(COMPONENT_EXT).replace(os.sep, ".")
+                components.setdefault(name, (template_name, path))
+    return components
+
+
+def precompile_templates(
+    jinja_templates: Jinja2Templates | None = None,
+    jinja_catalog: jinjax.Catalog | None = None,  # pyright: ignore [reportPrivateImportUsage]
+) -> int:
+    """
+    Compiles every page and every component into the template caches, so the first request
+    of a new worker does not pay for parsing and compiling them, nor for the catalog looking up
+    the file of each component.
+
+    Components of the icon library are only compiled if a page or another component uses them.
+
+    :param jinja_templates: Page templates, defaults to the app templates.
+    :param jinja_catalog: Component catalog, defaults to the app catalog.
+    :return: The number of templates compiled.
+    """
+    jinja_templates = jinja_templates or templates
+    jinja_catalog = jinja_catalog or catalog
+    start = time.perf_counter()
+
+    pending: list[str] = []
+    pages = jinja_templates.env.list_templates(extensions=["html"])
+    for name in pages:
+        template = jinja_templates.env.get_template(name)
+        assert template.filename is not None
+        pending.extend(COMPONENT_TAG.findall(Path(template.filename).read_text()))
+
+    # the catalog environment loads components with the loader of their prefix
+    env = jinja_catalog.jinja_env
+    env.loader = jinja_catalog.prefixes[""]
+    components = find_components(jinja_catalog)
+    icons_dir = os.path.abspath(ICONS_DIR) + os.sep
+    pending.extend(
+        name for name, (_, path) in components.items() if not path.startswith(icons_dir)
+    )
+
+    compiled: set[str] = set()
+    while pending:
+        name = pending.pop()
+        if name in compiled or name not in components:
+            continue
+        compiled.add(name)
+        _, path = components[name]
+        # loads the component into the cache of the catalog, compiling its template
+        jinja_catalog._get_from_cache(prefix="", name=name, file_ext="")
+        pending.extend(COMPONENT_TAG.findall(Path(path).read_text()))
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(
+        f"precompiled {len(pages)} pages and {len(compiled)} components in {elapsed_ms:.1f}ms"
+    )
+    return len(pages) + len(compiled)
 
 
 def template(
@@ -36,4 +199,5 @@ def render(
     name: str,
     **kwargs,
 ) -> str:
-    return catalog.render(name, **kwargs)
+    with timing_span("render"), trace_span("render", template=name):
+        return catalog.render(name, **kwargs)